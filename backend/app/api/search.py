@@ -1,13 +1,26 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 from loguru import logger
+import itertools
 import json
 import os
 import sys
-from typing import List, Dict, Any, Optional
+from datetime import timezone
+from typing import List, Dict, Any, Optional, Iterator
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.db_utils import DBUtils
+from app.models.crawled_data import CrawledData
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+# 导入搜索索引和数据文件缓存
+from wumeng_crawler.storage.search_index import get_search_index, decode_cursor
+from wumeng_crawler.storage.file_cache import get_file_cache
+
 router = APIRouter()
 
 # 爬虫数据存储路径
@@ -17,13 +30,54 @@ DATA_STORAGE_PATH = os.path.join(
     "data"
 )
 
+def _iter_ndjson(results: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    将搜索结果逐条编码为NDJSON行
+    
+    Args:
+        results: 搜索结果迭代器
+    
+    Returns:
+        NDJSON行迭代器
+    """
+    try:
+        for result in results:
+            yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+    except Exception as e:
+        logger.error(f"流式导出搜索结果失败: {e}")
+
+def _serialize_crawled_data(crawled_data: CrawledData) -> Dict[str, Any]:
+    """
+    将数据库中的爬取数据转换为搜索结果
+    
+    Args:
+        crawled_data: 爬取数据对象
+    
+    Returns:
+        搜索结果字典
+    """
+    return {
+        "id": crawled_data.id,
+        "spider_name": crawled_data.spider_name,
+        "data_type": crawled_data.data_type,
+        "data_id": crawled_data.data_id,
+        "source": crawled_data.source,
+        "data": crawled_data.data_content,
+        "crawl_time": crawled_data.crawl_time.isoformat(),
+        "timestamp": crawled_data.crawl_time.replace(tzinfo=timezone.utc).timestamp()
+    }
+
 @router.get("/")
 def search_data(
     keyword: Optional[str] = Query(None, description="查询关键词"),
     spider_name: Optional[str] = Query(None, description="爬虫名称"),
     data_type: Optional[str] = Query(None, description="数据类型"),
     limit: int = Query(10, description="返回结果数量"),
-    offset: int = Query(0, description="偏移量")
+    offset: int = Query(0, description="偏移量"),
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的next_cursor，使用游标时忽略offset"),
+    stream: bool = Query(False, description="以NDJSON流式返回游标之后的全部匹配结果，忽略limit和offset"),
+    backend: Optional[str] = Query(None, description="搜索后端: files为爬虫数据文件，db为crawled_data表，默认取配置search_backend"),
+    db: Session = Depends(get_db)
 ):
     """
     搜索爬虫数据
@@ -34,91 +88,104 @@ def search_data(
         data_type: 数据类型
         limit: 返回结果数量
         offset: 偏移量
+        cursor: 分页游标
+        stream: 是否以NDJSON流式返回
+        backend: 搜索后端
+        db: 数据库会话
     
     Returns:
         搜索结果
     """
-    logger.info(f"搜索数据: keyword={keyword}, spider_name={spider_name}, data_type={data_type}, limit={limit}, offset={offset}")
+    backend = backend or settings.search_backend
+    logger.info(f"搜索数据: keyword={keyword}, spider_name={spider_name}, data_type={data_type}, limit={limit}, offset={offset}, cursor={cursor}, stream={stream}, backend={backend}")
     
     try:
+        if backend not in ("files", "db"):
+            raise HTTPException(status_code=400, detail=f"不支持的搜索后端: {backend}")
+        
+        # 数据库后端，通过FTS5全文索引查询crawled_data表
+        if backend == "db":
+            if cursor or stream:
+                raise HTTPException(status_code=400, detail="数据库搜索后端暂不支持游标分页和流式返回")
+            
+            total, crawled_data_list = DBUtils.search_crawled_data(
+                db,
+                keyword=keyword,
+                spider_name=spider_name,
+                data_type=data_type,
+                limit=limit,
+                offset=offset
+            )
+            
+            return {
+                "status": "success",
+                "total": total,
+                "count": len(crawled_data_list),
+                "offset": offset,
+                "limit": limit,
+                "results": [_serialize_crawled_data(item) for item in crawled_data_list],
+                "next_cursor": None
+            }
+        
+        # 校验分页游标
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        
         # 检查数据存储目录是否存在
         if not os.path.exists(DATA_STORAGE_PATH):
+            if stream:
+                return StreamingResponse(iter(()), media_type="application/x-ndjson")
             return {
                 "status": "success",
                 "count": 0,
-                "results": []
+                "results": [],
+                "next_cursor": None
             }
         
-        # 获取所有数据文件
-        data_files = []
-        for root, dirs, files in os.walk(DATA_STORAGE_PATH):
-            for file in files:
-                if file.endswith(".json"):
-                    data_files.append(os.path.join(root, file))
-        
-        # 按修改时间排序，最新的文件优先
-        data_files.sort(key=os.path.getmtime, reverse=True)
+        search_index = get_search_index()
         
-        # 搜索数据
-        all_results = []
-        for file_path in data_files:
-            try:
-                # 读取文件内容
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                # 解析文件名，获取爬虫名称
-                file_name = os.path.basename(file_path)
-                
-                # 处理数据
-                if isinstance(data, dict):
-                    # 单个爬虫的数据
-                    all_results.append({
-                        "file_path": file_path,
-                        "file_name": file_name,
-                        "data": data,
-                        "timestamp": os.path.getmtime(file_path)
-                    })
-                elif isinstance(data, list):
-                    # 多个爬虫的数据列表
-                    for item in data:
-                        all_results.append({
-                            "file_path": file_path,
-                            "file_name": file_name,
-                            "data": item,
-                            "timestamp": os.path.getmtime(file_path)
-                        })
-            except Exception as e:
-                logger.error(f"读取文件 {file_path} 失败: {e}")
-                continue
+        # 流式返回，边匹配边输出
+        if stream:
+            matches = search_index.iter_matches(
+                keyword=keyword,
+                spider_name=spider_name,
+                data_type=data_type,
+                cursor=cursor
+            )
+            return StreamingResponse(_iter_ndjson(matches), media_type="application/x-ndjson")
         
-        # 过滤结果
-        filtered_results = []
-        for result in all_results:
-            # 检查爬虫名称
-            if spider_name:
-                result_spider_name = result["data"].get("spider_name", "")
-                if result_spider_name != spider_name:
-                    continue
-            
-            # 检查数据类型
-            if data_type:
-                result_data_type = result["data"].get("type", "")
-                if result_data_type != data_type:
-                    continue
+        # 游标分页，只读取到下一页所需的记录，不计算总数
+        if cursor:
+            matches = search_index.iter_matches(
+                keyword=keyword,
+                spider_name=spider_name,
+                data_type=data_type,
+                cursor=cursor
+            )
+            page = list(itertools.islice(matches, limit + 1))
+            paginated_results = page[:limit]
             
-            # 检查关键词
-            if keyword:
-                # 将数据转换为字符串，检查是否包含关键词
-                data_str = json.dumps(result["data"], ensure_ascii=False)
-                if keyword not in data_str:
-                    continue
-            
-            filtered_results.append(result)
+            return {
+                "status": "success",
+                "total": None,
+                "count": len(paginated_results),
+                "offset": None,
+                "limit": limit,
+                "results": paginated_results,
+                "next_cursor": paginated_results[-1]["cursor"] if len(page) > limit else None
+            }
         
-        # 分页
-        total = len(filtered_results)
-        paginated_results = filtered_results[offset:offset+limit]
+        # 通过倒排索引查询，只读取命中记录所在的文件，匹配总数未知时total为None
+        total, paginated_results, has_more = search_index.search(
+            keyword=keyword,
+            spider_name=spider_name,
+            data_type=data_type,
+            offset=offset,
+            limit=limit
+        )
         
         return {
             "status": "success",
@@ -126,9 +193,13 @@ def search_data(
             "count": len(paginated_results),
             "offset": offset,
             "limit": limit,
-            "results": paginated_results
+            "results": paginated_results,
+            "next_cursor": paginated_results[-1]["cursor"] if paginated_results and has_more else None
         }
     
+    except HTTPException as e:
+        logger.error(f"搜索数据失败: {e.detail}")
+        raise e
     except Exception as e:
         logger.error(f"搜索数据失败: {e}")
         raise HTTPException(status_code=500, detail=f"搜索数据失败: {str(e)}")
@@ -159,54 +230,8 @@ def get_latest_data(
                 "results": []
             }
         
-        # 获取所有数据文件
-        data_files = []
-        for root, dirs, files in os.walk(DATA_STORAGE_PATH):
-            for file in files:
-                if file.endswith(".json"):
-                    data_files.append(os.path.join(root, file))
-        
-        # 按修改时间排序，最新的文件优先
-        data_files.sort(key=os.path.getmtime, reverse=True)
-        
-        # 获取最新数据
-        latest_results = []
-        for file_path in data_files:
-            try:
-                # 读取文件内容
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                # 解析文件名，获取爬虫名称
-                file_name = os.path.basename(file_path)
-                
-                # 处理数据
-                if isinstance(data, dict):
-                    # 单个爬虫的数据
-                    if not spider_name or data.get("spider_name", "") == spider_name:
-                        latest_results.append({
-                            "file_path": file_path,
-                            "file_name": file_name,
-                            "data": data,
-                            "timestamp": os.path.getmtime(file_path)
-                        })
-                elif isinstance(data, list):
-                    # 多个爬虫的数据列表
-                    for item in data:
-                        if not spider_name or item.get("spider_name", "") == spider_name:
-                            latest_results.append({
-                                "file_path": file_path,
-                                "file_name": file_name,
-                                "data": item,
-                                "timestamp": os.path.getmtime(file_path)
-                            })
-            except Exception as e:
-                logger.error(f"读取文件 {file_path} 失败: {e}")
-                continue
-            
-            # 检查是否达到限制
-            if len(latest_results) >= limit:
-                break
+        # 通过按时间排序的索引读取最新的limit条记录
+        latest_results = get_search_index().latest(spider_name=spider_name, limit=limit)
         
         return {
             "status": "success",
@@ -219,16 +244,24 @@ def get_latest_data(
         raise HTTPException(status_code=500, detail=f"获取最新数据失败: {str(e)}")
 
 @router.get("/stats")
-def get_data_stats():
+def get_data_stats(db: Session = Depends(get_db)):
     """
     获取数据统计信息
     
+    统计数据由爬虫保存文件和写入数据库时增量维护，查询时不再读取数据文件
+    
+    Args:
+        db: 数据库会话
+    
     Returns:
         数据统计信息
     """
     logger.info("获取数据统计信息")
     
     try:
+        # 数据库中的爬取数据统计
+        database_stats = DBUtils.get_crawled_data_stats(db)
+        
         # 检查数据存储目录是否存在
         if not os.path.exists(DATA_STORAGE_PATH):
             return {
@@ -236,67 +269,36 @@ def get_data_stats():
                 "total_files": 0,
                 "total_records": 0,
                 "spider_stats": {},
-                "data_type_stats": {}
+                "data_type_stats": {},
+                "daily_stats": {},
+                "source_stats": {},
+                "database": database_stats
             }
         
-        # 统计数据
-        total_files = 0
-        total_records = 0
-        spider_stats = {}
-        data_type_stats = {}
-        
-        # 获取所有数据文件
-        data_files = []
-        for root, dirs, files in os.walk(DATA_STORAGE_PATH):
-            for file in files:
-                if file.endswith(".json"):
-                    data_files.append(os.path.join(root, file))
-        
-        total_files = len(data_files)
-        
-        # 统计每个文件的数据
-        for file_path in data_files:
-            try:
-                # 读取文件内容
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                # 处理数据
-                if isinstance(data, dict):
-                    # 单个爬虫的数据
-                    total_records += 1
-                    
-                    # 统计爬虫
-                    spider_name = data.get("spider_name", "unknown")
-                    spider_stats[spider_name] = spider_stats.get(spider_name, 0) + 1
-                    
-                    # 统计数据类型
-                    data_type = data.get("type", "unknown")
-                    data_type_stats[data_type] = data_type_stats.get(data_type, 0) + 1
-                elif isinstance(data, list):
-                    # 多个爬虫的数据列表
-                    total_records += len(data)
-                    
-                    for item in data:
-                        # 统计爬虫
-                        spider_name = item.get("spider_name", "unknown")
-                        spider_stats[spider_name] = spider_stats.get(spider_name, 0) + 1
-                        
-                        # 统计数据类型
-                        data_type = item.get("type", "unknown")
-                        data_type_stats[data_type] = data_type_stats.get(data_type, 0) + 1
-            except Exception as e:
-                logger.error(f"读取文件 {file_path} 失败: {e}")
-                continue
+        # 数据文件统计
+        file_stats = get_search_index().get_stats()
         
         return {
             "status": "success",
-            "total_files": total_files,
-            "total_records": total_records,
-            "spider_stats": spider_stats,
-            "data_type_stats": data_type_stats
+            **file_stats,
+            "database": database_stats
         }
     
     except Exception as e:
         logger.error(f"获取数据统计信息失败: {e}")
-        raise HTTPException(status_code=500, detail=f"获取数据统计信息失败: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"获取数据统计信息失败: {str(e)}")
+
+@router.get("/cache")
+def get_cache_stats():
+    """
+    获取数据文件缓存统计信息
+    
+    Returns:
+        缓存命中、未命中和淘汰次数等统计信息
+    """
+    logger.info("获取数据文件缓存统计信息")
+    
+    return {
+        "status": "success",
+        "cache": get_file_cache().get_stats()
+    }
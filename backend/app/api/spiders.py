@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from loguru import logger
+from typing import Dict, Optional, Any
 import sys
 import os
 
@@ -7,9 +8,12 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-# 导入爬虫管理器和数据处理器
+# 导入爬虫管理器
 from wumeng_crawler.spiders.spider_manager import get_spider_manager
-from wumeng_crawler.processors.data_processor import get_data_processor
+from app.core.config import settings
+from app.core.scheduler import get_scheduler_status
+from app.core.jobs import get_job_manager, JobQueueFullError, JOB_TYPE_SPIDER, JOB_TYPE_ALL_SPIDERS
+from app.core.spider_control import uses_shared_stop, set_spiders_stopped
 
 router = APIRouter()
 
@@ -30,6 +34,11 @@ def get_all_spiders():
         # 获取所有爬虫的状态
         spiders_status = spider_manager.get_spider_status()
         
+        # 附加定时调度状态
+        schedule_status = get_scheduler_status()
+        for status in spiders_status:
+            status["schedule"] = schedule_status.get(status["name"])
+        
         return {
             "status": "success",
             "count": len(spiders_status),
@@ -40,103 +49,168 @@ def get_all_spiders():
         logger.error(f"获取爬虫状态失败: {e}")
         raise HTTPException(status_code=500, detail=f"获取爬虫状态失败: {str(e)}")
 
-@router.post("/{spider_name}/run")
+@router.get("/schedule")
+def get_spider_schedule():
+    """
+    获取爬虫定时调度状态
+    
+    Returns:
+        每个爬虫的cron表达式、下次运行时间和最近一次运行耗时
+    """
+    logger.info("获取爬虫定时调度状态")
+    
+    try:
+        return {
+            "status": "success",
+            "backend": settings.scheduler_backend,
+            "schedule": get_scheduler_status()
+        }
+    
+    except Exception as e:
+        logger.error(f"获取爬虫定时调度状态失败: {e}")
+        raise HTTPException(status_code=500, detail=f"获取爬虫定时调度状态失败: {str(e)}")
+
+@router.get("/jobs/{job_id}")
+def get_spider_job(job_id: str):
+    """
+    查询爬虫任务的状态
+    
+    Args:
+        job_id: 任务ID
+    
+    Returns:
+        任务的状态、进度、记录数和耗时
+    """
+    try:
+        job = get_job_manager().get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"未找到爬虫任务: {job_id}")
+        
+        return {
+            "status": "success",
+            "job": job
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"查询爬虫任务失败: {e}")
+        raise HTTPException(status_code=500, detail=f"查询爬虫任务失败: {str(e)}")
+
+def _submit_job(job_type: str, spider_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    提交爬虫任务并返回任务ID
+    
+    Args:
+        job_type: 任务类型
+        spider_name: 爬虫名称
+    
+    Returns:
+        提交结果
+    """
+    try:
+        job = get_job_manager().submit(job_type, spider_name)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    
+    return {
+        "status": "accepted",
+        "job_id": job["id"],
+        "job": job
+    }
+
+@router.post("/{spider_name}/run", status_code=202)
 def run_spider_task(spider_name: str):
     """
-    运行指定名称的爬虫
+    提交运行指定名称爬虫的后台任务，立即返回任务ID
     
     Args:
         spider_name: 爬虫名称
     
     Returns:
-        任务执行结果
+        任务ID，通过/jobs/{job_id}查询运行状态
     """
-    logger.info(f"运行爬虫任务: {spider_name}")
+    logger.info(f"提交爬虫任务: {spider_name}")
     
     try:
         # 初始化爬虫管理器
         spider_manager = get_spider_manager()
+        spider = spider_manager.get_spider(spider_name)
+        if spider is None:
+            raise HTTPException(status_code=404, detail=f"未找到名称为 {spider_name} 的爬虫")
+        if spider.stopped:
+            raise HTTPException(status_code=409, detail=f"爬虫 {spider_name} 已停止，请先启动")
         
-        # 初始化数据处理器
-        data_processor = get_data_processor()
-        
-        # 直接运行爬虫，不使用Celery
-        spider_result = spider_manager.run_spider(spider_name)
-        
-        if spider_result:
-            # 处理数据，同时保存到数据库
-            _ = data_processor.process(
-                spider_result, 
-                format_type="json", 
-                save=True, 
-                save_to_db=True
-            )
-            
-            return {
-                "status": "success",
-                "message": f"爬虫 {spider_name} 运行成功，数据已保存到文件和数据库",
-                "result": "success"
-            }
-        else:
-            return {
-                "status": "warning",
-                "message": f"爬虫 {spider_name} 运行失败或未爬取到任何数据",
-                "result": "warning"
-            }
+        return _submit_job(JOB_TYPE_SPIDER, spider_name)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"启动爬虫任务失败: {e}")
         raise HTTPException(status_code=500, detail=f"启动爬虫任务失败: {str(e)}")
 
-@router.post("/run-all")
+@router.post("/run-all", status_code=202)
 def run_all_spiders_task():
     """
-    运行所有爬虫
+    提交运行所有爬虫的后台任务，立即返回任务ID
+    
+    Returns:
+        任务ID，通过/jobs/{job_id}查询运行状态
+    """
+    logger.info("提交所有爬虫任务")
+    
+    try:
+        return _submit_job(JOB_TYPE_ALL_SPIDERS)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"启动所有爬虫任务失败: {e}")
+        raise HTTPException(status_code=500, detail=f"启动所有爬虫任务失败: {str(e)}")
+
+@router.post("/{spider_name}/start")
+def start_spider_task(spider_name: str):
+    """
+    启动指定名称的爬虫，之后可以手动或定时运行
+    
+    Args:
+        spider_name: 爬虫名称
     
     Returns:
         任务执行结果
     """
-    logger.info("运行所有爬虫任务")
+    logger.info(f"启动爬虫: {spider_name}")
     
     try:
         # 初始化爬虫管理器
         spider_manager = get_spider_manager()
         
-        # 初始化数据处理器
-        data_processor = get_data_processor()
-        
-        # 直接运行所有爬虫，不使用Celery
-        all_data = spider_manager.run_all_spiders()
-        
-        if all_data:
-            # 处理数据，同时保存到数据库
-            _ = data_processor.process(
-                all_data, 
-                format_type="json", 
-                save=True, 
-                save_to_db=True
-            )
-            
-            return {
-                "status": "success",
-                "message": "所有爬虫运行成功，数据已保存到文件和数据库",
-                "result": "success"
-            }
-        else:
-            return {
-                "status": "warning",
-                "message": "所有爬虫运行失败或未爬取到任何数据",
-                "result": "warning"
-            }
+        if not spider_manager.start_spider(spider_name):
+            raise HTTPException(status_code=404, detail=f"未找到名称为 {spider_name} 的爬虫")
+        
+        # 清除停止标记，Celery worker中的爬虫在下一个任务开始时重新启动
+        if uses_shared_stop():
+            set_spiders_stopped([spider_name], False)
+        
+        return {
+            "status": "success",
+            "message": f"爬虫 {spider_name} 已启动",
+            "result": "success"
+        }
     
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"启动所有爬虫任务失败: {e}")
-        raise HTTPException(status_code=500, detail=f"启动所有爬虫任务失败: {str(e)}")
+        logger.error(f"启动爬虫失败: {e}")
+        raise HTTPException(status_code=500, detail=f"启动爬虫失败: {str(e)}")
 
 @router.post("/{spider_name}/stop")
 def stop_spider_task(spider_name: str):
     """
-    停止指定名称的爬虫
+    停止指定名称的爬虫，不影响其他爬虫
+    
+    爬虫任务交给Celery执行时同时写入Redis停止标记，worker中正在进行的运行随之取消，
+    之后的手动和定时运行都被拒绝，直到调用start接口
     
     Args:
         spider_name: 爬虫名称
@@ -150,8 +224,12 @@ def stop_spider_task(spider_name: str):
         # 初始化爬虫管理器
         spider_manager = get_spider_manager()
         
-        # 关闭所有爬虫（目前spider_manager只支持关闭所有爬虫）
-        spider_manager.close_all_spiders()
+        if not spider_manager.stop_spider(spider_name):
+            raise HTTPException(status_code=404, detail=f"未找到名称为 {spider_name} 的爬虫")
+        
+        # Celery worker中运行的爬虫通过Redis停止标记取消正在进行的运行
+        if uses_shared_stop():
+            set_spiders_stopped([spider_name], True)
         
         return {
             "status": "success",
@@ -159,14 +237,49 @@ def stop_spider_task(spider_name: str):
             "result": "success"
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"启动停止爬虫任务失败: {e}")
         raise HTTPException(status_code=500, detail=f"启动停止爬虫任务失败: {str(e)}")
 
+@router.post("/start-all")
+def start_all_spiders_task():
+    """
+    启动所有爬虫，撤销stop-all接口的停止状态
+    
+    Returns:
+        任务执行结果
+    """
+    logger.info("启动所有爬虫")
+    
+    try:
+        # 初始化爬虫管理器
+        spider_manager = get_spider_manager()
+        
+        spider_manager.start_all_spiders()
+        
+        # 清除所有停止标记，Celery worker中的爬虫在下一个任务开始时重新启动
+        if uses_shared_stop():
+            set_spiders_stopped([spider.name for spider in spider_manager], False)
+        
+        return {
+            "status": "success",
+            "message": "所有爬虫已启动",
+            "result": "success"
+        }
+    
+    except Exception as e:
+        logger.error(f"启动所有爬虫失败: {e}")
+        raise HTTPException(status_code=500, detail=f"启动所有爬虫失败: {str(e)}")
+
 @router.post("/stop-all")
 def stop_all_spiders_task():
     """
-    停止所有爬虫
+    停止所有爬虫并取消正在进行的运行
+    
+    爬虫保持停止状态，之后的手动运行返回409，定时运行被跳过，
+    直到调用start-all接口或单个爬虫的start接口
     
     Returns:
         任务执行结果
@@ -180,6 +293,10 @@ def stop_all_spiders_task():
         # 关闭所有爬虫
         spider_manager.close_all_spiders()
         
+        # Celery worker中运行的爬虫通过Redis停止标记取消正在进行的运行
+        if uses_shared_stop():
+            set_spiders_stopped([spider.name for spider in spider_manager], True)
+        
         return {
             "status": "success",
             "message": "所有爬虫已停止",
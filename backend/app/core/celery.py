@@ -1,6 +1,46 @@
 from celery import Celery
+from celery.schedules import crontab
 from app.core.config import settings
 import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from wumeng_crawler.spiders.spider_scheduler import schedule_key_to_spider_name
+
+def build_beat_schedule() -> dict:
+    """
+    根据爬虫调度配置生成Celery beat定时任务，调度后端不是celery时返回空配置
+    
+    定时任务先经过app.tasks.schedule_spider随机推迟，再由run_scheduled_spider加锁运行，
+    与进程内调度器的随机推迟、并发上限和不重叠运行一致。
+    
+    Returns:
+        beat_schedule配置
+    """
+    if settings.scheduler_backend != "celery":
+        return {}
+    
+    beat_schedule = {}
+    for key, entry in settings.spider_schedule.items():
+        if not entry.get("enabled", True):
+            continue
+        
+        minute, hour, day_of_month, month_of_year, day_of_week = entry["cron"].split()
+        spider_name = schedule_key_to_spider_name(key)
+        beat_schedule[f"run_{key}"] = {
+            "task": "app.tasks.schedule_spider",
+            "schedule": crontab(
+                minute=minute,
+                hour=hour,
+                day_of_month=day_of_month,
+                month_of_year=month_of_year,
+                day_of_week=day_of_week
+            ),
+            "args": (spider_name,)
+        }
+    return beat_schedule
 
 # 创建Celery应用实例
 celery_app = Celery(
@@ -17,7 +57,7 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Shanghai",
     enable_utc=True,
-    beat_schedule={},
+    beat_schedule=build_beat_schedule(),
     task_ignore_result=True,
     task_store_errors_even_if_ignored=True,
     broker_connection_retry_on_startup=True,
@@ -87,6 +87,28 @@ class Settings(BaseSettings):
         }
     }
     
+    # 调度后端: local为进程内调度器，celery为Celery beat，none为不定时运行
+    scheduler_backend: str = "local"
+    
+    # API提交的爬虫任务执行后端: local为后台线程池，celery为Celery worker，auto为Celery可用时使用Celery
+    job_backend: str = "auto"
+    # 后台线程池的线程数
+    job_max_workers: int = 2
+    # 等待和运行中的爬虫任务数上限，超过时拒绝提交，只对local后端生效
+    job_max_pending: int = 8
+    # 保留的爬虫任务记录数
+    job_history_size: int = 100
+    
+    # 爬虫数据搜索后端: files为爬虫数据文件，db为crawled_data表
+    search_backend: str = "files"
+    
+    # 爬取数据批量写入时每批的数据数量，每批单独提交
+    crawled_data_chunk_size: int = 1000
+    # 按(spider_name, data_id)更新已有数据，而不是为内容变化的数据新增记录
+    crawled_data_upsert: bool = False
+    # 每批写入因数据库锁等错误失败时的重试次数
+    crawled_data_commit_retries: int = 3
+    
     # 数据处理配置
     spider_data_processing: Dict[str, Any] = {
         "remove_duplicates": True,
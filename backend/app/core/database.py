@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from loguru import logger
+from typing import List
 
 # 创建数据库引擎
 engine = create_engine(
@@ -20,6 +21,26 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # 创建基础模型类
 Base = declarative_base()
 
+# 爬取数据全文索引，对data_content中的文本和数字做扁平化投影，trigram分词支持中文子串匹配
+CRAWLED_DATA_FTS_PROJECTION = (
+    "(SELECT group_concat(value, ' ') FROM json_tree({row}.data_content) "
+    "WHERE type IN ('text', 'integer', 'real'))"
+)
+
+CRAWLED_DATA_FTS_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS crawled_data_fts USING fts5(content_text, tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS crawled_data_fts_ai AFTER INSERT ON crawled_data BEGIN
+        INSERT INTO crawled_data_fts (rowid, content_text) VALUES (new.id, {CRAWLED_DATA_FTS_PROJECTION.format(row="new")});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS crawled_data_fts_ad AFTER DELETE ON crawled_data BEGIN
+        DELETE FROM crawled_data_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS crawled_data_fts_au AFTER UPDATE OF data_content ON crawled_data BEGIN
+        DELETE FROM crawled_data_fts WHERE rowid = old.id;
+        INSERT INTO crawled_data_fts (rowid, content_text) VALUES (new.id, {CRAWLED_DATA_FTS_PROJECTION.format(row="new")});
+    END"""
+]
+
 # 获取数据库会话
 def get_db():
     """
@@ -43,16 +64,100 @@ def init_db():
     
     try:
         # 导入所有模型，确保Base.metadata包含所有表的定义
-        from app.models import UserSegamaid, CrawledData
+        from app.models import UserSegamaid, CrawledData, CrawledDataStats
         
         # 创建所有表
         Base.metadata.create_all(bind=engine)
         
+        # 为已存在的表补建新增的列和索引
+        add_missing_columns(CrawledData.__table__)
+        for index in CrawledData.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+        
+        # 创建爬取数据全文索引
+        init_crawled_data_fts()
+        
+        # 统计表为空而爬取数据表已有数据时，根据已有数据重建统计表
+        from app.core.db_utils import DBUtils
+        db = SessionLocal()
+        try:
+            if db.query(CrawledDataStats.id).first() is None and db.query(CrawledData.id).first() is not None:
+                DBUtils.rebuild_crawled_data_stats(db)
+            
+            # 新增内容指纹列之前保存的数据补算指纹
+            DBUtils.backfill_content_hash(db)
+        finally:
+            db.close()
+        
         logger.info("数据库初始化完成，所有表已创建")
     except Exception as e:
         logger.error(f"数据库初始化失败: {e}")
         raise e
 
+# 补建新增的列
+def add_missing_columns(table) -> List[str]:
+    """
+    为已存在的表补建模型中新增的可空列，create_all不会修改已存在的表
+    
+    Args:
+        table: 模型对应的Table对象
+    
+    Returns:
+        补建的列名列表
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return []
+    
+    existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+    added_columns = []
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing_columns or not column.nullable:
+                continue
+            
+            column_type = column.type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            added_columns.append(column.name)
+    
+    if added_columns:
+        logger.info(f"为表 {table.name} 补建列: {added_columns}")
+    return added_columns
+
+# 初始化爬取数据全文索引
+def init_crawled_data_fts() -> bool:
+    """
+    为爬取数据表创建FTS5全文索引及同步触发器，仅支持SQLite
+    
+    Returns:
+        是否成功创建全文索引
+    """
+    if engine.dialect.name != "sqlite":
+        logger.info("非SQLite数据库，跳过创建爬取数据全文索引")
+        return False
+    
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'crawled_data_fts'")
+            ).first() is not None
+            
+            for statement in CRAWLED_DATA_FTS_STATEMENTS:
+                conn.execute(text(statement))
+            
+            # 首次创建时为已有数据建立索引
+            if not exists:
+                conn.execute(text(
+                    "INSERT INTO crawled_data_fts (rowid, content_text) "
+                    f"SELECT id, {CRAWLED_DATA_FTS_PROJECTION.format(row='crawled_data')} FROM crawled_data"
+                ))
+        
+        logger.info("爬取数据全文索引初始化完成")
+        return True
+    except Exception as e:
+        logger.warning(f"创建爬取数据全文索引失败，数据库搜索将回退为LIKE查询: {e}")
+        return False
+
 # 关闭数据库连接
 def close_db():
     """
@@ -1,9 +1,25 @@
+from sqlalchemy import func, select, text, literal_column, bindparam, String, cast
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from loguru import logger
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional
+import hashlib
+import json
+import time
 
+from app.core.config import settings
 from app.models.crawled_data import CrawledData
+from app.models.crawled_data_stats import CrawledDataStats
+
+# 计算内容指纹时忽略的易变字段，每次爬取都会变化
+CONTENT_HASH_EXCLUDED_KEYS = ("crawl_time",)
+
+# 批量查询和更新时每条SQL的参数数量上限
+QUERY_PARAM_CHUNK = 500
+
+# 批量写入失败后首次重试的等待时间（秒），之后每次加倍
+CRAWLED_DATA_RETRY_DELAY = 0.5
 
 class DBUtils:
     """
@@ -11,53 +27,373 @@ class DBUtils:
     """
     
     @staticmethod
-    def save_crawled_data(db: Session, crawled_data_list: List[Dict[str, Any]]):
+    def content_fingerprint(data_content: Any) -> str:
         """
-        保存爬取的数据到数据库
+        计算数据内容的稳定指纹，键顺序和爬取时间等易变字段不影响指纹
+        
+        Args:
+            data_content: 数据内容
+        
+        Returns:
+            64位十六进制SHA-256摘要
+        """
+        if isinstance(data_content, dict):
+            data_content = {key: value for key, value in data_content.items() if key not in CONTENT_HASH_EXCLUDED_KEYS}
+        
+        serialized = json.dumps(data_content, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _find_existing_content(db: Session, content_hashes: List[str]) -> Dict[Tuple[str, str, str, str], int]:
+        """
+        按内容指纹批量查找已保存的没有data_id的有效数据
+        
+        没有data_id的数据无法判断是否为同一条数据的新版本，内容指纹相同即视为已保存
         
         Args:
             db: 数据库会话
-            crawled_data_list: 爬取的数据列表，每个元素包含spider_name、data_type、data_id、data_content、source等字段
+            content_hashes: 内容指纹列表
         
         Returns:
-            saved_count: 保存成功的数据数量
+            (spider_name, data_type, source, content_hash)到数据ID的映射
         """
-        logger.info(f"开始保存爬取数据，共 {len(crawled_data_list)} 条数据")
+        existing = {}
+        for start in range(0, len(content_hashes), QUERY_PARAM_CHUNK):
+            rows = db.query(
+                CrawledData.id,
+                CrawledData.spider_name,
+                CrawledData.data_type,
+                CrawledData.source,
+                CrawledData.content_hash
+            ).filter(
+                CrawledData.content_hash.in_(content_hashes[start:start + QUERY_PARAM_CHUNK]),
+                CrawledData.data_id.is_(None),
+                CrawledData.is_valid == True
+            ).all()
+            
+            for row_id, spider_name, data_type, source, content_hash in rows:
+                existing.setdefault((spider_name, data_type, source, content_hash), row_id)
         
-        saved_count = 0
+        return existing
+    
+    @staticmethod
+    def _find_latest_rows(db: Session, items: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str, str], Tuple[int, Optional[str]]]:
+        """
+        按(spider_name, data_type, source, data_id)批量查找每条数据最新的有效记录
         
-        try:
-            for data_item in crawled_data_list:
-                # 验证数据完整性
-                if not all(key in data_item for key in ["spider_name", "data_type", "data_content", "source"]):
-                    logger.warning(f"爬取数据缺少必要字段，跳过保存: {data_item}")
+        Args:
+            db: 数据库会话
+            items: 爬取的数据列表
+        
+        Returns:
+            (spider_name, data_type, source, data_id)到(数据ID, 内容指纹)的映射
+        """
+        items = [item for item in items if item.get("data_id") is not None]
+        spider_names = {item["spider_name"] for item in items}
+        data_ids = sorted({str(item["data_id"]) for item in items})
+        
+        latest = {}
+        for start in range(0, len(data_ids), QUERY_PARAM_CHUNK):
+            latest_ids = select(func.max(CrawledData.id)).where(
+                CrawledData.spider_name.in_(spider_names),
+                CrawledData.data_id.in_(data_ids[start:start + QUERY_PARAM_CHUNK]),
+                CrawledData.is_valid == True
+            ).group_by(
+                CrawledData.spider_name,
+                CrawledData.data_type,
+                CrawledData.source,
+                CrawledData.data_id
+            )
+            
+            rows = db.query(
+                CrawledData.id,
+                CrawledData.spider_name,
+                CrawledData.data_type,
+                CrawledData.source,
+                CrawledData.data_id,
+                CrawledData.content_hash
+            ).filter(CrawledData.id.in_(latest_ids)).all()
+            
+            for row_id, spider_name, data_type, source, data_id, content_hash in rows:
+                latest[(spider_name, data_type, source, data_id)] = (row_id, content_hash)
+        
+        return latest
+    
+    @staticmethod
+    def _find_existing_data_ids(db: Session, items: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Tuple[int, Tuple[str, str, str, str]]]:
+        """
+        按(spider_name, data_id)批量查找已保存的数据，同一数据有多条记录时取最新的一条
+        
+        Args:
+            db: 数据库会话
+            items: 爬取的数据列表
+        
+        Returns:
+            (spider_name, data_id)到(数据ID, 统计分组)的映射，统计分组为(spider_name, data_type, source, stat_date)
+        """
+        pairs = {(item["spider_name"], str(item["data_id"])) for item in items if item.get("data_id") is not None}
+        spider_names = {spider_name for spider_name, _ in pairs}
+        data_ids = sorted({data_id for _, data_id in pairs})
+        
+        existing = {}
+        for start in range(0, len(data_ids), QUERY_PARAM_CHUNK):
+            rows = db.query(
+                CrawledData.id,
+                CrawledData.spider_name,
+                CrawledData.data_id,
+                CrawledData.data_type,
+                CrawledData.source,
+                CrawledData.crawl_time
+            ).filter(
+                CrawledData.spider_name.in_(spider_names),
+                CrawledData.data_id.in_(data_ids[start:start + QUERY_PARAM_CHUNK])
+            ).order_by(CrawledData.id).all()
+            
+            for row_id, spider_name, data_id, data_type, source, crawl_time in rows:
+                if (spider_name, data_id) in pairs:
+                    existing[(spider_name, data_id)] = (row_id, (spider_name, data_type, source, crawl_time.strftime("%Y-%m-%d")))
+        
+        return existing
+    
+    @staticmethod
+    def _save_crawled_data_chunk(db: Session, chunk: List[Tuple[Dict[str, Any], str]], upsert: bool) -> Tuple[int, int, int]:
+        """
+        在当前事务中写入一批爬取数据，新数据批量插入，upsert时内容变化的已有数据批量更新
+        
+        Args:
+            db: 数据库会话
+            chunk: (数据项, 内容指纹)列表
+            upsert: 是否按(spider_name, data_id)更新已有数据
+        
+        Returns:
+            (inserted_count, updated_count, unchanged_count): 新增、更新和内容未变化的数据数量
+        """
+        table = CrawledData.__table__
+        now = datetime.utcnow()
+        
+        existing = DBUtils._find_existing_content(
+            db,
+            list({content_hash for data_item, content_hash in chunk if data_item.get("data_id") is None})
+        )
+        latest_rows = DBUtils._find_latest_rows(db, [item for item, _ in chunk])
+        existing_data_ids = DBUtils._find_existing_data_ids(db, [item for item, _ in chunk]) if upsert else {}
+        
+        inserts = []
+        # 本批次中待插入数据的位置，同一数据重复出现时后出现的覆盖先出现的
+        pending_inserts: Dict[Tuple[str, str], int] = {}
+        updates: Dict[int, Dict[str, Any]] = {}
+        unchanged_ids = set()
+        unchanged_count = 0
+        stats_groups = {}
+        
+        for data_item, content_hash in chunk:
+            data_id = None if data_item.get("data_id") is None else str(data_item["data_id"])
+            
+            if data_id is None:
+                # 内容未变化，包括同一批次中的重复数据
+                key = (data_item["spider_name"], data_item["data_type"], data_item["source"], content_hash)
+                if key in existing:
+                    if existing[key] is not None:
+                        unchanged_ids.add(existing[key])
+                    unchanged_count += 1
                     continue
+                existing[key] = None
+            else:
+                # 只与同一数据最新的记录比较，内容变回旧版本时仍然保存为最新记录
+                group = (data_item["spider_name"], data_item["data_type"], data_item["source"], data_id)
+                latest_id, latest_hash = latest_rows.get(group, (None, None))
+                if latest_hash == content_hash:
+                    if latest_id is not None:
+                        unchanged_ids.add(latest_id)
+                    unchanged_count += 1
+                    continue
+                latest_rows[group] = (None, content_hash)
+            
+            row = {
+                "spider_name": data_item["spider_name"],
+                "data_type": data_item["data_type"],
+                "data_id": data_id,
+                "data_content": data_item["data_content"],
+                "source": data_item["source"],
+                "content_hash": content_hash
+            }
+            
+            data_key = (row["spider_name"], row["data_id"]) if upsert and row["data_id"] is not None else None
+            if data_key in existing_data_ids:
+                # 内容有变化的已有数据，覆盖内容，保留爬取时间
+                row_id, old_group = existing_data_ids[data_key]
+                updates[row_id] = row
                 
-                # 创建CrawledData对象
-                crawled_data = CrawledData(
-                    spider_name=data_item["spider_name"],
-                    data_type=data_item["data_type"],
-                    data_id=data_item.get("data_id"),
-                    data_content=data_item["data_content"],
-                    crawl_time=datetime.utcnow(),
-                    update_time=datetime.utcnow(),
-                    is_valid=True,
-                    source=data_item["source"]
-                )
-                
-                # 添加到数据库
-                db.add(crawled_data)
-                saved_count += 1
+                # 数据类型或来源变化时，统计从原分组移到新分组，统计日期仍按原爬取时间
+                new_group = (row["spider_name"], row["data_type"], row["source"], old_group[3])
+                if new_group != old_group:
+                    stats_groups[old_group] = stats_groups.get(old_group, 0) - 1
+                    stats_groups[new_group] = stats_groups.get(new_group, 0) + 1
+                    existing_data_ids[data_key] = (row_id, new_group)
+                continue
+            if data_key in pending_inserts:
+                inserts[pending_inserts[data_key]].update(row)
+                continue
+            if data_key is not None:
+                pending_inserts[data_key] = len(inserts)
             
-            # 提交事务
-            db.commit()
+            row.update(crawl_time=now, update_time=now, is_valid=True)
+            inserts.append(row)
+            
+            # 累计统计数据
+            group = (row["spider_name"], row["data_type"], row["source"], now.strftime("%Y-%m-%d"))
+            stats_groups[group] = stats_groups.get(group, 0) + 1
+        
+        # 批量插入新数据
+        if inserts:
+            db.execute(table.insert(), inserts)
+        
+        # 批量更新内容有变化的已有数据
+        if updates:
+            db.execute(
+                table.update().where(table.c.id == bindparam("row_id")).values(
+                    data_type=bindparam("new_data_type"),
+                    data_content=bindparam("new_data_content"),
+                    source=bindparam("new_source"),
+                    content_hash=bindparam("new_content_hash"),
+                    update_time=now,
+                    is_valid=True
+                ),
+                [
+                    {
+                        "row_id": row_id,
+                        "new_data_type": row["data_type"],
+                        "new_data_content": row["data_content"],
+                        "new_source": row["source"],
+                        "new_content_hash": row["content_hash"]
+                    }
+                    for row_id, row in updates.items()
+                ]
+            )
+        
+        # 未变化的数据只更新update_time
+        unchanged_ids = sorted(unchanged_ids)
+        for start in range(0, len(unchanged_ids), QUERY_PARAM_CHUNK):
+            db.execute(
+                table.update().where(
+                    table.c.id.in_(unchanged_ids[start:start + QUERY_PARAM_CHUNK])
+                ).values(update_time=now)
+            )
+        
+        # 在同一事务中更新统计表
+        DBUtils._bump_crawled_data_stats(db, stats_groups, 1)
+        
+        return len(inserts), len(updates), unchanged_count
+    
+    @staticmethod
+    def save_crawled_data(db: Session, crawled_data_list: List[Dict[str, Any]], chunk_size: Optional[int] = None, upsert: Optional[bool] = None, max_retries: Optional[int] = None):
+        """
+        批量保存爬取的数据到数据库
+        
+        数据按批写入，每批使用一条批量插入语句并单独提交，提交因数据库锁等错误失败时回滚该批并重试。
+        有data_id的数据与同一(spider_name, data_type, source, data_id)最新的有效记录比较内容指纹，
+        没有data_id的数据与同一爬虫、数据类型和来源下所有没有data_id的有效记录比较；
+        内容指纹相同视为未变化，不新增记录，只更新已有记录的update_time。
+        upsert时按(spider_name, data_id)覆盖内容有变化的已有数据，没有data_id的数据仍然新增。
+        
+        Args:
+            db: 数据库会话
+            crawled_data_list: 爬取的数据列表，每个元素包含spider_name、data_type、data_id、data_content、source等字段，
+                可以携带content_hash，未携带时根据data_content计算
+            chunk_size: 每批的数据数量，默认取配置crawled_data_chunk_size
+            upsert: 是否按(spider_name, data_id)更新已有数据，默认取配置crawled_data_upsert
+            max_retries: 每批失败时的重试次数，默认取配置crawled_data_commit_retries
+        
+        Returns:
+            saved_count: 新增和更新的数据数量
+        """
+        chunk_size = max(1, chunk_size or settings.crawled_data_chunk_size)
+        upsert = settings.crawled_data_upsert if upsert is None else upsert
+        max_retries = settings.crawled_data_commit_retries if max_retries is None else max_retries
+        
+        logger.info(f"开始保存爬取数据，共 {len(crawled_data_list)} 条数据，每批 {chunk_size} 条，upsert: {upsert}")
+        
+        # 验证数据完整性并计算内容指纹
+        valid_items = []
+        for data_item in crawled_data_list:
+            if not all(key in data_item for key in ["spider_name", "data_type", "data_content", "source"]):
+                logger.warning(f"爬取数据缺少必要字段，跳过保存: {data_item}")
+                continue
+            
+            content_hash = data_item.get("content_hash") or DBUtils.content_fingerprint(data_item["data_content"])
+            valid_items.append((data_item, content_hash))
+        
+        inserted_count = updated_count = unchanged_count = 0
+        
+        for start in range(0, len(valid_items), chunk_size):
+            chunk = valid_items[start:start + chunk_size]
+            
+            for attempt in range(max_retries + 1):
+                try:
+                    inserted, updated, unchanged = DBUtils._save_crawled_data_chunk(db, chunk, upsert)
+                    db.commit()
+                    break
+                except OperationalError as e:
+                    db.rollback()
+                    if attempt >= max_retries:
+                        logger.error(f"保存爬取数据失败，已重试 {max_retries} 次: {e}")
+                        raise e
+                    delay = CRAWLED_DATA_RETRY_DELAY * 2 ** attempt
+                    logger.warning(f"保存爬取数据失败，{delay} 秒后第 {attempt + 1} 次重试: {e}")
+                    time.sleep(delay)
+                except Exception as e:
+                    logger.error(f"保存爬取数据失败: {e}")
+                    db.rollback()
+                    raise e
+            
+            inserted_count += inserted
+            updated_count += updated
+            unchanged_count += unchanged
+        
+        logger.info(f"爬取数据保存完成，新增 {inserted_count} 条数据，更新 {updated_count} 条数据，{unchanged_count} 条数据内容未变化")
+        
+        return inserted_count + updated_count
+    
+    @staticmethod
+    def backfill_content_hash(db: Session, batch_size: int = 1000) -> int:
+        """
+        为没有内容指纹的已有数据补算指纹
+        
+        Args:
+            db: 数据库会话
+            batch_size: 每批处理的数据数量
+        
+        Returns:
+            updated_count: 补算指纹的数据数量
+        """
+        updated_count = 0
+        last_id = 0
+        
+        try:
+            while True:
+                rows = db.query(CrawledData.id, CrawledData.data_content).filter(
+                    CrawledData.content_hash.is_(None),
+                    CrawledData.id > last_id
+                ).order_by(CrawledData.id).limit(batch_size).all()
+                if not rows:
+                    break
+                
+                db.bulk_update_mappings(CrawledData, [
+                    {"id": row_id, "content_hash": DBUtils.content_fingerprint(data_content)}
+                    for row_id, data_content in rows
+                ])
+                db.commit()
+                
+                updated_count += len(rows)
+                last_id = rows[-1][0]
             
-            logger.info(f"爬取数据保存完成，共保存 {saved_count} 条数据")
+            if updated_count:
+                logger.info(f"补算爬取数据内容指纹完成，共 {updated_count} 条数据")
             
-            return saved_count
+            return updated_count
         
         except Exception as e:
-            logger.error(f"保存爬取数据失败: {e}")
+            logger.error(f"补算爬取数据内容指纹失败: {e}")
             db.rollback()
             raise e
     
@@ -95,6 +431,80 @@ class DBUtils:
             logger.error(f"查询爬取数据失败: {e}")
             raise e
     
+    @staticmethod
+    def _has_crawled_data_fts(db: Session) -> bool:
+        """
+        检查爬取数据全文索引是否可用
+        
+        Args:
+            db: 数据库会话
+        
+        Returns:
+            全文索引是否可用
+        """
+        if db.get_bind().dialect.name != "sqlite":
+            return False
+        
+        return db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'crawled_data_fts'")
+        ).first() is not None
+    
+    @staticmethod
+    def search_crawled_data(db: Session, keyword: Optional[str] = None, spider_name: Optional[str] = None, data_type: Optional[str] = None, limit: int = 10, offset: int = 0) -> Tuple[int, List[CrawledData]]:
+        """
+        搜索爬取的数据，关键词查询使用FTS5全文索引
+        
+        Args:
+            db: 数据库会话
+            keyword: 查询关键词
+            spider_name: 爬虫名称
+            data_type: 数据类型
+            limit: 返回结果数量
+            offset: 偏移量
+        
+        Returns:
+            (total, crawled_data_list): 匹配总数和当前页数据
+        """
+        logger.info(f"搜索爬取数据: keyword={keyword}, spider_name={spider_name}, data_type={data_type}, limit={limit}, offset={offset}")
+        
+        try:
+            query = db.query(CrawledData)
+            
+            if spider_name:
+                query = query.filter(CrawledData.spider_name == spider_name)
+            
+            if data_type:
+                query = query.filter(CrawledData.data_type == data_type)
+            
+            if keyword:
+                if DBUtils._has_crawled_data_fts(db):
+                    # trigram分词的MATCH要求至少3个字符，更短的关键词对索引文本做LIKE匹配
+                    if len(keyword) >= 3:
+                        condition = text("crawled_data_fts MATCH :fts_keyword")
+                        fts_keyword = '"' + keyword.replace('"', '""') + '"'
+                    else:
+                        condition = text("content_text LIKE :fts_keyword ESCAPE '\\'")
+                        fts_keyword = "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                    
+                    matched_ids = select(literal_column("rowid")).select_from(text("crawled_data_fts")).where(condition)
+                    query = query.filter(CrawledData.id.in_(matched_ids)).params(fts_keyword=fts_keyword)
+                else:
+                    query = query.filter(cast(CrawledData.data_content, String).contains(keyword, autoescape=True))
+            
+            total = query.count()
+            crawled_data_list = query.order_by(
+                CrawledData.crawl_time.desc(),
+                CrawledData.id.desc()
+            ).offset(offset).limit(limit).all()
+            
+            logger.info(f"搜索爬取数据完成，共 {total} 条匹配数据")
+            
+            return total, crawled_data_list
+        
+        except Exception as e:
+            logger.error(f"搜索爬取数据失败: {e}")
+            raise e
+    
     @staticmethod
     def update_crawled_data_validity(db: Session, data_id: str, is_valid: bool):
         """
@@ -150,6 +560,10 @@ class DBUtils:
             from datetime import timedelta
             delete_time = datetime.utcnow() - timedelta(days=days)
             
+            # 在同一事务中扣减统计表
+            stats_groups = DBUtils._group_crawled_data(db, CrawledData.crawl_time < delete_time)
+            DBUtils._bump_crawled_data_stats(db, stats_groups, -1)
+            
             # 执行删除
             result = db.query(CrawledData).filter(
                 CrawledData.crawl_time < delete_time
@@ -165,4 +579,191 @@ class DBUtils:
         except Exception as e:
             logger.error(f"删除爬取数据失败: {e}")
             db.rollback()
-            raise e
\ No newline at end of file
+            raise e
+    
+    @staticmethod
+    def _group_crawled_data(db: Session, *criteria) -> Dict[Tuple[str, str, str, str], int]:
+        """
+        按爬虫名称、数据类型、来源和爬取日期分组统计爬取数据
+        
+        Args:
+            db: 数据库会话
+            *criteria: 过滤条件
+        
+        Returns:
+            stats_groups: (spider_name, data_type, source, stat_date)到记录数量的映射
+        """
+        stat_date = func.date(CrawledData.crawl_time)
+        query = db.query(
+            CrawledData.spider_name,
+            CrawledData.data_type,
+            CrawledData.source,
+            stat_date,
+            func.count(CrawledData.id)
+        ).filter(*criteria).group_by(
+            CrawledData.spider_name,
+            CrawledData.data_type,
+            CrawledData.source,
+            stat_date
+        )
+        
+        return {
+            (spider_name, data_type, source, str(day)[:10]): count
+            for spider_name, data_type, source, day, count in query.all()
+        }
+    
+    @staticmethod
+    def _bump_crawled_data_stats(db: Session, stats_groups: Dict[Tuple[str, str, str, str], int], sign: int):
+        """
+        增减爬取数据统计表中的计数，不提交事务
+        
+        SQLite和PostgreSQL使用INSERT ... ON CONFLICT DO UPDATE原子地累加计数，
+        多个进程或线程同时写入同一分组时不会因唯一约束冲突而失败。
+        
+        Args:
+            db: 数据库会话
+            stats_groups: (spider_name, data_type, source, stat_date)到记录数量的映射，数量可以为负数
+            sign: 1为增加，-1为减少
+        """
+        rows = [
+            {
+                "spider_name": spider_name,
+                "data_type": data_type,
+                "source": source,
+                "stat_date": stat_date,
+                "record_count": sign * count
+            }
+            for (spider_name, data_type, source, stat_date), count in stats_groups.items()
+            if count
+        ]
+        if not rows:
+            return
+        
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            DBUtils._bump_crawled_data_stats_orm(db, rows)
+            return
+        
+        table = CrawledDataStats.__table__
+        statement = insert(table)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.spider_name, table.c.data_type, table.c.source, table.c.stat_date],
+                set_={"record_count": table.c.record_count + statement.excluded.record_count}
+            ),
+            rows
+        )
+        
+        # 计数减到0的分组删除
+        if any(row["record_count"] < 0 for row in rows):
+            db.execute(table.delete().where(table.c.record_count <= 0))
+    
+    @staticmethod
+    def _bump_crawled_data_stats_orm(db: Session, rows: List[Dict[str, Any]]):
+        """
+        不支持ON CONFLICT的数据库逐个分组查询后增减计数，不提交事务
+        
+        Args:
+            db: 数据库会话
+            rows: 分组和计数增量列表
+        """
+        for row in rows:
+            spider_name, data_type, source, stat_date = row["spider_name"], row["data_type"], row["source"], row["stat_date"]
+            count = row["record_count"]
+            stats = db.query(CrawledDataStats).filter(
+                CrawledDataStats.spider_name == spider_name,
+                CrawledDataStats.data_type == data_type,
+                CrawledDataStats.source == source,
+                CrawledDataStats.stat_date == stat_date
+            ).first()
+            
+            if stats is None:
+                if count < 0:
+                    continue
+                stats = CrawledDataStats(
+                    spider_name=spider_name,
+                    data_type=data_type,
+                    source=source,
+                    stat_date=stat_date,
+                    record_count=0
+                )
+                db.add(stats)
+            
+            stats.record_count += count
+            
+            if stats.record_count <= 0:
+                db.delete(stats)
+    
+    @staticmethod
+    def rebuild_crawled_data_stats(db: Session):
+        """
+        根据爬取数据表重建统计表，用于统计表首次创建或数据不一致时
+        
+        Args:
+            db: 数据库会话
+        
+        Returns:
+            group_count: 重建的统计分组数量
+        """
+        logger.info("开始重建爬取数据统计表")
+        
+        try:
+            db.query(CrawledDataStats).delete()
+            
+            stats_groups = DBUtils._group_crawled_data(db)
+            for (spider_name, data_type, source, stat_date), count in stats_groups.items():
+                db.add(CrawledDataStats(
+                    spider_name=spider_name,
+                    data_type=data_type,
+                    source=source,
+                    stat_date=stat_date,
+                    record_count=count
+                ))
+            
+            db.commit()
+            
+            logger.info(f"重建爬取数据统计表完成，共 {len(stats_groups)} 个分组")
+            
+            return len(stats_groups)
+        
+        except Exception as e:
+            logger.error(f"重建爬取数据统计表失败: {e}")
+            db.rollback()
+            raise e
+    
+    @staticmethod
+    def get_crawled_data_stats(db: Session) -> Dict[str, Any]:
+        """
+        获取爬取数据统计信息，直接读取增量维护的统计表
+        
+        Args:
+            db: 数据库会话
+        
+        Returns:
+            stats: 数据统计信息，包含总量以及按爬虫、数据类型、日期和来源的分布
+        """
+        spider_stats = {}
+        data_type_stats = {}
+        daily_stats = {}
+        source_stats = {}
+        total_records = 0
+        
+        for stats in db.query(CrawledDataStats).all():
+            count = stats.record_count
+            total_records += count
+            spider_stats[stats.spider_name] = spider_stats.get(stats.spider_name, 0) + count
+            data_type_stats[stats.data_type] = data_type_stats.get(stats.data_type, 0) + count
+            daily_stats[stats.stat_date] = daily_stats.get(stats.stat_date, 0) + count
+            source_stats[stats.source] = source_stats.get(stats.source, 0) + count
+        
+        return {
+            "total_records": total_records,
+            "spider_stats": spider_stats,
+            "data_type_stats": data_type_stats,
+            "daily_stats": dict(sorted(daily_stats.items())),
+            "source_stats": source_stats
+        }
\ No newline at end of file
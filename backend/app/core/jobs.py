@@ -0,0 +1,376 @@
+from loguru import logger
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Any, Callable
+import threading
+import uuid
+
+from app.core.config import settings
+
+# 任务类型
+JOB_TYPE_SPIDER = "spider"
+JOB_TYPE_ALL_SPIDERS = "all_spiders"
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_WARNING = "warning"
+JOB_FAILED = "failed"
+
+# 爬取流程返回的状态到任务状态的映射
+_RESULT_STATUS = {
+    "success": JOB_SUCCEEDED,
+    "warning": JOB_WARNING,
+    "error": JOB_FAILED
+}
+
+# Celery任务状态到任务状态的映射
+_CELERY_STATUS = {
+    "PENDING": JOB_QUEUED,
+    "RECEIVED": JOB_QUEUED,
+    "STARTED": JOB_RUNNING,
+    "PROGRESS": JOB_RUNNING,
+    "RETRY": JOB_RUNNING,
+    "FAILURE": JOB_FAILED,
+    "REVOKED": JOB_FAILED
+}
+
+# Celery后端在本地保留的提交信息字段
+_CELERY_JOB_FIELDS = ("id", "type", "spider_name", "backend", "created_at")
+
+class JobQueueFullError(Exception):
+    """
+    等待中的任务数达到上限
+    """
+
+def _celery_available() -> bool:
+    """
+    检查Redis是否可用且有Celery worker在线
+
+    Returns:
+        可以把任务交给Celery执行时返回True
+    """
+    try:
+        import redis
+
+        redis.Redis.from_url(settings.redis_url, socket_connect_timeout=1, socket_timeout=1).ping()
+
+        from app.core.celery import celery_app
+
+        return bool(celery_app.control.ping(timeout=1))
+    except Exception as e:
+        logger.info(f"Celery不可用，爬虫任务在后台线程中执行: {e}")
+        return False
+
+class JobManager:
+    """
+    爬虫后台任务管理器
+
+    API提交的爬虫任务立即返回任务ID，任务在有界线程池中执行，
+    或者在Celery可用时交给Celery worker执行。通过任务ID查询状态、进度、记录数和耗时。
+    """
+
+    def __init__(self, backend: str = "local", max_workers: int = 2, max_pending: int = 8, history_size: int = 100):
+        """
+        初始化任务管理器
+
+        Args:
+            backend: 执行后端，local为后台线程池，celery为Celery worker
+            max_workers: 后台线程池的线程数
+            max_pending: 等待和运行中的任务数上限，只对local后端生效，Celery后端的排队由broker负责
+            history_size: 保留的任务记录数
+        """
+        self.backend = backend
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.history_size = history_size
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 任务ID到任务信息的映射，按提交顺序排列
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # 后台线程池中尚未结束的任务ID到Future的映射，关闭时用于找出被取消的任务
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        logger.info(f"初始化爬虫任务管理器，执行后端: {self.backend}")
+
+    def submit(self, job_type: str, spider_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        提交爬虫任务
+
+        Args:
+            job_type: 任务类型，spider为运行单个爬虫，all_spiders为运行所有爬虫
+            spider_name: 爬虫名称，运行单个爬虫时必填
+
+        Returns:
+            任务信息
+
+        Raises:
+            JobQueueFullError: 等待和运行中的任务数达到上限
+        """
+        if self.backend == "local":
+            with self._lock:
+                active = sum(1 for job in self._jobs.values() if job["status"] in (JOB_QUEUED, JOB_RUNNING))
+                if active >= self.max_pending:
+                    raise JobQueueFullError(f"等待中的爬虫任务已达上限: {self.max_pending}")
+
+        job = {
+            "id": None,
+            "type": job_type,
+            "spider_name": spider_name,
+            "backend": self.backend,
+            "status": JOB_QUEUED,
+            "message": None,
+            "progress": None,
+            "records": 0,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "duration": None
+        }
+
+        if self.backend == "celery":
+            job["id"] = self._submit_celery(job_type, spider_name)
+            # 状态由Celery结果后端维护，本地只记录提交信息
+            with self._lock:
+                self._remember({key: job[key] for key in _CELERY_JOB_FIELDS})
+        else:
+            job["id"] = uuid.uuid4().hex
+            executor = self._get_executor()
+            with self._lock:
+                self._remember(job)
+                self._futures[job["id"]] = executor.submit(self._run, job["id"])
+
+        logger.info(f"提交爬虫任务: {job['id']}，类型: {job_type}，爬虫: {spider_name}")
+        return dict(job)
+
+    def _remember(self, job: Dict[str, Any]) -> None:
+        """
+        记录任务信息，需持有锁
+
+        超过保留数量时，Celery后端按提交顺序丢弃最早的记录，local后端丢弃最早结束的任务
+        """
+        self._jobs[job["id"]] = job
+        if self.backend == "celery":
+            while len(self._jobs) > self.history_size:
+                self._jobs.popitem(last=False)
+            return
+        while len(self._jobs) > self.history_size:
+            finished = next(
+                (job_id for job_id, item in self._jobs.items() if item["status"] not in (JOB_QUEUED, JOB_RUNNING)),
+                None
+            )
+            if finished is None:
+                break
+            del self._jobs[finished]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        获取后台线程池，首次提交任务时创建
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="spider-job")
+            return self._executor
+
+    def _job_func(self, job_type: str, spider_name: Optional[str]) -> Callable[..., Dict[str, Any]]:
+        """
+        获取任务类型对应的爬取流程
+        """
+        from app.tasks import crawl_spider, crawl_all_spiders
+
+        if job_type == JOB_TYPE_SPIDER:
+            return lambda on_progress: crawl_spider(spider_name, on_progress=on_progress)
+        return lambda on_progress: crawl_all_spiders(on_progress=on_progress)
+
+    def _run(self, job_id: str) -> None:
+        """
+        在后台线程中执行任务
+
+        Args:
+            job_id: 任务ID
+        """
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(status=JOB_RUNNING, started_at=datetime.now().isoformat())
+
+        def on_progress(progress: Dict[str, Any]) -> None:
+            with self._lock:
+                job.update(progress=progress, records=progress.get("records", 0))
+
+        try:
+            result = self._job_func(job["type"], job["spider_name"])(on_progress)
+            with self._lock:
+                job.update(self._from_result(result))
+        except Exception as e:
+            logger.error(f"爬虫任务 {job_id} 执行异常: {e}")
+            with self._lock:
+                job.update(status=JOB_FAILED, message=str(e), finished_at=datetime.now().isoformat())
+
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+        logger.info(f"爬虫任务 {job_id} 结束，状态: {job['status']}")
+
+    def _from_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        把爬取流程的返回结果转换为任务信息字段
+        """
+        return {
+            "status": _RESULT_STATUS.get(result.get("status"), JOB_FAILED),
+            "message": result.get("message"),
+            "progress": result.get("progress"),
+            "records": result.get("records", 0),
+            "started_at": result.get("started_at"),
+            "finished_at": result.get("finished_at"),
+            "duration": result.get("duration")
+        }
+
+    def _submit_celery(self, job_type: str, spider_name: Optional[str]) -> str:
+        """
+        把任务交给Celery worker执行
+
+        Returns:
+            Celery任务ID，同时作为任务ID
+        """
+        from app.tasks import run_spider, run_all_spiders
+
+        # 全局配置忽略任务结果，这里需要保存结果供查询
+        if job_type == JOB_TYPE_SPIDER:
+            async_result = run_spider.apply_async(args=[spider_name], ignore_result=False)
+        else:
+            async_result = run_all_spiders.apply_async(ignore_result=False)
+        return async_result.id
+
+    def _celery_state(self, job_id: str, job: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        从Celery结果后端查询任务状态
+
+        Args:
+            job_id: 任务ID
+            job: 本进程记录的任务信息，其他进程提交的任务为None
+
+        Returns:
+            任务信息，任务不存在时返回None
+        """
+        from celery.result import AsyncResult
+        from app.core.celery import celery_app
+
+        async_result = AsyncResult(job_id, app=celery_app)
+        state = async_result.state
+
+        # Celery无法区分未知任务和等待中的任务，只认本进程提交过的任务
+        if state == "PENDING" and job is None:
+            return None
+
+        submitted = job or {}
+        job = {
+            "id": job_id,
+            "type": None,
+            "spider_name": None,
+            "backend": "celery",
+            "status": JOB_QUEUED,
+            "message": None,
+            "progress": None,
+            "records": 0,
+            "created_at": None,
+            "started_at": None,
+            "finished_at": None,
+            "duration": None
+        }
+        job.update(submitted)
+
+        info = async_result.info
+        if state == "SUCCESS" and isinstance(info, dict):
+            job.update(self._from_result(info))
+            job["spider_name"] = job["spider_name"] or info.get("spider_name")
+        elif state == "PROGRESS" and isinstance(info, dict):
+            job.update(status=JOB_RUNNING, progress=info, records=info.get("records", 0))
+        else:
+            job["status"] = _CELERY_STATUS.get(state, JOB_RUNNING)
+            if state == "FAILURE":
+                job["message"] = str(info)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询任务信息
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            任务信息，包含状态、进度、记录数和耗时，任务不存在时返回None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            job = dict(job) if job is not None else None
+
+        if self.backend == "celery":
+            return self._celery_state(job_id, job)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭后台线程池
+
+        Args:
+            wait: 是否等待正在运行的任务结束
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+        # 尚未开始的任务被取消，标记为失败，避免一直显示为等待中
+        finished_at = datetime.now().isoformat()
+        with self._lock:
+            cancelled = [job_id for job_id, future in self._futures.items() if future.cancelled()]
+            for job_id in cancelled:
+                self._futures.pop(job_id)
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job.update(status=JOB_FAILED, message="任务管理器已关闭，任务未执行", finished_at=finished_at)
+        if cancelled:
+            logger.warning(f"关闭爬虫任务线程池，取消 {len(cancelled)} 个未开始的任务")
+        logger.info("关闭爬虫任务线程池")
+
+# 单例模式
+_job_manager_instance = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    """
+    获取爬虫任务管理器实例，job_backend为auto时在Celery可用时使用Celery
+
+    Returns:
+        爬虫任务管理器实例
+    """
+    global _job_manager_instance
+    if _job_manager_instance is None:
+        with _job_manager_lock:
+            if _job_manager_instance is None:
+                backend = settings.job_backend
+                if backend == "auto":
+                    backend = "celery" if _celery_available() else "local"
+                _job_manager_instance = JobManager(
+                    backend=backend,
+                    max_workers=settings.job_max_workers,
+                    max_pending=settings.job_max_pending,
+                    history_size=settings.job_history_size
+                )
+    return _job_manager_instance
+
+def shutdown_job_manager(wait: bool = False) -> None:
+    """
+    关闭爬虫任务管理器
+
+    Args:
+        wait: 是否等待正在运行的任务结束
+    """
+    if _job_manager_instance is not None:
+        _job_manager_instance.shutdown(wait=wait)
@@ -0,0 +1,196 @@
+from loguru import logger
+import sys
+import os
+from typing import Dict, Any, Optional, IO, List
+
+from app.core.config import settings
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from wumeng_crawler.spiders.spider_scheduler import SpiderScheduler, create_spider_scheduler, schedule_key_to_spider_name
+from wumeng_crawler.config.config import SCHEDULER_CONFIG
+
+# 进程内调度器实例
+_scheduler_instance: Optional[SpiderScheduler] = None
+# 进程内调度器持有的文件锁
+_scheduler_lock_file: Optional[IO] = None
+
+# Celery定时任务使用的Redis锁名称前缀
+RUN_LOCK_PREFIX = "wumengbot:scheduled_run"
+
+class SchedulerBusyError(Exception):
+    """
+    同时运行的定时任务数达到上限
+    """
+
+def _acquire_file_lock(path: str) -> Optional[IO]:
+    """
+    以非阻塞方式获取文件排他锁
+    
+    Args:
+        path: 锁文件路径
+    
+    Returns:
+        取得锁时返回打开的锁文件，锁已被其他进程持有时返回None
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    lock_file = open(path, "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+def _release_file_lock(lock_file: IO) -> None:
+    """
+    释放文件锁，关闭文件即释放锁
+    
+    Args:
+        lock_file: _acquire_file_lock返回的锁文件
+    """
+    if os.name == "nt":
+        import msvcrt
+        
+        try:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+    lock_file.close()
+
+def _run_scheduled_spider(spider_name: str) -> None:
+    """
+    定时运行爬虫，与Celery任务使用相同的爬取和数据处理流程
+    
+    Args:
+        spider_name: 爬虫名称
+    """
+    from app.tasks import crawl_spider
+    
+    result = crawl_spider(spider_name)
+    if result.get("status") == "error":
+        raise RuntimeError(result.get("message"))
+
+def start_scheduler() -> None:
+    """
+    按调度后端配置启动进程内调度器
+    """
+    global _scheduler_instance, _scheduler_lock_file
+    
+    if settings.scheduler_backend != "local":
+        logger.info(f"调度后端为 {settings.scheduler_backend}，不启动进程内调度器")
+        return
+    
+    if _scheduler_instance is not None:
+        return
+    
+    # 多个uvicorn worker各自执行启动事件，只有取得文件锁的进程运行调度器，避免同一任务运行多次
+    lock_file = _acquire_file_lock(SCHEDULER_CONFIG["LOCK_PATH"])
+    if lock_file is None:
+        logger.info(f"其他进程已运行进程内调度器，当前进程 {os.getpid()} 不启动调度器")
+        return
+    
+    _scheduler_lock_file = lock_file
+    _scheduler_instance = create_spider_scheduler(_run_scheduled_spider, settings.spider_schedule)
+    _scheduler_instance.start()
+
+def stop_scheduler() -> None:
+    """
+    停止进程内调度器
+    """
+    global _scheduler_instance, _scheduler_lock_file
+    
+    if _scheduler_instance is not None:
+        _scheduler_instance.shutdown(wait=False)
+        _scheduler_instance = None
+    
+    if _scheduler_lock_file is not None:
+        _release_file_lock(_scheduler_lock_file)
+        _scheduler_lock_file = None
+
+def _redis_client():
+    """
+    创建Redis客户端
+    
+    Returns:
+        Redis客户端
+    """
+    import redis
+    
+    return redis.Redis.from_url(settings.redis_url)
+
+def acquire_scheduled_run(spider_name: str, client=None) -> Optional[List[Any]]:
+    """
+    Celery定时运行爬虫前获取Redis锁，与进程内调度器一样同一个爬虫不重叠运行，
+    同时运行的定时任务数不超过CONCURRENT_TASKS
+    
+    Args:
+        spider_name: 爬虫名称
+        client: Redis客户端，默认按redis_url创建
+    
+    Returns:
+        取得的锁列表，爬虫上一次运行未结束时返回None
+    
+    Raises:
+        SchedulerBusyError: 同时运行的定时任务数达到上限
+    """
+    client = client if client is not None else _redis_client()
+    timeout = SCHEDULER_CONFIG.get("RUN_LOCK_TIMEOUT", 3600)
+    
+    spider_lock = client.lock(f"{RUN_LOCK_PREFIX}:spider:{spider_name}", timeout=timeout, blocking=False)
+    if not spider_lock.acquire():
+        return None
+    
+    for slot in range(max(1, SCHEDULER_CONFIG.get("CONCURRENT_TASKS", 4))):
+        slot_lock = client.lock(f"{RUN_LOCK_PREFIX}:slot:{slot}", timeout=timeout, blocking=False)
+        if slot_lock.acquire():
+            return [spider_lock, slot_lock]
+    
+    spider_lock.release()
+    raise SchedulerBusyError(f"同时运行的定时任务数已达到上限 {SCHEDULER_CONFIG.get('CONCURRENT_TASKS', 4)}")
+
+def release_scheduled_run(locks: List[Any]) -> None:
+    """
+    释放acquire_scheduled_run取得的锁，锁已过期时忽略
+    
+    Args:
+        locks: 锁列表
+    """
+    for lock in locks:
+        try:
+            lock.release()
+        except Exception as e:
+            logger.warning(f"释放定时任务锁失败: {e}")
+
+def get_scheduler_status() -> Dict[str, Dict[str, Any]]:
+    """
+    获取所有爬虫的调度状态
+    
+    Returns:
+        爬虫名称到调度状态的映射，进程内调度器未运行时只包含cron配置
+    """
+    if _scheduler_instance is not None:
+        return _scheduler_instance.get_status()
+    
+    return {
+        schedule_key_to_spider_name(key): {
+            "cron": entry.get("cron"),
+            "enabled": entry.get("enabled", True),
+            "next_run_time": None,
+            "running": False,
+            "last_start_time": None,
+            "last_duration": None,
+            "last_status": None
+        }
+        for key, entry in settings.spider_schedule.items()
+    }
@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+from loguru import logger
+from typing import Iterable, Iterator, Set
+import threading
+
+from app.core.config import settings
+
+# 爬虫停止标记的Redis键名前缀，API进程写入，Celery worker读取
+STOP_FLAG_PREFIX = "wumengbot:spider_stopped"
+# Celery worker检查停止标记的间隔（秒）
+STOP_POLL_INTERVAL = 1.0
+
+def _stop_key(spider_name: str) -> str:
+    """
+    获取爬虫停止标记的Redis键名
+
+    Args:
+        spider_name: 爬虫名称
+
+    Returns:
+        Redis键名
+    """
+    return f"{STOP_FLAG_PREFIX}:{spider_name}"
+
+def uses_shared_stop() -> bool:
+    """
+    检查爬虫是否可能在Celery worker中运行，此时停止和启动爬虫需要同时写入Redis停止标记
+
+    Returns:
+        爬虫任务或定时任务交给Celery执行时返回True
+    """
+    from app.core.jobs import get_job_manager
+
+    return settings.scheduler_backend == "celery" or get_job_manager().backend == "celery"
+
+def set_spiders_stopped(spider_names: Iterable[str], stopped: bool, client=None) -> None:
+    """
+    写入或清除爬虫停止标记，标记一直保留到爬虫重新启动
+
+    Args:
+        spider_names: 爬虫名称
+        stopped: True为写入停止标记，False为清除
+        client: Redis客户端，默认按redis_url创建
+    """
+    keys = [_stop_key(name) for name in spider_names]
+    if not keys:
+        return
+
+    if client is None:
+        from app.core.scheduler import _redis_client
+
+        client = _redis_client()
+
+    if stopped:
+        client.mset({key: 1 for key in keys})
+    else:
+        client.delete(*keys)
+
+def get_stopped_spiders(spider_names: Iterable[str], client=None) -> Set[str]:
+    """
+    获取带有停止标记的爬虫
+
+    Args:
+        spider_names: 要检查的爬虫名称
+        client: Redis客户端，默认按redis_url创建
+
+    Returns:
+        带有停止标记的爬虫名称
+    """
+    names = list(spider_names)
+    if not names:
+        return set()
+
+    if client is None:
+        from app.core.scheduler import _redis_client
+
+        client = _redis_client()
+
+    values = client.mget([_stop_key(name) for name in names])
+    return {name for name, value in zip(names, values) if value is not None}
+
+def sync_stopped_spiders(spider_manager, client=None, restart: bool = True) -> None:
+    """
+    按停止标记同步当前进程中爬虫的状态，带标记的爬虫停止并取消正在进行的运行
+
+    Args:
+        spider_manager: 爬虫管理器
+        client: Redis客户端，默认按redis_url创建
+        restart: 是否启动已清除标记但仍处于停止状态的爬虫
+    """
+    spiders = list(spider_manager)
+    stopped = get_stopped_spiders([spider.name for spider in spiders], client)
+    for spider in spiders:
+        if spider.name in stopped:
+            if not spider.stopped:
+                spider.stop()
+        elif restart and spider.stopped and not spider.running:
+            spider.start()
+
+@contextmanager
+def watch_stop_flags(spider_manager, client=None, interval: float = STOP_POLL_INTERVAL) -> Iterator[None]:
+    """
+    Celery任务运行期间在后台线程中定期检查停止标记，API停止爬虫时取消worker中正在进行的运行
+
+    进入时先同步一次爬虫状态，已停止的爬虫不再运行，标记已清除的爬虫重新启动。
+    Redis不可用时只记录日志，不影响爬虫运行
+
+    Args:
+        spider_manager: 爬虫管理器
+        client: Redis客户端，默认按redis_url创建
+        interval: 检查间隔（秒）
+    """
+    if client is None:
+        from app.core.scheduler import _redis_client
+
+        client = _redis_client()
+
+    try:
+        sync_stopped_spiders(spider_manager, client)
+    except Exception as e:
+        logger.warning(f"读取爬虫停止标记失败: {e}")
+
+    done = threading.Event()
+
+    def watch() -> None:
+        while not done.wait(interval):
+            try:
+                # 运行期间只处理停止，重新启动留到下一个任务开始时
+                sync_stopped_spiders(spider_manager, client, restart=False)
+            except Exception as e:
+                logger.warning(f"读取爬虫停止标记失败: {e}")
+
+    watcher = threading.Thread(target=watch, name="spider-stop-watcher", daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        done.set()
+        watcher.join()
@@ -4,6 +4,8 @@ from app.core.config import settings
 from app.api import router as api_router
 from app.core.maimai_client import maimai_client
 from app.core.database import init_db
+from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.jobs import shutdown_job_manager
 from loguru import logger
 import sys
 import os
@@ -41,6 +43,18 @@ logger.info(f"爬虫管理器初始化完成，共初始化 {len(spider_manager)
 # 包含API路由
 app.include_router(api_router, prefix="/api")
 
+# 启动和停止爬虫定时调度器
+@app.on_event("startup")
+def on_startup():
+    start_scheduler()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_scheduler()
+    # 不再接受新的爬虫任务，正在运行的爬虫在超时前完成后关闭连接池
+    shutdown_job_manager()
+    spider_manager.shutdown()
+
 # 根路径
 @app.get("/")
 def root():
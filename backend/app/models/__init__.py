@@ -1,4 +1,5 @@
 from app.models.user_segamaid import UserSegamaid
 from app.models.crawled_data import CrawledData
+from app.models.crawled_data_stats import CrawledDataStats
 
-__all__ = ["UserSegamaid", "CrawledData"]
\ No newline at end of file
+__all__ = ["UserSegamaid", "CrawledData", "CrawledDataStats"]
\ No newline at end of file
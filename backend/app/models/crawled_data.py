@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Index
 from app.core.database import Base
 from datetime import datetime
 
 class CrawledData(Base):
     __tablename__ = "crawled_data"
+    __table_args__ = (
+        Index("ix_crawled_data_spider_type_time", "spider_name", "data_type", "crawl_time"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     spider_name = Column(String(50), index=True, nullable=False, comment="爬虫名称")
@@ -14,6 +17,7 @@ class CrawledData(Base):
     update_time = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, comment="更新时间")
     is_valid = Column(Boolean, default=True, nullable=False, comment="数据是否有效")
     source = Column(String(100), nullable=False, comment="数据来源，如wq/ai/wi/at")
+    content_hash = Column(String(64), index=True, nullable=True, comment="数据内容指纹，内容未变化的记录不重复保存")
     
     def __repr__(self):
         return f"<CrawledData(spider_name='{self.spider_name}', data_type='{self.data_type}', data_id='{self.data_id}', crawl_time='{self.crawl_time}')>"
\ No newline at end of file
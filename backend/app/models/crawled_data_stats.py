@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from app.core.database import Base
+
+class CrawledDataStats(Base):
+    __tablename__ = "crawled_data_stats"
+    __table_args__ = (
+        UniqueConstraint("spider_name", "data_type", "source", "stat_date", name="uq_crawled_data_stats_group"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    spider_name = Column(String(50), nullable=False, comment="爬虫名称")
+    data_type = Column(String(50), nullable=False, comment="数据类型: player/score/song/plate")
+    source = Column(String(100), nullable=False, comment="数据来源，如wq/ai/wi/at")
+    stat_date = Column(String(10), nullable=False, comment="统计日期，格式为YYYY-MM-DD，按爬取时间计算")
+    record_count = Column(Integer, default=0, nullable=False, comment="记录数量")
+    
+    def __repr__(self):
+        return f"<CrawledDataStats(spider_name='{self.spider_name}', data_type='{self.data_type}', source='{self.source}', stat_date='{self.stat_date}', record_count={self.record_count})>"
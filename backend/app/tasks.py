@@ -1,7 +1,12 @@
 from app.core.celery import celery_app
 from loguru import logger
+from typing import Dict, List, Optional, Any, Callable, ContextManager, Iterable
+from contextlib import nullcontext
+from datetime import datetime
 import sys
 import os
+import random
+import time
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,131 +14,271 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # 导入爬虫管理器
 from wumeng_crawler.spiders.spider_manager import get_spider_manager
 from wumeng_crawler.processors.data_processor import get_data_processor
+from wumeng_crawler.config.config import PROCESSOR_CONFIG, SCHEDULER_CONFIG
+from app.core.spider_control import watch_stop_flags
 
-@celery_app.task(name="app.tasks.run_spider")
-def run_spider(spider_name: str):
+def _record_count(data: Any) -> int:
     """
-    运行指定名称的爬虫任务
+    统计单个爬虫结果中的记录数，运行失败时记为0
+    
+    Args:
+        data: 爬虫返回的记录列表
+    
+    Returns:
+        记录数
+    """
+    return len(data) if isinstance(data, (list, tuple)) else 0
+
+def _task_progress(task) -> Optional[Callable[[Dict[str, Any]], None]]:
+    """
+    生成把进度写入Celery结果后端的回调，直接调用任务函数时返回None
+    
+    Args:
+        task: 绑定的Celery任务
+    
+    Returns:
+        进度回调
+    """
+    if task.request.called_directly or not task.request.id:
+        return None
+    
+    def report(progress: Dict[str, Any]) -> None:
+        task.update_state(state="PROGRESS", meta=progress)
+    
+    return report
+
+def _stop_watcher(task) -> ContextManager[None]:
+    """
+    在Celery worker中运行任务时检查API写入的停止标记，直接调用任务函数时不检查
+    
+    Args:
+        task: 绑定的Celery任务
+    
+    Returns:
+        包住爬取流程的上下文管理器
+    """
+    if task.request.called_directly or not task.request.id:
+        return nullcontext()
+    return watch_stop_flags(get_spider_manager())
+
+class _ProgressTracker:
+    """
+    记录爬取和数据处理的进度，每次更新后通过回调上报进度快照
+    """
+    
+    def __init__(self, spider_names: List[str], on_progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        初始化进度记录
+        
+        Args:
+            spider_names: 本次运行的爬虫名称
+            on_progress: 进度回调，参数为进度快照
+        """
+        self.on_progress = on_progress
+        self.stage = "crawling"
+        self.spiders: Dict[str, Dict[str, Any]] = {
+            name: {"status": "running", "records": 0, "duration": None}
+            for name in spider_names
+        }
+        self.report()
+    
+    def spider_done(self, spider_name: str, result: Any, duration: float) -> None:
+        """
+        记录单个爬虫运行结束
+        
+        Args:
+            spider_name: 爬虫名称
+            result: 爬虫运行结果，运行异常时为异常对象
+            duration: 运行耗时（秒）
+        """
+        if isinstance(result, BaseException):
+            status, records = "error", 0
+        elif result is not None:
+            status, records = "success", _record_count(result)
+        else:
+            status, records = "warning", 0
+        self.spiders[spider_name] = {"status": status, "records": records, "duration": round(duration, 3)}
+        self.report()
+    
+    def set_stage(self, stage: str) -> None:
+        """
+        切换运行阶段
+        
+        Args:
+            stage: 阶段名称，crawling、processing或done
+        """
+        self.stage = stage
+        self.report()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取进度快照
+        
+        Returns:
+            进度信息，包含阶段、已完成和总爬虫数、每个爬虫的状态
+        """
+        return {
+            "stage": self.stage,
+            "total": len(self.spiders),
+            "completed": sum(1 for spider in self.spiders.values() if spider["status"] != "running"),
+            "records": sum(spider["records"] for spider in self.spiders.values()),
+            "spiders": {name: dict(spider) for name, spider in self.spiders.items()}
+        }
+    
+    def report(self) -> None:
+        """
+        通过回调上报进度快照
+        """
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(self.snapshot())
+        except Exception as e:
+            logger.error(f"上报爬虫任务进度失败: {e}")
+
+def _process_records(batches: Iterable[List[Dict[str, Any]]]) -> int:
+    """
+    把爬虫返回的记录逐批交给数据处理器，保存到数据库，开启了处理结果文件时同时保存到文件
+    
+    Args:
+        batches: 记录批次的迭代器，每个爬虫的记录为一批
+    
+    Returns:
+        交给数据处理器的记录数
+    """
+    data_processor = get_data_processor()
+    stats = data_processor.process_batches(
+        batches,
+        save=PROCESSOR_CONFIG.get("SAVE_PROCESSED_FILES", True),
+        save_to_db=True
+    )
+    return stats["records"]
+
+def crawl_spider(spider_name: str, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    运行指定名称的爬虫并处理数据，Celery任务和API后台任务共用此流程
     
     Args:
         spider_name: 爬虫名称
+        on_progress: 进度回调，参数为进度快照
     
     Returns:
-        任务执行结果
+        任务执行结果，包含状态、记录数和耗时
     """
+    started_at = datetime.now()
+    started = time.monotonic()
+    tracker = _ProgressTracker([spider_name], on_progress)
+    
+    def finish(status: str, message: str, records: int = 0) -> Dict[str, Any]:
+        tracker.set_stage("done")
+        return {
+            "status": status,
+            "spider_name": spider_name,
+            "message": message,
+            "records": records,
+            "progress": tracker.snapshot(),
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "duration": round(time.monotonic() - started, 3)
+        }
+    
     logger.info(f"开始执行爬虫任务: {spider_name}")
     
     try:
         # 初始化爬虫管理器
         spider_manager = get_spider_manager()
         
-        # 初始化数据处理器
-        data_processor = get_data_processor()
-        
         # 运行指定名称的爬虫
         logger.info(f"开始运行爬虫: {spider_name}")
         spider_result = spider_manager.run_spider(spider_name)
+        failed = "error" in spider_result
+        tracker.spider_done(spider_name, None if failed else spider_result["data"], time.monotonic() - started)
         
-        if spider_result:
+        if not failed:
             logger.info(f"爬虫 {spider_name} 运行成功")
             
             # 处理数据，同时保存到数据库
             logger.info(f"开始处理爬虫 {spider_name} 爬取到的数据")
+            tracker.set_stage("processing")
+            try:
+                records = _process_records([spider_result["data"]])
+            except Exception:
+                # 记录未保存，下次运行重新抓取这些页面
+                spider_manager.discard_runs([spider_result])
+                raise
+            spider_manager.commit_runs([spider_result])
             
-            # 使用完整的处理流程，包括保存到数据库
-            formatted_data = data_processor.process(
-                spider_result, 
-                format_type="json", 
-                save=True, 
-                save_to_db=True
+            logger.info(f"爬虫 {spider_name} 数据处理完成，共 {records} 条记录")
+            return finish(
+                "success",
+                f"爬虫 {spider_name} 运行成功，共 {records} 条记录",
+                records
             )
-            
-            logger.info(f"爬虫 {spider_name} 数据处理完成，已保存到文件和数据库")
-            
-            return {
-                "status": "success",
-                "spider_name": spider_name,
-                "message": f"爬虫 {spider_name} 运行成功，数据已保存到文件和数据库"
-            }
         else:
             logger.warning(f"爬虫 {spider_name} 运行失败或未爬取到任何数据")
-            return {
-                "status": "warning",
-                "spider_name": spider_name,
-                "message": f"爬虫 {spider_name} 运行失败或未爬取到任何数据"
-            }
+            return finish("warning", spider_result.get("error") or f"爬虫 {spider_name} 运行失败或未爬取到任何数据")
     
     except Exception as e:
         logger.error(f"爬虫 {spider_name} 运行异常: {e}")
         import traceback
         traceback.print_exc()
-        return {
-            "status": "error",
-            "spider_name": spider_name,
-            "message": f"爬虫 {spider_name} 运行异常: {str(e)}"
-        }
+        return finish("error", f"爬虫 {spider_name} 运行异常: {str(e)}")
 
-@celery_app.task(name="app.tasks.run_all_spiders")
-def run_all_spiders():
+def crawl_all_spiders(on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
     """
-    运行所有爬虫任务
+    运行所有爬虫并处理数据，Celery任务和API后台任务共用此流程
+    
+    Args:
+        on_progress: 进度回调，参数为进度快照
     
     Returns:
-        任务执行结果
+        任务执行结果，包含状态、记录数和耗时
     """
+    started_at = datetime.now()
+    started = time.monotonic()
+    tracker = None
+    
+    def finish(status: str, message: str, records: int = 0) -> Dict[str, Any]:
+        if tracker is not None:
+            tracker.set_stage("done")
+        return {
+            "status": status,
+            "message": message,
+            "records": records,
+            "progress": tracker.snapshot() if tracker is not None else None,
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "duration": round(time.monotonic() - started, 3)
+        }
+    
     logger.info("开始执行所有爬虫任务")
     
     try:
         # 初始化爬虫管理器
         spider_manager = get_spider_manager()
+        tracker = _ProgressTracker([spider.name for spider in spider_manager], on_progress)
         
-        # 初始化数据处理器
-        data_processor = get_data_processor()
-        
-        # 运行所有爬虫
+        # 运行所有爬虫，每个爬虫结束后立即处理其数据并保存到数据库，不等待其他爬虫
         logger.info("开始运行所有爬虫")
-        all_data = spider_manager.run_all_spiders()
+        records = _process_records(spider_manager.stream_all_records(on_spider_done=tracker.spider_done))
         
-        if all_data:
-            logger.info("所有爬虫运行成功")
-            
-            # 处理数据，同时保存到数据库
-            logger.info("开始处理爬取到的数据")
-            
-            # 使用完整的处理流程，包括保存到数据库
-            formatted_data = data_processor.process(
-                all_data, 
-                format_type="json", 
-                save=True, 
-                save_to_db=True
-            )
-            
-            logger.info("所有爬虫数据处理完成，已保存到文件和数据库")
-            
-            return {
-                "status": "success",
-                "message": "所有爬虫运行成功，数据已保存到文件和数据库"
-            }
+        if any(spider["status"] == "success" for spider in tracker.spiders.values()):
+            logger.info(f"所有爬虫数据处理完成，共 {records} 条记录")
+            return finish("success", f"所有爬虫运行成功，共 {records} 条记录", records)
         else:
             logger.warning("所有爬虫运行失败或未爬取到任何数据")
-            return {
-                "status": "warning",
-                "message": "所有爬虫运行失败或未爬取到任何数据"
-            }
+            return finish("warning", "所有爬虫运行失败或未爬取到任何数据")
     
     except Exception as e:
         logger.error(f"运行所有爬虫异常: {e}")
         import traceback
         traceback.print_exc()
-        return {
-            "status": "error",
-            "message": f"运行所有爬虫异常: {str(e)}"
-        }
+        return finish("error", f"运行所有爬虫异常: {str(e)}")
 
-@celery_app.task(name="app.tasks.stop_spider")
-def stop_spider(spider_name: str):
+@celery_app.task(bind=True, name="app.tasks.run_spider")
+def run_spider(self, spider_name: str):
     """
-    停止指定名称的爬虫任务
+    运行指定名称的爬虫任务
     
     Args:
         spider_name: 爬虫名称
@@ -141,60 +286,64 @@ def stop_spider(spider_name: str):
     Returns:
         任务执行结果
     """
-    logger.info(f"开始执行停止爬虫任务: {spider_name}")
-    
-    try:
-        # 初始化爬虫管理器
-        spider_manager = get_spider_manager()
-        
-        # 关闭所有爬虫（目前spider_manager只支持关闭所有爬虫）
-        spider_manager.close_all_spiders()
-        
-        logger.info(f"爬虫 {spider_name} 已停止")
-        return {
-            "status": "success",
-            "spider_name": spider_name,
-            "message": f"爬虫 {spider_name} 已停止"
-        }
+    with _stop_watcher(self):
+        return crawl_spider(spider_name, on_progress=_task_progress(self))
+
+@celery_app.task(name="app.tasks.schedule_spider")
+def schedule_spider(spider_name: str):
+    """
+    Celery beat触发的定时任务，随机推迟0到SCHEDULE_JITTER秒后运行爬虫，
+    避免多个爬虫在整点同时发起请求
     
-    except Exception as e:
-        logger.error(f"停止爬虫 {spider_name} 异常: {e}")
-        import traceback
-        traceback.print_exc()
-        return {
-            "status": "error",
-            "spider_name": spider_name,
-            "message": f"停止爬虫 {spider_name} 异常: {str(e)}"
-        }
+    Args:
+        spider_name: 爬虫名称
+    """
+    countdown = random.uniform(0, SCHEDULER_CONFIG.get("SCHEDULE_JITTER", 30))
+    run_scheduled_spider.apply_async(args=(spider_name,), countdown=countdown)
+    logger.info(f"定时运行爬虫 {spider_name}，推迟 {countdown:.1f} 秒")
 
-@celery_app.task(name="app.tasks.stop_all_spiders")
-def stop_all_spiders():
+@celery_app.task(bind=True, name="app.tasks.run_scheduled_spider", max_retries=10)
+def run_scheduled_spider(self, spider_name: str):
     """
-    停止所有爬虫任务
+    加锁运行定时爬虫任务，同一个爬虫上一次运行未结束时跳过本次运行，
+    同时运行的定时任务数达到上限时稍后重试
+    
+    Args:
+        spider_name: 爬虫名称
     
     Returns:
         任务执行结果
     """
-    logger.info("开始执行停止所有爬虫任务")
+    from app.core.scheduler import SchedulerBusyError, acquire_scheduled_run, release_scheduled_run
     
     try:
-        # 初始化爬虫管理器
-        spider_manager = get_spider_manager()
-        
-        # 关闭所有爬虫
-        spider_manager.close_all_spiders()
-        
-        logger.info("所有爬虫已停止")
+        locks = acquire_scheduled_run(spider_name)
+    except SchedulerBusyError as e:
+        logger.info(f"定时运行爬虫 {spider_name} 等待空闲: {e}")
+        raise self.retry(countdown=max(1, SCHEDULER_CONFIG.get("SCHEDULE_JITTER", 30)))
+    
+    if locks is None:
+        logger.info(f"爬虫 {spider_name} 上一次运行未结束，跳过本次定时运行")
         return {
-            "status": "success",
-            "message": "所有爬虫已停止"
+            "status": "skipped",
+            "message": f"爬虫 {spider_name} 正在运行",
+            "spider_name": spider_name,
+            "records": 0
         }
     
-    except Exception as e:
-        logger.error(f"停止所有爬虫异常: {e}")
-        import traceback
-        traceback.print_exc()
-        return {
-            "status": "error",
-            "message": f"停止所有爬虫异常: {str(e)}"
-        }
\ No newline at end of file
+    try:
+        with _stop_watcher(self):
+            return crawl_spider(spider_name, on_progress=_task_progress(self))
+    finally:
+        release_scheduled_run(locks)
+
+@celery_app.task(bind=True, name="app.tasks.run_all_spiders")
+def run_all_spiders(self):
+    """
+    运行所有爬虫任务
+    
+    Returns:
+        任务执行结果
+    """
+    with _stop_watcher(self):
+        return crawl_all_spiders(on_progress=_task_progress(self))
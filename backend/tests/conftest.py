@@ -0,0 +1,83 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# 测试使用独立的数据库、HTTP校验信息缓存、爬取队列和搜索索引，必须在导入项目模块之前设置
+_TEST_DIR = tempfile.mkdtemp(prefix="wumengbot-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}"
+os.environ["DEBUG"] = "false"
+os.environ["HTTP_CACHE_PATH"] = os.path.join(_TEST_DIR, "http_cache.db")
+os.environ["FRONTIER_PATH"] = os.path.join(_TEST_DIR, "frontier.db")
+os.environ["INDEX_DIR"] = os.path.join(_TEST_DIR, "index")
+os.environ["SCHEDULER_LOCK_PATH"] = os.path.join(_TEST_DIR, "scheduler.lock")
+os.environ["PROCESS_POOL_WORKERS"] = "0"
+os.environ["RETRY_DELAY"] = "0"
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    """
+    初始化测试数据库，每个测试开始前清空爬取数据表和统计表
+
+    Yields:
+        数据库会话
+    """
+    from app.core.database import SessionLocal, init_db
+    from app.models.crawled_data import CrawledData
+    from app.models.crawled_data_stats import CrawledDataStats
+
+    init_db()
+    session = SessionLocal()
+    session.query(CrawledData).delete()
+    session.query(CrawledDataStats).delete()
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_spider():
+    """
+    创建不访问网络的通用爬虫，请求由handler根据httpx.Request生成响应
+
+    Returns:
+        创建函数，参数为网站名称、handler和crawl配置
+    """
+    import httpx
+    from wumeng_crawler.spiders.generic_spider import GenericSpider
+
+    def create(name, handler, crawl=None, **site_config):
+        domain = f"{name}.test"
+        spider = GenericSpider({
+            "name": name,
+            "domain": domain,
+            "ip": None,
+            "crawl": crawl or {"fields": ["title"]},
+            "rate_limit": {"rate": 1000, "burst": 1000},
+            "save_files": False,
+            **site_config
+        })
+
+        async def request(method, url, headers=None, timeout=None, **kwargs):
+            request = httpx.Request(method, httpx.URL(url, params=kwargs.get("params")), headers=headers)
+            response = handler(request)
+            response.request = request
+            return response
+
+        # 只替换该爬虫的请求方法，共享HTTP引擎的事件循环照常使用
+        spider.engine = type("FakeEngine", (), {"request": staticmethod(request), "run": spider.engine.run})()
+        return spider
+
+    return create
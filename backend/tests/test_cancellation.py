@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import threading
+
+import httpx
+import pytest
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+from wumeng_crawler.network.cancellation import CancelToken, CrawlCancelled
+
+_names = itertools.count()
+
+
+def test_cancel_interrupts_pending_coroutine():
+    async def scenario():
+        token = CancelToken()
+        task = asyncio.ensure_future(token.run(asyncio.sleep(30)))
+        await asyncio.sleep(0)
+        token.cancel("stop")
+        with pytest.raises(CrawlCancelled):
+            await task
+
+        # 已取消的令牌不再运行新的协程
+        with pytest.raises(CrawlCancelled):
+            await token.run(asyncio.sleep(0))
+        with pytest.raises(CrawlCancelled):
+            token.raise_if_cancelled()
+        assert token.reason == "stop"
+
+    asyncio.run(scenario())
+
+
+def test_outer_cancellation_is_not_converted():
+    async def scenario():
+        token = CancelToken()
+        task = asyncio.ensure_future(token.run(asyncio.sleep(30)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not token.cancelled
+
+    asyncio.run(scenario())
+
+
+def test_outer_cancellation_cancels_inner_coroutine():
+    async def scenario():
+        cancelled = []
+
+        async def inner():
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        task = asyncio.ensure_future(CancelToken().run(inner()))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        assert cancelled == [True]
+
+    asyncio.run(scenario())
+
+
+class _TaskWithoutCancelling(asyncio.tasks._PyTask):
+    """
+    没有cancelling方法的任务，模拟Python 3.10
+    """
+
+    def __getattribute__(self, name):
+        if name in ("cancelling", "uncancel"):
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+def test_token_cancel_without_task_cancelling():
+    async def scenario():
+        asyncio.get_running_loop().set_task_factory(lambda loop, coro, **kwargs: _TaskWithoutCancelling(coro, loop=loop, **kwargs))
+        token = CancelToken()
+        task = asyncio.ensure_future(token.run(asyncio.sleep(30)))
+        assert not hasattr(task, "cancelling")
+        await asyncio.sleep(0)
+        token.cancel("stop")
+        with pytest.raises(CrawlCancelled):
+            await task
+
+    asyncio.run(scenario())
+
+
+class SlowSite:
+    """
+    请求在engine事件循环中等待delay秒后返回页面
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = threading.Event()
+
+    async def request(self, method, url, headers=None, timeout=None, **kwargs):
+        self.in_flight.set()
+        await asyncio.sleep(self.delay)
+        request = httpx.Request(method, url)
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=b"<title>A</title>", request=request)
+
+
+def _slow_spider(make_spider, delay):
+    site = SlowSite(delay)
+    spider = make_spider(f"cancel{next(_names)}", lambda request: None)
+    spider.engine = type("FakeEngine", (), {"request": staticmethod(site.request), "run": spider.engine.run})()
+    return spider, site
+
+
+def _run_in_thread(spider):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("records", spider.run()))
+    thread.start()
+    return thread, result
+
+
+def test_stop_cancels_in_flight_request(make_spider):
+    spider, site = _slow_spider(make_spider, 30)
+    other, other_site = _slow_spider(make_spider, 0.2)
+
+    thread, result = _run_in_thread(spider)
+    other_thread, other_result = _run_in_thread(other)
+    assert site.in_flight.wait(5) and other_site.in_flight.wait(5)
+
+    spider.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert result["records"] is None
+    assert spider.last_run["cancelled"] is True
+    assert spider.state == "stopped"
+
+    # 其他爬虫的请求不受影响
+    other_thread.join(5)
+    assert len(other_result["records"]) == 1
+    assert other.last_run["cancelled"] is False
+    other.discard_run()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    from wumeng_crawler.spiders.spider_manager import SpiderManager
+
+    monkeypatch.setitem(SPIDER_CONFIG, "TARGET_SITES", [])
+    return SpiderManager()
+
+
+def test_shutdown_drains_running_spider(make_spider, manager):
+    spider, site = _slow_spider(make_spider, 0.2)
+    manager.spiders.append(spider)
+
+    thread, result = _run_in_thread(spider)
+    assert site.in_flight.wait(5)
+    manager.shutdown(drain_timeout=5)
+    thread.join(5)
+
+    # 超时之前运行正常结束，没有被取消
+    assert len(result["records"]) == 1
+    assert spider.last_run["cancelled"] is False
+    assert spider.state == "stopped"
+    spider.discard_run()
+
+
+def test_shutdown_cancels_after_drain_timeout(make_spider, manager):
+    spider, site = _slow_spider(make_spider, 30)
+    manager.spiders.append(spider)
+
+    thread, result = _run_in_thread(spider)
+    assert site.in_flight.wait(5)
+    manager.shutdown(drain_timeout=0.2)
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert result["records"] is None
+    assert spider.last_run["cancelled"] is True
@@ -0,0 +1,142 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.db_utils import DBUtils
+from app.models.crawled_data import CrawledData
+
+
+def _item(content, data_id="1", spider_name="wq", data_type="song", source="wq.test"):
+    return {
+        "spider_name": spider_name,
+        "data_type": data_type,
+        "data_id": data_id,
+        "data_content": content,
+        "source": source
+    }
+
+
+def _rows(db):
+    return db.query(CrawledData).order_by(CrawledData.id).all()
+
+
+def test_content_fingerprint_ignores_key_order_and_crawl_time():
+    assert DBUtils.content_fingerprint({"a": 1, "b": 2, "crawl_time": "x"}) == DBUtils.content_fingerprint({"b": 2, "a": 1})
+    assert DBUtils.content_fingerprint({"a": 1}) != DBUtils.content_fingerprint({"a": 2})
+
+
+def test_unchanged_content_is_not_inserted_again(db):
+    assert DBUtils.save_crawled_data(db, [_item({"title": "A"})]) == 1
+    first_update = _rows(db)[0].update_time
+
+    assert DBUtils.save_crawled_data(db, [_item({"title": "A", "crawl_time": "later"})]) == 0
+    rows = _rows(db)
+    assert len(rows) == 1
+    assert rows[0].update_time >= first_update
+
+
+def test_content_reverting_to_old_version_becomes_latest(db):
+    for title in ("A", "B", "A"):
+        assert DBUtils.save_crawled_data(db, [_item({"title": title})]) == 1
+
+    rows = _rows(db)
+    assert [row.data_content["title"] for row in rows] == ["A", "B", "A"]
+
+    # 最新的记录是A，再次保存A视为未变化
+    assert DBUtils.save_crawled_data(db, [_item({"title": "A"})]) == 0
+    assert len(_rows(db)) == 3
+
+
+def test_content_reverting_within_one_batch(db):
+    assert DBUtils.save_crawled_data(db, [_item({"title": "A"}), _item({"title": "B"}), _item({"title": "A"})]) == 3
+    assert _rows(db)[-1].data_content["title"] == "A"
+
+
+def test_same_content_for_different_data_ids_is_kept(db):
+    assert DBUtils.save_crawled_data(db, [_item({"title": "A"}, data_id="1"), _item({"title": "A"}, data_id="2")]) == 2
+
+
+def test_records_without_data_id_dedupe_by_content(db):
+    items = [_item({"url": "/a"}, data_id=None), _item({"url": "/a"}, data_id=None), _item({"url": "/b"}, data_id=None)]
+    assert DBUtils.save_crawled_data(db, items) == 2
+    assert DBUtils.save_crawled_data(db, items) == 0
+
+
+def test_upsert_updates_latest_row_in_place(db):
+    for title in ("A", "B", "A"):
+        DBUtils.save_crawled_data(db, [_item({"title": title})], upsert=True)
+
+    rows = _rows(db)
+    assert len(rows) == 1
+    assert rows[0].data_content["title"] == "A"
+
+
+def test_chunked_save_commits_every_chunk(db):
+    items = [_item({"title": str(i)}, data_id=str(i)) for i in range(25)]
+    assert DBUtils.save_crawled_data(db, items, chunk_size=10) == 25
+    assert len(_rows(db)) == 25
+
+
+def test_upsert_keeps_crawl_time_and_inserts_records_without_data_id(db):
+    DBUtils.save_crawled_data(db, [_item({"title": "A"})], upsert=True)
+    crawl_time = _rows(db)[0].crawl_time
+
+    items = [_item({"title": "B"}), _item({"url": "/a"}, data_id=None)]
+    assert DBUtils.save_crawled_data(db, items, upsert=True) == 2
+
+    rows = _rows(db)
+    assert [(row.data_id, row.data_content) for row in rows] == [("1", {"title": "B"}), (None, {"url": "/a"})]
+    assert rows[0].crawl_time == crawl_time
+
+
+def test_incomplete_records_are_skipped(db):
+    items = [{"spider_name": "wq", "data_type": "song", "data_content": {"title": "A"}}, _item({"title": "B"})]
+    assert DBUtils.save_crawled_data(db, items) == 1
+    assert [row.data_content for row in _rows(db)] == [{"title": "B"}]
+
+
+def test_precomputed_content_hash_is_used(db):
+    item = dict(_item({"title": "A"}), content_hash="precomputed")
+    DBUtils.save_crawled_data(db, [item])
+    assert _rows(db)[0].content_hash == "precomputed"
+
+
+def test_locked_chunk_is_retried(monkeypatch, db):
+    from app.core import db_utils
+
+    save_chunk = DBUtils._save_crawled_data_chunk
+    calls = []
+
+    def flaky_save_chunk(session, chunk, upsert):
+        calls.append(len(chunk))
+        if len(calls) == 1:
+            # 模拟写入一部分后数据库被锁，重试前需要回滚
+            save_chunk(session, chunk, upsert)
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return save_chunk(session, chunk, upsert)
+
+    monkeypatch.setattr(db_utils, "CRAWLED_DATA_RETRY_DELAY", 0)
+    monkeypatch.setattr(DBUtils, "_save_crawled_data_chunk", staticmethod(flaky_save_chunk))
+
+    items = [_item({"title": str(i)}, data_id=str(i)) for i in range(3)]
+    assert DBUtils.save_crawled_data(db, items, max_retries=2) == 3
+    assert calls == [3, 3]
+    assert len(_rows(db)) == 3
+
+
+def test_failed_chunk_keeps_earlier_chunks(monkeypatch, db):
+    from app.core import db_utils
+
+    save_chunk = DBUtils._save_crawled_data_chunk
+
+    def locked_after_first_chunk(session, chunk, upsert):
+        if chunk[0][0]["data_id"] != "0":
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return save_chunk(session, chunk, upsert)
+
+    monkeypatch.setattr(db_utils, "CRAWLED_DATA_RETRY_DELAY", 0)
+    monkeypatch.setattr(DBUtils, "_save_crawled_data_chunk", staticmethod(locked_after_first_chunk))
+
+    items = [_item({"title": str(i)}, data_id=str(i)) for i in range(4)]
+    with pytest.raises(OperationalError):
+        DBUtils.save_crawled_data(db, items, chunk_size=2, max_retries=1)
+    assert [row.data_id for row in _rows(db)] == ["0", "1"]
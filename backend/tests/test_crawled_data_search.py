@@ -0,0 +1,57 @@
+import pytest
+
+from app.core.db_utils import DBUtils
+
+
+def _item(data_id, content, data_type="song"):
+    return {
+        "spider_name": "wq",
+        "data_type": data_type,
+        "data_id": data_id,
+        "data_content": content,
+        "source": "wq.test"
+    }
+
+
+@pytest.fixture
+def seeded(db):
+    assert DBUtils._has_crawled_data_fts(db)
+    DBUtils.save_crawled_data(db, [
+        _item("1", {"title": "舞萌DX 2026"}),
+        _item("2", {"title": "100% clear_rate"}),
+        _item("3", {"title": 'say "hello"'}, data_type="player"),
+        _item("4", {"title": "other"})
+    ])
+    return db
+
+
+def _ids(db, keyword, **filters):
+    total, rows = DBUtils.search_crawled_data(db, keyword=keyword, limit=100, **filters)
+    assert total == len(rows)
+    return sorted(row.data_id for row in rows)
+
+
+def _substring_ids(db, keyword):
+    return sorted(row.data_id for row in DBUtils.get_crawled_data(db) if keyword in row.data_content["title"])
+
+
+@pytest.mark.parametrize("keyword", ["舞萌", "舞萌DX", "2026", "100%", "_rate", '"hello"', "o", "missing"])
+def test_fts_matches_substring_search(seeded, keyword):
+    # 3个字符以上走MATCH，更短的关键词走LIKE，LIKE通配符和引号按字面匹配
+    assert _ids(seeded, keyword) == _substring_ids(seeded, keyword)
+
+
+def test_filters_and_paging(seeded):
+    assert _ids(seeded, "o", data_type="player") == ["3"]
+    total, rows = DBUtils.search_crawled_data(seeded, limit=2, offset=0)
+    assert total == 4
+    assert len(rows) == 2
+
+
+def test_index_follows_updates_and_deletes(seeded):
+    DBUtils.save_crawled_data(seeded, [_item("4", {"title": "舞萌 remix"})], upsert=True)
+    assert _ids(seeded, "remix") == ["4"]
+    assert _ids(seeded, "other") == []
+
+    DBUtils.delete_old_crawled_data(seeded, -1)
+    assert _ids(seeded, "舞萌") == []
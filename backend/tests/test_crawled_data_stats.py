@@ -0,0 +1,81 @@
+import threading
+from datetime import datetime, timedelta
+
+from app.core.db_utils import DBUtils
+from app.models.crawled_data import CrawledData
+from app.models.crawled_data_stats import CrawledDataStats
+
+
+def _item(content, data_id="1", data_type="song", source="wq.test"):
+    return {
+        "spider_name": "wq",
+        "data_type": data_type,
+        "data_id": data_id,
+        "data_content": content,
+        "source": source
+    }
+
+
+def _counts(db):
+    db.expire_all()
+    return {(stats.data_type, stats.source): stats.record_count for stats in db.query(CrawledDataStats).all()}
+
+
+def test_concurrent_ingest_counts_every_row(db):
+    from app.core.database import SessionLocal
+
+    errors = []
+
+    def ingest(worker):
+        session = SessionLocal()
+        try:
+            items = [_item({"title": str(i)}, data_id=f"{worker}-{i}") for i in range(20)]
+            for start in range(0, len(items), 5):
+                DBUtils.save_crawled_data(session, items[start:start + 5])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=ingest, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert db.query(CrawledData).count() == 80
+    assert _counts(db) == {("song", "wq.test"): 80}
+
+
+def test_upsert_moves_count_to_new_group(db):
+    DBUtils.save_crawled_data(db, [_item({"title": "A"}), _item({"title": "B"}, data_id="2")], upsert=True)
+    assert _counts(db) == {("song", "wq.test"): 2}
+
+    DBUtils.save_crawled_data(db, [_item({"title": "A2"}, data_type="album")], upsert=True)
+    assert _counts(db) == {("song", "wq.test"): 1, ("album", "wq.test"): 1}
+
+    # 分组变化后又变回原分组，计数为0的分组删除
+    DBUtils.save_crawled_data(db, [_item({"title": "B2"}, data_id="2", source="other.test")], upsert=True)
+    DBUtils.save_crawled_data(db, [_item({"title": "A3"}, data_type="song")], upsert=True)
+    assert _counts(db) == {("song", "wq.test"): 1, ("song", "other.test"): 1}
+
+    DBUtils.rebuild_crawled_data_stats(db)
+    assert _counts(db) == {("song", "wq.test"): 1, ("song", "other.test"): 1}
+
+
+def test_delete_old_data_decrements_counts(db):
+    DBUtils.save_crawled_data(db, [_item({"title": str(i)}, data_id=str(i)) for i in range(3)])
+    old = db.query(CrawledData).order_by(CrawledData.id).first()
+    old.crawl_time = datetime.utcnow() - timedelta(days=10)
+    db.commit()
+    DBUtils.rebuild_crawled_data_stats(db)
+
+    assert DBUtils.delete_old_crawled_data(db, 5) == 1
+    stats = DBUtils.get_crawled_data_stats(db)
+    assert stats["total_records"] == 2
+    assert stats["spider_stats"] == {"wq": 2}
+    assert list(stats["daily_stats"].values()) == [2]
+
+    assert DBUtils.delete_old_crawled_data(db, -1) == 2
+    assert _counts(db) == {}
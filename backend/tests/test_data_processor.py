@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from wumeng_crawler.processors.data_processor import DataProcessor
+
+# 字典路径和pandas路径的切换阈值
+DICT_PATH = 10 ** 9
+PANDAS_PATH = 0
+
+
+def _processor(pandas_min_rows):
+    processor = DataProcessor()
+    processor.pandas_min_rows = pandas_min_rows
+    return processor
+
+
+def _records(count, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        record = {
+            "site": rng.choice(["wq", "ai", "wi", None]),
+            "domain": rng.choice(["a.test", "b.test"]),
+            "title": rng.choice(["A", "B", "C", None]),
+            "links": [{"text": str(index), "href": f"/{index}"}],
+            "index": index
+        }
+        if record["site"] is None:
+            del record["site"]
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize("pandas_min_rows", [DICT_PATH, PANDAS_PATH])
+def test_remove_duplicates_keeps_last(pandas_min_rows):
+    processor = _processor(pandas_min_rows)
+    data = [
+        {"site": "wq", "domain": "a.test", "title": "A", "value": 1},
+        {"site": "wq", "domain": "a.test", "title": "B", "value": 1},
+        {"site": "wq", "domain": "a.test", "title": "A", "value": 2, "links": [{"href": "/a"}]}
+    ]
+
+    result = processor._remove_duplicates(data)
+    assert [item["value"] for item in result] == [1, 2]
+    # 返回原始数据项，嵌套列表和缺失字段保持原样
+    assert result[1] is data[2]
+    assert "links" not in result[0]
+
+
+@pytest.mark.parametrize("pandas_min_rows", [DICT_PATH, PANDAS_PATH])
+def test_missing_subset_column_skips_dedupe(pandas_min_rows):
+    data = [{"site": "wq", "title": "A"}, {"site": "wq", "title": "A"}]
+    assert _processor(pandas_min_rows)._remove_duplicates(data) == data
+
+
+@pytest.mark.parametrize("pandas_min_rows", [DICT_PATH, PANDAS_PATH])
+def test_integrate_groups_by_sorted_site(pandas_min_rows):
+    data = [{"site": "wq", "n": 1}, {"n": 2}, {"site": "ai", "n": 3}, {"site": "wq", "n": 4}]
+    grouped = _processor(pandas_min_rows).integrate_data(data)
+    assert list(grouped) == ["ai", "wq"]
+    assert grouped["wq"] == [{"site": "wq", "n": 1}, {"site": "wq", "n": 4}]
+
+    # 没有site字段时放在同一组
+    assert _processor(pandas_min_rows).integrate_data([{"n": 1}]) == {"all": [{"n": 1}]}
+
+
+@pytest.mark.parametrize("count", [1, 50, 500])
+def test_dict_and_pandas_paths_agree(count):
+    records = _records(count, seed=count)
+
+    dict_processor = _processor(DICT_PATH)
+    pandas_processor = _processor(PANDAS_PATH)
+
+    deduped = dict_processor._remove_duplicates(records)
+    assert deduped == pandas_processor._remove_duplicates(records)
+    assert dict_processor.integrate_data(deduped) == pandas_processor.integrate_data(deduped)
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from wumeng_crawler.config.config import PROCESSOR_CONFIG
+from wumeng_crawler.processors.data_processor import DataProcessor
+
+
+def _record(site, title, value, crawl_time="2026-10-18 08:00:00"):
+    return {"site": site, "domain": f"{site}.test", "title": title, "value": value, "crawl_time": crawl_time}
+
+
+BATCHES = [
+    [_record("wq", "a", 1), _record("wq", "b", 1), _record("wq", "a", 2)],
+    [_record("ai", "x", 1), {"title": "no site"}],
+    [_record("wq", "b", 3), _record("ai", "x", 2), _record("ai", "y", 1)]
+]
+
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = DataProcessor()
+    processor.processed_data_dir = str(tmp_path)
+    return processor
+
+
+def _all_records():
+    return [item for batch in BATCHES for item in batch]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_stream_json_matches_batch_processing(processor, chunk_size):
+    expected = json.loads(processor.process(_all_records(), format_type="json"))
+
+    stats = processor.process_batches(BATCHES, chunk_size=chunk_size, save=True, file_format="json")
+    with open(stats["file_path"], encoding="utf-8") as f:
+        assert json.load(f) == expected
+
+    # 重复数据保留最后一条
+    assert [item["value"] for item in expected["wq"]] == [2, 3]
+    assert stats["records"] == 8
+    assert stats["duplicates"] == 3
+    assert stats["processed"] == 5
+
+
+def test_stream_jsonl_keeps_last_duplicate(processor):
+    stats = processor.process_stream(_all_records(), chunk_size=2, save=True, file_format="jsonl")
+    assert stats["file_path"].endswith(".jsonl")
+    loaded = processor.load_data(stats["file_path"])
+    assert [(item.get("site"), item["title"], item.get("value")) for item in loaded] == [
+        ("wq", "a", 2), (None, "no site", None), ("wq", "b", 3), ("ai", "x", 2), ("ai", "y", 1)
+    ]
+
+
+def test_stream_default_file_format_is_grouped_json(processor, monkeypatch):
+    monkeypatch.delitem(PROCESSOR_CONFIG, "PROCESSED_FILE_FORMAT")
+    stats = processor.process_batches(BATCHES, save=True)
+    assert stats["file_path"].endswith(".json")
+    assert sorted(processor.load_data(stats["file_path"])) == ["ai", "wq"]
+
+
+def test_stream_without_site_groups_under_all(processor):
+    stats = processor.process_stream([{"title": "a"}, {"title": "b"}], save=True, file_format="json")
+    assert processor.load_data(stats["file_path"]) == {"all": [{"title": "a"}, {"title": "b"}]}
+
+
+def test_stream_writes_no_file_without_records(processor):
+    stats = processor.process_batches([[], []], save=True, file_format="json")
+    assert stats["file_path"] is None
+
+
+def test_spool_reads_each_site_once(monkeypatch):
+    from wumeng_crawler.processors import data_processor
+
+    spool = data_processor._RecordSpool(data_processor._BoundedKeySet(100), lambda item: None)
+    records = [{"site": site, "n": n} for n in range(3) for site in ("c", "a", "b")] + [{"n": "no site"}]
+    spool.write(records)
+
+    reads = []
+    read = spool._read
+    monkeypatch.setattr(spool, "_read", lambda file: reads.append(file) or read(file))
+    try:
+        grouped = list(spool.iter_kept(grouped=True))
+        assert [(item["site"], item["n"]) for item in grouped] == [(site, n) for site in "abc" for n in range(3)]
+        assert len(reads) == len(set(reads)) == 3
+
+        # 不分组时按写入顺序读取
+        assert list(spool.iter_kept()) == records
+    finally:
+        spool.close()
+
+
+@pytest.mark.parametrize("records", [
+    # 部分数据缺少domain，缺少的字段按空值比较
+    [{"site": "wq", "title": "a", "value": 1}, {"site": "wq", "domain": "wq.test", "title": "b"}, {"site": "wq", "title": "a", "value": 2}],
+    # 所有数据都缺少domain时不去重
+    [{"site": "wq", "title": "a", "value": 1}, {"site": "wq", "title": "a", "value": 2}]
+])
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_stream_missing_subset_column_matches_batch(processor, records, chunk_size):
+    expected = processor._remove_duplicates([processor._clean_item(item) for item in records])
+
+    stats = processor.process_stream(records, chunk_size=chunk_size, save=True, file_format="jsonl")
+    assert processor.load_data(stats["file_path"]) == expected
+    assert stats["processed"] == len(expected)
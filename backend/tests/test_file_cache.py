@@ -0,0 +1,80 @@
+import json
+import os
+
+from wumeng_crawler.storage.file_cache import ParsedFileCache, get_file_cache
+
+
+def _write(path, data, mtime=None):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_unchanged_file_is_served_from_cache(tmp_path):
+    cache = ParsedFileCache(1024)
+    path = _write(tmp_path / "a.json", [1, 2], mtime=1000)
+
+    first, mtime = cache.load(path)
+    second, _ = cache.load(path)
+    assert first == [1, 2]
+    assert mtime == 1000
+    assert second is first
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    cache = ParsedFileCache(1024)
+    path = _write(tmp_path / "a.json", [1], mtime=1000)
+    cache.load(path)
+
+    _write(tmp_path / "a.json", [1, 2, 3], mtime=2000)
+    assert cache.load(path) == ([1, 2, 3], 2000)
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    a = _write(tmp_path / "a.json", list(range(10)))
+    b = _write(tmp_path / "b.json", list(range(10)))
+    c = _write(tmp_path / "c.json", list(range(10)))
+    size = os.path.getsize(a)
+    cache = ParsedFileCache(size * 2)
+
+    cache.load(a)
+    cache.load(b)
+    cache.load(a)
+    cache.load(c)
+
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == size * 2
+
+    # b最久未使用，已被淘汰
+    cache.load(b)
+    assert cache.get_stats()["misses"] == 4
+
+
+def test_file_larger_than_budget_is_not_cached(tmp_path):
+    cache = ParsedFileCache(4)
+    path = _write(tmp_path / "a.json", {"key": "value"})
+
+    cache.load(path)
+    assert cache.get_stats()["entries"] == 0
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_invalidate_and_clear(tmp_path):
+    cache = ParsedFileCache(1024)
+    path = _write(tmp_path / "a.json", [1])
+    cache.load(path)
+
+    cache.invalidate(path)
+    assert cache.get_stats()["entries"] == 0
+    cache.load(path)
+    cache.clear()
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_get_file_cache_is_singleton():
+    assert get_file_cache() is get_file_cache()
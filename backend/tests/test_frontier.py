@@ -0,0 +1,153 @@
+import itertools
+
+import httpx
+import pytest
+
+from wumeng_crawler.storage.frontier import CrawlFrontier, canonicalize_url, get_frontier
+
+_names = itertools.count()
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.db"), lease_timeout=600)
+    yield frontier
+    frontier.close()
+
+
+def test_canonicalize_url():
+    assert canonicalize_url("HTTP://Example.COM#top") == "http://example.com/"
+    assert canonicalize_url("http://example.com/a?b=1#c") == "http://example.com/a?b=1"
+
+
+def test_add_ignores_seen_urls(frontier):
+    assert frontier.add("s", ["http://a.test/", "http://a.test/x", "http://A.test/#frag"], depth=0) == 2
+    assert frontier.add("s", ["http://a.test/x", "http://a.test/y"], depth=1) == 1
+    # 不同爬虫的队列互不影响
+    assert frontier.add("t", ["http://a.test/x"], depth=0) == 1
+    assert frontier.get_status("s")["urls"] == 3
+
+
+def test_next_batch_leases_and_limits_per_host(frontier):
+    frontier.add("s", [f"http://a.test/{i}" for i in range(5)], depth=0)
+    frontier.add("s", ["http://b.test/"], depth=0)
+
+    batch = frontier.next_batch("s", limit=4, per_host=2)
+    assert len([entry for entry in batch if "a.test" in entry["url"]]) == 2
+    assert [entry["url"] for entry in batch if "b.test" in entry["url"]] == ["http://b.test/"]
+    assert all(entry["fetch_count"] == 0 for entry in batch)
+
+    # 取出的URL在租约期内不会再次取出
+    leased = {entry["url"] for entry in batch}
+    assert not leased & {entry["url"] for entry in frontier.next_batch("s", limit=10)}
+
+
+def test_reschedule_releases_lease(frontier):
+    frontier.add("s", ["http://a.test/"], depth=0)
+    assert frontier.next_batch("s", limit=1)
+    assert frontier.next_batch("s", limit=1) == []
+
+    frontier.reschedule("s", ["http://a.test/"])
+    assert [entry["url"] for entry in frontier.next_batch("s", limit=1)] == ["http://a.test/"]
+
+
+def test_complete_adjusts_recrawl_interval(frontier):
+    frontier.add("s", ["http://a.test/u", "http://a.test/c", "http://a.test/f"], depth=0)
+    frontier.next_batch("s", limit=3)
+    frontier.complete("s", [
+        {"url": "http://a.test/u", "status": "unchanged", "recrawl_interval": 100},
+        {"url": "http://a.test/c", "status": "changed", "recrawl_interval": 400},
+        {"url": "http://a.test/f", "status": "failed", "recrawl_interval": None}
+    ], recrawl_interval=100, max_recrawl_interval=150)
+
+    rows = dict(frontier._conn.execute("SELECT url, recrawl_interval FROM frontier").fetchall())
+    # 未变化时间隔加倍但不超过上限，变化时恢复为初始间隔，失败时不改变间隔
+    assert rows == {"http://a.test/u": 150, "http://a.test/c": 100, "http://a.test/f": None}
+    assert frontier.get_status("s")["fetched"] == 2
+    assert frontier.next_batch("s", limit=3) == []
+
+
+class LinkedSite:
+    """
+    首页链接到两个子页面的站点，所有页面都支持ETag条件请求
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        etag = f'"{path}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        body = f"<html><head><title>{path}</title></head><body>"
+        if path == "/":
+            body += '<a href="/a">a</a><a href="/b">b</a>'
+        return httpx.Response(200, headers={"ETag": etag, "Content-Type": "text/html"}, content=(body + "</body></html>").encode())
+
+
+def _frontier_spider(make_spider, site, name=None):
+    name = name or f"frontier{next(_names)}"
+    return make_spider(name, site, crawl={"fields": ["title", "links"], "frontier": {"max_depth": 1, "budget": 10}})
+
+
+def test_spider_discovers_links_and_skips_unchanged(make_spider):
+    site = LinkedSite()
+    spider = _frontier_spider(make_spider, site)
+
+    records = spider.run()
+    assert sorted(record["title"] for record in records) == ["/", "/a", "/b"]
+    spider.commit_run()
+    assert spider.frontier.get_status(spider.name) == {"urls": 3, "due": 0, "fetched": 3, "max_depth": 1}
+
+    # 没有到期的页面，视为内容未变化
+    assert spider.run() == []
+
+
+def test_clear_rediscovers_from_start_pages_with_warm_cache(make_spider):
+    site = LinkedSite()
+    spider = _frontier_spider(make_spider, site)
+    spider.run()
+    spider.commit_run()
+
+    # 页面的校验信息已经缓存，清空队列后仍然要重新提取链接
+    spider.frontier.clear(spider.name)
+    site.requests.clear()
+    records = spider.run()
+    assert not any("If-None-Match" in request.headers for request in site.requests)
+    assert len(records) == 3
+    spider.commit_run()
+    status = spider.frontier.get_status(spider.name)
+    assert status["urls"] == 3
+    assert status["max_depth"] == 1
+
+
+def test_frontier_mode_with_cache_warmed_by_another_spider(make_spider):
+    site = LinkedSite()
+    name = f"frontier{next(_names)}"
+    plain = make_spider(name, site, crawl={"fields": ["title", "links"]})
+    assert len(plain.run()) == 1
+    plain.commit_run()
+
+    # 同一网站切换为增量爬取，首页的校验信息已经缓存
+    spider = _frontier_spider(make_spider, site, name=name)
+    assert len(spider.run()) == 3
+    spider.commit_run()
+    assert spider.frontier.get_status(spider.name)["urls"] == 3
+
+
+def test_discarded_run_releases_leases(make_spider):
+    site = LinkedSite()
+    spider = _frontier_spider(make_spider, site)
+    assert len(spider.run()) == 3
+    spider.discard_run()
+
+    # 记录未保存，取出的页面立即重新到期，不用等待租约过期，并且没有记为已抓取
+    assert spider.frontier.get_status(spider.name) == {"urls": 3, "due": 3, "fetched": 0, "max_depth": 1}
+    assert len(spider.run()) == 3
+    spider.commit_run()
+
+
+def test_get_frontier_is_singleton():
+    assert get_frontier() is get_frontier()
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+from wumeng_crawler.parsers.html_parser import HtmlParser, extract_fields, get_parser, register_parser
+
+PAGE = """<html><head><title> 舞萌 歌曲 </title></head><body>
+<a href="/a"> 歌曲 <!-- c --><b>1</b> </a>
+<a name="anchor">没有链接</a>
+<a href="/b">外层<a href="/c">内层</a></a>
+<table>
+  <tr><th>名称</th><th>难度</th></tr>
+  <tr><td> A </td><td>13<sup>+</sup></td></tr>
+  <tr><td><table><tr><td>嵌套</td></tr></table></td><td>B</td></tr>
+</table>
+</body></html>"""
+
+ALL_FIELDS = ("title", "links", "tables")
+
+
+def test_lxml_matches_soup():
+    content = PAGE.encode("utf-8")
+    assert extract_fields(content, "utf-8", ALL_FIELDS) == extract_fields(content, "utf-8", ALL_FIELDS, parser="bs4")
+
+
+def test_extracts_fields():
+    result = extract_fields(PAGE.encode("utf-8"), None, ALL_FIELDS)
+    assert result["title"] == " 舞萌 歌曲 "
+    assert result["links"][0] == {"text": "歌曲1", "href": "/a"}
+    assert [link["href"] for link in result["links"]] == ["/a", "/b", "/c"]
+    # 表格按出现顺序输出，嵌套表格的行不计入外层表格
+    assert result["tables"] == [[["名称", "难度"], ["A", "13+"], ["嵌套", "B"]], [["嵌套"]]]
+
+
+def test_only_requested_fields_are_returned():
+    assert extract_fields(PAGE.encode("utf-8"), None, ("links",)).keys() == {"links"}
+    assert extract_fields(b"<html><body></body></html>", None, ("title",)) == {"title": ""}
+
+
+def test_encoding_from_meta_or_header():
+    page = '<html><head><meta charset="gbk"><title>舞萌</title></head></html>'
+    assert extract_fields(page.encode("gbk"), None, ("title",))["title"] == "舞萌"
+    assert extract_fields("<title>舞萌</title>".encode("gbk"), "gbk", ("title",))["title"] == "舞萌"
+
+    # 无法识别的编码按UTF-8解析
+    assert extract_fields("<title>舞萌</title>".encode("utf-8"), "x-unknown", ("title",))["title"] == "舞萌"
+
+
+def test_unknown_field_or_parser():
+    with pytest.raises(ValueError):
+        extract_fields(b"", None, ("images",))
+    with pytest.raises(ValueError):
+        get_parser("missing")
+
+
+def test_register_parser():
+    class UpperTitleParser(HtmlParser):
+        name = "upper-title"
+
+        def extract(self, content, encoding, fields):
+            return {"title": get_parser("lxml").extract(content, encoding, ("title",))["title"].upper()}
+
+    register_parser(UpperTitleParser)
+    assert extract_fields(b"<title>abc</title>", None, ("title",), parser="upper-title") == {"title": "ABC"}
+
+
+def test_spider_extracts_configured_fields(make_spider):
+    def site(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=PAGE.encode("utf-8"))
+
+    spider = make_spider("parser", site, crawl={"fields": ["title", "tables"]}, html_parser="bs4")
+    records = spider.run()
+    spider.commit_run()
+    assert records[0]["title"] == "舞萌 歌曲"
+    assert records[0]["tables"][0][1] == ["A", "13+"]
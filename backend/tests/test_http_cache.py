@@ -0,0 +1,123 @@
+import itertools
+
+import httpx
+import pytest
+
+from wumeng_crawler.network.http_cache import ValidatorCache, body_hash, get_validator_cache
+
+_names = itertools.count()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ValidatorCache(str(tmp_path / "http_cache.db"))
+    yield cache
+    cache.close()
+
+
+def test_put_get_and_delete(cache):
+    assert cache.get("http://a.test/") is None
+
+    cache.put("http://a.test/", {"etag": '"v1"', "last_modified": None, "body_hash": body_hash(b"a")})
+    assert cache.get("http://a.test/") == {"etag": '"v1"', "last_modified": None, "body_hash": body_hash(b"a")}
+
+    # 同一URL再次写入时覆盖旧的校验信息
+    cache.put_many([
+        ("http://a.test/", {"etag": '"v2"', "body_hash": body_hash(b"b")}),
+        ("http://a.test/x", {"last_modified": "Mon, 01 Jan 2024 00:00:00 GMT", "body_hash": body_hash(b"x")})
+    ])
+    assert cache.get("http://a.test/")["etag"] == '"v2"'
+    assert cache.get("http://a.test/x")["last_modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    cache.delete("http://a.test/")
+    assert cache.get("http://a.test/") is None
+
+
+def test_validators_persist_across_instances(tmp_path):
+    path = str(tmp_path / "http_cache.db")
+    cache = ValidatorCache(path)
+    cache.put("http://a.test/", {"etag": '"v1"', "body_hash": body_hash(b"a")})
+    cache.close()
+
+    cache = ValidatorCache(path)
+    assert cache.get("http://a.test/")["etag"] == '"v1"'
+    cache.close()
+
+
+class LastModifiedSite:
+    """
+    只支持Last-Modified条件请求的站点，内容可以修改
+    """
+
+    def __init__(self):
+        self.last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+        self.title = "A"
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-Modified-Since") == self.last_modified:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"Last-Modified": self.last_modified, "Content-Type": "text/html"},
+            content=f"<html><head><title>{self.title}</title></head></html>".encode()
+        )
+
+
+class PlainSite:
+    """
+    不支持条件请求的站点，每次都返回完整页面
+    """
+
+    def __init__(self):
+        self.title = "A"
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=f"<html><head><title>{self.title}</title></head></html>".encode())
+
+
+def test_spider_sends_if_modified_since_after_commit(make_spider):
+    site = LastModifiedSite()
+    spider = make_spider(f"cache{next(_names)}", site)
+
+    assert len(spider.run()) == 1
+    assert "If-Modified-Since" not in site.requests[-1].headers
+    spider.commit_run()
+
+    # 未变化的页面返回304，不产生记录
+    assert spider.run() == []
+    assert site.requests[-1].headers["If-Modified-Since"] == site.last_modified
+    spider.commit_run()
+
+    site.last_modified = "Tue, 02 Jan 2024 00:00:00 GMT"
+    site.title = "B"
+    records = spider.run()
+    assert [record["title"] for record in records] == ["B"]
+
+
+def test_validators_are_not_cached_before_commit(make_spider):
+    site = LastModifiedSite()
+    spider = make_spider(f"cache{next(_names)}", site)
+    url = spider.get_url()
+
+    spider.run()
+    assert get_validator_cache().get(url) is None
+
+    spider.commit_run()
+    assert get_validator_cache().get(url)["last_modified"] == site.last_modified
+
+
+def test_unchanged_body_without_validators_is_skipped(make_spider):
+    site = PlainSite()
+    spider = make_spider(f"cache{next(_names)}", site)
+
+    assert len(spider.run()) == 1
+    spider.commit_run()
+
+    # 服务器不支持条件请求，按响应体哈希判断页面未变化
+    assert spider.run() == []
+    spider.commit_run()
+
+    site.title = "B"
+    assert [record["title"] for record in spider.run()] == ["B"]
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from wumeng_crawler.network.http_engine import HttpEngine, get_http_engine
+
+
+class ConcurrencyProbe:
+    """
+    记录每个主机同时进行的请求数
+    """
+
+    def __init__(self):
+        self.active = {}
+        self.peak = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        await asyncio.sleep(0.02)
+        self.active[host] -= 1
+        return httpx.Response(200, text=host)
+
+
+@pytest.fixture
+def engine():
+    engine = HttpEngine()
+    engine.per_host_limit = 2
+    yield engine
+    engine.close()
+
+
+def _mock(engine, handler):
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_run_executes_on_engine_loop(engine):
+    _mock(engine, lambda request: httpx.Response(200, text="ok"))
+    response = engine.run(engine.request("GET", "http://a.test/", params={"q": "1"}))
+    assert response.text == "ok"
+    assert response.request.url.params["q"] == "1"
+
+
+def test_request_from_other_loop_is_forwarded(engine):
+    _mock(engine, lambda request: httpx.Response(200, text="ok"))
+    assert asyncio.run(engine.request("GET", "http://a.test/")).text == "ok"
+
+
+def test_per_host_concurrency_limit(engine):
+    probe = ConcurrencyProbe()
+    _mock(engine, probe)
+
+    async def crawl():
+        urls = [f"http://{host}/{i}" for host in ("a.test", "b.test") for i in range(6)]
+        return await asyncio.gather(*(engine.request("GET", url) for url in urls))
+
+    responses = engine.run(crawl())
+    assert len(responses) == 12
+    assert probe.peak == {"a.test": 2, "b.test": 2}
+
+
+def test_run_inside_engine_loop_is_rejected(engine):
+    async def nested():
+        coro = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            engine.run(coro)
+
+    engine.run(nested())
+
+
+def test_close_and_restart(engine):
+    first_loop = engine.loop
+    engine.close()
+    assert first_loop.is_closed() or not first_loop.is_running()
+
+    _mock(engine, lambda request: httpx.Response(204))
+    assert engine.run(engine.request("GET", "http://a.test/")).status_code == 204
+    assert engine.loop is not first_loop
+
+
+def test_get_http_engine_is_singleton():
+    assert get_http_engine() is get_http_engine()
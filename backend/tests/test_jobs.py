@@ -0,0 +1,193 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.core.jobs import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JOB_TYPE_ALL_SPIDERS,
+    JOB_TYPE_SPIDER,
+    JobManager,
+    JobQueueFullError
+)
+from wumeng_crawler.config.config import SPIDER_CONFIG, PROCESSOR_CONFIG
+
+
+class FakeCrawl:
+    """
+    可控的爬取流程，调用release之前一直阻塞
+    """
+
+    def __init__(self, result=None, error=None):
+        self.result = result or {"status": "success", "message": "ok", "records": 3}
+        self.error = error
+        self.started = threading.Event()
+        self._release = threading.Event()
+
+    def release(self):
+        self._release.set()
+
+    def __call__(self, on_progress):
+        self.started.set()
+        on_progress({"records": 1})
+        assert self._release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def jobs():
+    manager = JobManager(max_workers=1, max_pending=2, history_size=3)
+    yield manager
+    manager.shutdown()
+
+
+def _use(monkeypatch, manager, crawl):
+    monkeypatch.setattr(manager, "_job_func", lambda job_type, spider_name: crawl)
+
+
+def _wait(manager, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"任务 {job_id} 没有进入状态 {status}: {manager.get(job_id)}")
+
+
+def test_submit_returns_immediately_and_reports_progress(monkeypatch, jobs):
+    crawl = FakeCrawl()
+    _use(monkeypatch, jobs, crawl)
+
+    job = jobs.submit(JOB_TYPE_SPIDER, "wq")
+    assert job["status"] in (JOB_QUEUED, JOB_RUNNING)
+    assert job["spider_name"] == "wq"
+
+    assert crawl.started.wait(5)
+    running = _wait(jobs, job["id"], JOB_RUNNING)
+    assert running["progress"] == {"records": 1}
+    assert running["started_at"] is not None
+
+    crawl.release()
+    done = _wait(jobs, job["id"], JOB_SUCCEEDED)
+    assert done["records"] == 3
+    assert done["message"] == "ok"
+
+
+def test_queue_full(monkeypatch, jobs):
+    crawl = FakeCrawl()
+    _use(monkeypatch, jobs, crawl)
+
+    first = jobs.submit(JOB_TYPE_ALL_SPIDERS)
+    jobs.submit(JOB_TYPE_ALL_SPIDERS)
+    with pytest.raises(JobQueueFullError):
+        jobs.submit(JOB_TYPE_ALL_SPIDERS)
+
+    crawl.release()
+    _wait(jobs, first["id"], JOB_SUCCEEDED)
+    # 任务结束后可以继续提交
+    assert jobs.submit(JOB_TYPE_ALL_SPIDERS)["id"]
+
+
+def test_failed_crawl(monkeypatch, jobs):
+    crawl = FakeCrawl(error=RuntimeError("boom"))
+    crawl.release()
+    _use(monkeypatch, jobs, crawl)
+    job = _wait(jobs, jobs.submit(JOB_TYPE_SPIDER, "wq")["id"], JOB_FAILED)
+    assert job["message"] == "boom"
+    assert job["finished_at"] is not None
+
+    crawl = FakeCrawl(result={"status": "error", "message": "爬虫不存在"})
+    crawl.release()
+    _use(monkeypatch, jobs, crawl)
+    assert _wait(jobs, jobs.submit(JOB_TYPE_SPIDER, "x")["id"], JOB_FAILED)["message"] == "爬虫不存在"
+
+
+def test_history_keeps_unfinished_jobs(monkeypatch):
+    manager = JobManager(max_workers=1, max_pending=10, history_size=2)
+    crawl = FakeCrawl()
+    _use(monkeypatch, manager, crawl)
+    try:
+        # 未结束的任务即使超过保留数量也不会丢弃
+        submitted = [manager.submit(JOB_TYPE_SPIDER, "wq")["id"] for _ in range(3)]
+        assert all(manager.get(job_id) is not None for job_id in submitted)
+
+        crawl.release()
+        for job_id in submitted:
+            _wait(manager, job_id, JOB_SUCCEEDED)
+
+        # 再次提交时丢弃最早结束的任务
+        latest = manager.submit(JOB_TYPE_SPIDER, "wq")["id"]
+        assert manager.get(submitted[0]) is None
+        assert manager.get(submitted[1]) is None
+        assert manager.get(submitted[2]) is not None
+        assert manager.get(latest) is not None
+        assert manager.get("missing") is None
+    finally:
+        manager.shutdown()
+
+
+def test_shutdown_fails_jobs_that_never_started(monkeypatch):
+    manager = JobManager(max_workers=1, max_pending=10)
+    crawl = FakeCrawl()
+    _use(monkeypatch, manager, crawl)
+
+    running = manager.submit(JOB_TYPE_SPIDER, "wq")["id"]
+    pending = [manager.submit(JOB_TYPE_SPIDER, "wq")["id"] for _ in range(2)]
+    assert crawl.started.wait(5)
+
+    # 第一个任务仍在运行时关闭，后两个任务还没有开始
+    manager.shutdown(wait=False)
+    crawl.release()
+
+    assert _wait(manager, running, JOB_SUCCEEDED)
+    for job_id in pending:
+        job = manager.get(job_id)
+        assert job["status"] == JOB_FAILED
+        assert job["message"]
+        assert job["finished_at"] is not None
+
+
+def test_celery_history_is_bounded(monkeypatch):
+    manager = JobManager(backend="celery", max_pending=1, history_size=5)
+    ids = iter(range(50))
+    monkeypatch.setattr(manager, "_submit_celery", lambda job_type, spider_name: f"celery-{next(ids)}")
+
+    # 排队由broker负责，不受max_pending限制
+    submitted = [manager.submit(JOB_TYPE_SPIDER, "wq")["id"] for _ in range(50)]
+
+    # 按提交顺序只保留最近的记录，本地只记录提交信息，状态从Celery查询
+    assert list(manager._jobs) == submitted[-5:]
+    assert manager._jobs[submitted[-1]] == {
+        "id": submitted[-1],
+        "type": JOB_TYPE_SPIDER,
+        "spider_name": "wq",
+        "backend": "celery",
+        "created_at": manager._jobs[submitted[-1]]["created_at"]
+    }
+
+
+def test_job_runs_spider_end_to_end(monkeypatch, make_spider, jobs):
+    from app import tasks
+    from wumeng_crawler.processors.data_processor import DataProcessor
+    from wumeng_crawler.spiders.spider_manager import SpiderManager
+
+    monkeypatch.setitem(SPIDER_CONFIG, "TARGET_SITES", [])
+    monkeypatch.setitem(PROCESSOR_CONFIG, "SAVE_PROCESSED_FILES", False)
+    monkeypatch.setattr(DataProcessor, "save_to_database", lambda self, data: len(data))
+
+    spider_manager = SpiderManager()
+    spider = make_spider("jobs", lambda request: httpx.Response(200, headers={"Content-Type": "text/html"}, content=b"<title>A</title>"))
+    spider_manager.spiders.append(spider)
+    monkeypatch.setattr(tasks, "get_spider_manager", lambda: spider_manager)
+
+    job = _wait(jobs, jobs.submit(JOB_TYPE_SPIDER, spider.name)["id"], JOB_SUCCEEDED)
+    assert job["records"] == 1
+    assert job["duration"] is not None
+    assert job["progress"]["stage"] == "done"
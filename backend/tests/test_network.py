@@ -0,0 +1,159 @@
+import asyncio
+import concurrent.futures
+import time
+
+import httpx
+import pytest
+
+from wumeng_crawler.network.circuit_breaker import CircuitBreaker
+from wumeng_crawler.network.rate_limiter import TokenBucket, parse_retry_after
+
+
+def _open_breaker(recovery_timeout=60):
+    breaker = CircuitBreaker("a.test", failure_threshold=2, recovery_timeout=recovery_timeout)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_breaker_opens_after_threshold_and_rejects():
+    breaker = _open_breaker()
+    assert not breaker.allow_request()
+    assert breaker.get_status()["retry_in"] > 0
+
+
+def test_breaker_half_open_allows_single_probe():
+    breaker = _open_breaker()
+    breaker.opened_at -= 60
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = _open_breaker()
+    breaker.opened_at -= 60
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_released_probe_allows_new_probe():
+    breaker = _open_breaker()
+    breaker.opened_at -= 60
+    assert breaker.allow_request()
+
+    breaker.release_probe()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_cancelled_probe_does_not_block_host(make_spider):
+    def handler(request):
+        raise asyncio.CancelledError()
+
+    spider = make_spider("probe", handler)
+    breaker = spider.circuit_breakers.breaker(spider.domain)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at -= breaker.recovery_timeout
+
+    with pytest.raises((asyncio.CancelledError, concurrent.futures.CancelledError)):
+        spider.engine.run(spider._request_with_retries("GET", f"http://{spider.domain}/"))
+
+    # 探测请求被取消后，下一个请求可以立即重新探测
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    breaker.record_success()
+
+
+def test_spider_records_host_failures_in_breaker(make_spider):
+    spider = make_spider("down", lambda request: httpx.Response(503))
+    breaker = spider.circuit_breakers.breaker(spider.domain)
+
+    assert spider.engine.run(spider._request_with_retries("GET", f"http://{spider.domain}/")) is None
+    assert breaker.failures >= min(spider.retry_times, breaker.failure_threshold)
+    breaker.record_success()
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+
+
+def test_token_bucket_refunds_cancelled_reservation():
+    async def scenario():
+        bucket = TokenBucket(rate=1, burst=1)
+        await bucket.acquire()
+
+        # 等待中被取消的预约退还令牌，下一个请求不用多等
+        waiting = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert bucket.reserve() == pytest.approx(1, abs=0.1)
+
+    asyncio.run(scenario())
+
+def test_token_bucket_penalize_pauses_and_recovers():
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.penalize(5)
+
+    status = bucket.get_status()
+    assert status["rate"] == 5
+    assert status["paused_seconds"] == pytest.approx(5, abs=0.1)
+    assert bucket.reserve() >= 5
+
+    for _ in range(10):
+        bucket.record_success()
+    assert bucket.rate == 10
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert 25 <= parse_retry_after(future) <= 30
+
+
+def test_rate_limiter_keeps_first_host_config():
+    from wumeng_crawler.network.rate_limiter import RateLimiter
+
+    limiter = RateLimiter()
+    bucket = limiter.configure("a.test", rate=5, burst=3)
+    assert limiter.configure("a.test", rate=50, burst=30) is bucket
+    assert (bucket.rate, bucket.burst) == (5, 3)
+    assert limiter.bucket("b.test").rate == limiter.default_rate
+    assert set(limiter.get_status()) == {"a.test", "b.test"}
+
+
+def test_spider_backs_off_host_after_429(make_spider):
+    responses = [httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, text="ok")]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    spider = make_spider("throttled", handler)
+    response = spider.engine.run(spider._request_with_retries("GET", f"http://{spider.domain}/", conditional=False))
+    assert response.text == "ok"
+    assert len(requests) == 2
+
+    # 被限流后速率减半，成功一次后按比例恢复
+    bucket = spider.rate_limiter.bucket(spider.domain)
+    assert bucket.rate == pytest.approx(bucket.base_rate * 0.6)
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from wumeng_crawler.storage.parquet_store import (
+    PARQUET_EXTRA_COLUMN,
+    PARQUET_OVERFLOW_COLUMN,
+    ParquetRecordWriter,
+    read_parquet_records,
+    records_to_columns
+)
+
+RECORDS = [
+    {
+        "site": "wq",
+        "domain": "wq.test",
+        "url": "http://wq.test/",
+        "title": "首页",
+        "crawl_time": "2026-10-18 08:00:00",
+        "links": [{"text": "a", "href": "/a"}],
+        "tables": [[["名称", None], ["b", "c"]]],
+        "category": "song"
+    },
+    {
+        "site": "wq",
+        "domain": "wq.test",
+        "url": "http://wq.test/x",
+        "title": 404,
+        "crawl_time": "yesterday",
+        "links": [{"text": "a", "href": "/a", "rel": "nofollow"}],
+        "tables": [[[1, 2.5, None]]]
+    }
+]
+
+
+def test_non_conforming_fields_move_to_overflow():
+    columns = records_to_columns(RECORDS)
+
+    assert columns["links"][0] == RECORDS[0]["links"]
+    assert columns["tables"][0] == RECORDS[0]["tables"]
+    assert columns[PARQUET_OVERFLOW_COLUMN][0] is None
+    assert json.loads(columns[PARQUET_EXTRA_COLUMN][0]) == {"category": "song"}
+
+    assert [columns[name][1] for name in ("title", "crawl_time", "links", "tables")] == [None] * 4
+    assert json.loads(columns[PARQUET_OVERFLOW_COLUMN][1]) == {
+        "title": 404,
+        "crawl_time": "yesterday",
+        "links": RECORDS[1]["links"],
+        "tables": RECORDS[1]["tables"]
+    }
+    assert columns[PARQUET_EXTRA_COLUMN][1] is None
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    path = str(tmp_path / "records.parquet")
+    with ParquetRecordWriter(path, row_group_size=1) as writer:
+        writer.write(RECORDS)
+    assert writer.rows == 2
+
+    assert read_parquet_records(path) == RECORDS
+    assert read_parquet_records(path, ["title", "links", "category"]) == [
+        {"title": "首页", "links": RECORDS[0]["links"], "category": "song"},
+        {"title": 404, "links": RECORDS[1]["links"]}
+    ]
@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+import os
+
+import httpx
+import pytest
+
+from wumeng_crawler.parsers.html_parser import extract_fields
+from wumeng_crawler.processors.page_processor import process_page_records
+from wumeng_crawler.processors.process_pool import CpuExecutor, get_cpu_executor
+
+PAGE = '<html><head><title>舞萌</title></head><body><a href="/a">A</a></body></html>'.encode("utf-8")
+
+
+def _current_pid() -> int:
+    return os.getpid()
+
+
+def _exit_in_child() -> str:
+    """
+    在子进程中直接退出，模拟进程池损坏，在主进程中正常返回
+    """
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return "thread"
+
+
+@pytest.fixture
+def pool():
+    executor = CpuExecutor(1)
+    yield executor
+    executor.shutdown()
+
+
+def test_zero_workers_runs_in_thread():
+    executor = CpuExecutor(0)
+    assert asyncio.run(executor.run(_current_pid)) == os.getpid()
+    assert asyncio.run(executor.run(extract_fields, PAGE, None, ("title",))) == {"title": "舞萌"}
+
+
+def test_pool_runs_in_child_process(pool):
+    async def run_both():
+        return await asyncio.gather(
+            pool.run(_current_pid),
+            pool.run(extract_fields, PAGE, None, ("title", "links"))
+        )
+
+    pid, fields = asyncio.run(run_both())
+    assert pid != os.getpid()
+    assert fields == extract_fields(PAGE, None, ("title", "links"))
+
+
+def test_broken_pool_falls_back_and_recovers(pool):
+    assert asyncio.run(pool.run(_exit_in_child)) == "thread"
+
+    # 损坏的进程池已丢弃，下次使用时重新创建
+    assert asyncio.run(pool.run(_current_pid)) != os.getpid()
+
+
+def test_process_page_records():
+    records = process_page_records([{
+        "title": "  舞萌 ",
+        "links": [{"text": " A ", "href": "/a"}, {"text": "B", "href": "  "}, {"text": "C", "href": "http://b.test/c"}],
+        "tables": [[["1"]]],
+        "crawl_time": "2024-01-01 00:00:00"
+    }], "s", "s.test")
+
+    assert records == [{
+        "site": "s",
+        "domain": "s.test",
+        "title": "舞萌",
+        "links": [{"text": "A", "href": "http://s.test/a"}, {"text": "C", "href": "http://b.test/c"}],
+        "tables": [[["1"]]],
+        "crawl_time": "2024-01-01 00:00:00"
+    }]
+
+
+def test_large_pages_are_extracted_through_executor(make_spider, monkeypatch):
+    spider = make_spider("pool", lambda request: httpx.Response(200, content=PAGE))
+    calls = []
+    run = spider.cpu_executor.run
+
+    async def counting_run(func, *args, **kwargs):
+        calls.append(func)
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(spider.cpu_executor, "run", counting_run)
+    response = httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=PAGE)
+
+    # 小页面直接解析
+    spider.process_pool_min_bytes = len(PAGE) + 1
+    inline = asyncio.run(spider.async_extract(response, ("title", "links")))
+    assert calls == []
+
+    spider.process_pool_min_bytes = len(PAGE)
+    assert asyncio.run(spider.async_extract(response, ("title", "links"))) == inline
+    assert calls == [extract_fields]
+
+
+def test_get_cpu_executor_is_singleton():
+    assert get_cpu_executor() is get_cpu_executor()
+    # 测试环境配置PROCESS_POOL_WORKERS=0
+    assert get_cpu_executor().max_workers == 0
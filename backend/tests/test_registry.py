@@ -0,0 +1,154 @@
+import httpx
+import pytest
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+from wumeng_crawler.spiders import registry as registry_module
+from wumeng_crawler.spiders.base_spider import BaseSpider
+from wumeng_crawler.spiders.generic_spider import GenericSpider
+from wumeng_crawler.spiders.registry import SpiderRegistry, get_spider_registry, register_spider
+
+
+class CustomSpider(GenericSpider):
+    """
+    测试用的自定义爬虫类型
+    """
+
+
+class FakeEntryPoint:
+    def __init__(self, name, target):
+        self.name = name
+        self.value = f"fake:{name}"
+        self.target = target
+        self.loaded = False
+
+    def load(self):
+        self.loaded = True
+        return self.target
+
+
+def _site(name, **config):
+    return {"name": name, "domain": f"{name}.test", "ip": None, **config}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    替换注册表单例，入口点为空，避免测试之间互相影响
+    """
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [])
+    instance = SpiderRegistry()
+    monkeypatch.setattr(registry_module, "_spider_registry_instance", instance)
+    return instance
+
+
+def test_default_type_is_generic(registry):
+    spider = registry.create(_site("registry0"))
+    assert type(spider) is GenericSpider
+
+
+def test_register_class_or_import_path(registry):
+    registry.register("custom", CustomSpider)
+    assert type(registry.create(_site("registry1", spider="custom"))) is CustomSpider
+
+    # 导入路径在首次使用时加载，之后缓存类对象
+    registry.register("by_path", f"{__name__}:CustomSpider")
+    assert registry.available()["by_path"] == f"{__name__}:CustomSpider"
+    assert registry.get("by_path") is CustomSpider
+    assert registry._spiders["by_path"] is CustomSpider
+
+
+def test_register_spider_decorator(registry):
+    @register_spider("decorated")
+    class DecoratedSpider(GenericSpider):
+        pass
+
+    assert get_spider_registry() is registry
+    assert registry.get("decorated") is DecoratedSpider
+
+
+def test_unknown_or_invalid_type(registry):
+    with pytest.raises(ValueError):
+        registry.get("missing")
+
+    registry.register("invalid", dict)
+    with pytest.raises(ValueError):
+        registry.get("invalid")
+
+
+def test_entry_points_are_loaded_on_demand(monkeypatch, registry):
+    entry_point = FakeEntryPoint("plugin", CustomSpider)
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [entry_point])
+
+    assert registry.available()["plugin"] == "fake:plugin"
+    assert not entry_point.loaded
+
+    assert registry.get("plugin") is CustomSpider
+    assert entry_point.loaded
+
+
+def test_explicit_registration_wins_over_entry_point(monkeypatch, registry):
+    entry_point = FakeEntryPoint("generic", BaseSpider)
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [entry_point])
+    assert registry.get("generic") is GenericSpider
+    assert not entry_point.loaded
+
+
+def test_manager_skips_disabled_and_unknown_types(monkeypatch, registry):
+    from wumeng_crawler.spiders.spider_manager import SpiderManager
+
+    registry.register("custom", CustomSpider)
+    monkeypatch.setitem(SPIDER_CONFIG, "TARGET_SITES", [
+        _site("registry2"),
+        _site("registry3", spider="custom"),
+        _site("registry4", spider="missing"),
+        _site("registry5", enabled=False)
+    ])
+
+    manager = SpiderManager()
+    assert [(spider.name, type(spider)) for spider in manager.spiders] == [
+        ("registry2", GenericSpider),
+        ("registry3", CustomSpider)
+    ]
+
+
+class PagedSite:
+    """
+    首页链接到两个分页和其他页面，每页都有歌曲链接
+    """
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        body = f"<title>{path}</title>"
+        body += f'<a href="/song/{path.strip("/") or "index"}">song</a><a href="/about">about</a>'
+        if path == "/":
+            body += '<a href="/page/2">2</a><a href="/page/3">3</a><a href="http://other.test/page/4">4</a>'
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=body.encode())
+
+
+def test_generic_spider_follows_pagination(make_spider):
+    spider = make_spider("registry6", PagedSite(), crawl={
+        "fields": ["title", "links"],
+        "link_pattern": r"/song/",
+        "pagination": {"pattern": r"/page/\d+$", "max_pages": 3}
+    })
+    records = spider.run()
+    spider.commit_run()
+
+    assert sorted(record["url"] for record in records) == [
+        "http://registry6.test/",
+        "http://registry6.test/page/2",
+        "http://registry6.test/page/3"
+    ]
+    # 记录中只保留匹配link_pattern的链接
+    links = {record["url"]: [link["href"] for link in record["links"]] for record in records}
+    assert links == {
+        "http://registry6.test/": ["http://registry6.test/song/index"],
+        "http://registry6.test/page/2": ["http://registry6.test/song/page/2"],
+        "http://registry6.test/page/3": ["http://registry6.test/song/page/3"]
+    }
+
+
+def test_generic_spider_respects_max_pages(make_spider):
+    spider = make_spider("registry7", PagedSite(), crawl={"pagination": {"pattern": r"/page/\d+$", "max_pages": 2}})
+    assert len(spider.run()) == 2
+    spider.commit_run()
@@ -0,0 +1,163 @@
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+from wumeng_crawler.network import http_engine
+from wumeng_crawler.network.http_engine import HttpEngine
+from wumeng_crawler.network.resolver import PATH_DOMAIN, PATH_IP, Resolver, get_resolver
+
+DNS_ADDRESS = "10.0.0.1"
+SITE_IP = "10.0.0.2"
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """
+    替换事件循环的DNS解析，所有域名解析为DNS_ADDRESS
+
+    Returns:
+        解析过的主机名列表
+    """
+    hosts = []
+
+    async def getaddrinfo(self, host, port, *args, **kwargs):
+        hosts.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (DNS_ADDRESS, port))]
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", getaddrinfo)
+    return hosts
+
+
+@pytest.fixture
+def resolver():
+    resolver = Resolver()
+    resolver.register_site("a.test", SITE_IP)
+    return resolver
+
+
+def _routes(resolver, url):
+    async def collect():
+        return [route async for route in resolver.routes(httpx.URL(url))]
+    return asyncio.run(collect())
+
+
+def test_dns_results_are_cached(resolver, lookups):
+    assert asyncio.run(resolver.resolve("a.test", 80)) == [DNS_ADDRESS]
+    assert asyncio.run(resolver.resolve("a.test", 80)) == [DNS_ADDRESS]
+    assert lookups == ["a.test"]
+
+    # IP地址不需要解析
+    assert asyncio.run(resolver.resolve(SITE_IP, 80)) == [SITE_IP]
+    assert lookups == ["a.test"]
+
+    # DNS线路失败后清除解析缓存
+    resolver.record_failure("a.test", PATH_DOMAIN)
+    asyncio.run(resolver.resolve("a.test", 80))
+    assert lookups == ["a.test", "a.test"]
+
+
+def test_dns_cache_expires(resolver, lookups):
+    resolver.dns_ttl = 0
+    asyncio.run(resolver.resolve("a.test", 80))
+    asyncio.run(resolver.resolve("a.test", 80))
+    assert len(lookups) == 2
+
+
+def test_routes_keep_host_header_and_sni(resolver, lookups):
+    routes = _routes(resolver, "https://a.test:8443/x?y=1")
+    assert [route["path"] for route in routes] == [PATH_DOMAIN, PATH_IP]
+    assert str(routes[0]["url"]) == f"https://{DNS_ADDRESS}:8443/x?y=1"
+    assert str(routes[1]["url"]) == f"https://{SITE_IP}:8443/x?y=1"
+    assert all(route["host_header"] == "a.test:8443" for route in routes)
+    assert all(route["sni_hostname"] == "a.test" for route in routes)
+
+
+def test_failed_path_moves_to_back_during_cooldown(resolver, lookups):
+    resolver.record_failure("a.test", PATH_DOMAIN)
+    assert [route["path"] for route in _routes(resolver, "http://a.test/")] == [PATH_IP, PATH_DOMAIN]
+
+    resolver.failure_cooldown = 0
+    assert [route["path"] for route in _routes(resolver, "http://a.test/")] == [PATH_DOMAIN, PATH_IP]
+
+
+def test_faster_path_is_tried_first(resolver, lookups):
+    resolver.record_success("a.test", PATH_DOMAIN, 0.5)
+    resolver.record_success("a.test", PATH_IP, 0.1)
+    assert [route["path"] for route in _routes(resolver, "http://a.test/")] == [PATH_IP, PATH_DOMAIN]
+    assert resolver.get_path_status("a.test")[PATH_IP] == {"latency": 0.1, "successes": 1, "failures": 0}
+
+
+def test_domain_is_resolved_only_when_tried(resolver, lookups):
+    resolver.record_failure("a.test", PATH_DOMAIN)
+
+    async def first_route():
+        async for route in resolver.routes(httpx.URL("http://a.test/")):
+            return route
+
+    assert asyncio.run(first_route())["path"] == PATH_IP
+    assert lookups == []
+
+
+def test_failover_disabled_uses_domain_only(resolver, lookups):
+    resolver.failover_enabled = False
+    assert [route["path"] for route in _routes(resolver, "http://a.test/")] == [PATH_DOMAIN]
+
+
+def test_dns_failure_falls_back_to_ip(resolver, monkeypatch):
+    async def getaddrinfo(self, host, port, *args, **kwargs):
+        raise socket.gaierror("lookup failed")
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", getaddrinfo)
+    assert [route["path"] for route in _routes(resolver, "http://a.test/")] == [PATH_IP]
+    assert resolver.get_path_status("a.test")[PATH_DOMAIN]["failures"] == 1
+
+
+@pytest.fixture
+def engine(monkeypatch, resolver):
+    monkeypatch.setattr(http_engine, "get_resolver", lambda: resolver)
+    engine = HttpEngine()
+    yield engine
+    engine.close()
+
+
+def test_engine_fails_over_to_configured_ip(engine, resolver, lookups):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.host == DNS_ADDRESS:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, text="ok")
+
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    response = engine.run(engine.request("GET", "http://a.test/page", params={"q": "1"}))
+
+    assert response.text == "ok"
+    assert [request.url.host for request in requests] == [DNS_ADDRESS, SITE_IP]
+    assert all(request.headers["Host"] == "a.test" for request in requests)
+    assert requests[-1].url.params["q"] == "1"
+
+    status = resolver.get_path_status("a.test")
+    assert status[PATH_DOMAIN]["failures"] == 1
+    assert status[PATH_IP]["successes"] == 1
+
+
+def test_engine_raises_when_all_paths_fail(engine, lookups):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.ConnectTimeout):
+        engine.run(engine.request("GET", "http://a.test/"))
+
+
+def test_unregistered_host_is_sent_directly(engine, lookups):
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=request.url.host)))
+    assert engine.run(engine.request("GET", "http://b.test/")).text == "b.test"
+    assert lookups == []
+
+
+def test_get_resolver_is_singleton():
+    assert get_resolver() is get_resolver()
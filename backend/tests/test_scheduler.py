@@ -0,0 +1,138 @@
+import pytest
+
+from app.core import scheduler
+from app.core.config import settings
+from wumeng_crawler.config.config import SCHEDULER_CONFIG
+
+
+class FakeRedis:
+    """
+    只实现非阻塞锁的Redis客户端
+    """
+
+    def __init__(self):
+        self.held = set()
+
+    def lock(self, name, timeout=None, blocking=True):
+        client = self
+
+        class Lock:
+            def acquire(self):
+                if name in client.held:
+                    return False
+                client.held.add(name)
+                return True
+
+            def release(self):
+                client.held.discard(name)
+
+        return Lock()
+
+
+def test_beat_schedule_uses_jittered_task(monkeypatch):
+    from app.core.celery import build_beat_schedule
+
+    monkeypatch.setattr(settings, "scheduler_backend", "celery")
+    monkeypatch.setattr(settings, "spider_schedule", {
+        "wq_spider": {"cron": "*/5 * * * *"},
+        "ai": {"cron": "0 * * * *"},
+        "off_spider": {"cron": "0 * * * *", "enabled": False}
+    })
+
+    schedule = build_beat_schedule()
+    assert set(schedule) == {"run_wq_spider", "run_ai"}
+    assert schedule["run_wq_spider"]["task"] == "app.tasks.schedule_spider"
+    assert schedule["run_wq_spider"]["args"] == ("wq",)
+    assert schedule["run_ai"]["args"] == ("ai",)
+
+    monkeypatch.setattr(settings, "scheduler_backend", "local")
+    assert build_beat_schedule() == {}
+
+
+def test_scheduled_run_lock_prevents_overlap_and_caps_concurrency(monkeypatch):
+    monkeypatch.setitem(SCHEDULER_CONFIG, "CONCURRENT_TASKS", 2)
+    client = FakeRedis()
+
+    wq = scheduler.acquire_scheduled_run("wq", client)
+    assert wq is not None
+    # 同一个爬虫不重叠运行
+    assert scheduler.acquire_scheduled_run("wq", client) is None
+
+    ai = scheduler.acquire_scheduled_run("ai", client)
+    with pytest.raises(scheduler.SchedulerBusyError):
+        scheduler.acquire_scheduled_run("wi", client)
+    # 没有空闲名额时不占用爬虫锁
+    assert not any(name.endswith(":wi") for name in client.held)
+
+    scheduler.release_scheduled_run(wq)
+    assert scheduler.acquire_scheduled_run("wi", client) is not None
+    scheduler.release_scheduled_run(ai)
+
+
+def test_schedule_spider_delays_run_by_jitter(monkeypatch):
+    from app import tasks
+
+    calls = []
+    monkeypatch.setitem(SCHEDULER_CONFIG, "SCHEDULE_JITTER", 7)
+    monkeypatch.setattr(tasks.run_scheduled_spider, "apply_async", lambda **kwargs: calls.append(kwargs))
+
+    tasks.schedule_spider("wq")
+    assert calls[0]["args"] == ("wq",)
+    assert 0 <= calls[0]["countdown"] <= 7
+
+
+def test_run_scheduled_spider_skips_running_spider(monkeypatch):
+    from app import tasks
+
+    client = FakeRedis()
+    monkeypatch.setattr(scheduler, "_redis_client", lambda: client)
+    monkeypatch.setattr(tasks, "crawl_spider", lambda spider_name, on_progress=None: {"status": "success", "held": set(client.held)})
+
+    result = tasks.run_scheduled_spider("wq")
+    assert result["status"] == "success"
+    assert len(result["held"]) == 2
+    assert client.held == set()
+
+    scheduler.acquire_scheduled_run("wq", client)
+    assert tasks.run_scheduled_spider("wq")["status"] == "skipped"
+
+
+
+def test_local_scheduler_runs_crawl_without_celery_task(monkeypatch):
+    from app import tasks
+
+    calls = []
+    monkeypatch.setattr(tasks, "crawl_spider", lambda spider_name, on_progress=None: calls.append(spider_name) or {"status": "success"})
+    monkeypatch.setattr(tasks.run_spider, "run", lambda *args, **kwargs: pytest.fail("不应调用Celery任务"))
+
+    scheduler._run_scheduled_spider("wq")
+    assert calls == ["wq"]
+
+    # 运行异常时抛出异常，由调度器记录失败
+    monkeypatch.setattr(tasks, "crawl_spider", lambda spider_name, on_progress=None: {"status": "error", "message": "boom"})
+    with pytest.raises(RuntimeError, match="boom"):
+        scheduler._run_scheduled_spider("wq")
+
+def test_only_one_process_runs_local_scheduler(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_backend", "local")
+    monkeypatch.setattr(settings, "spider_schedule", {"wq_spider": {"cron": "0 0 1 1 *"}})
+
+    # 模拟另一个worker进程已持有调度器锁
+    other = scheduler._acquire_file_lock(SCHEDULER_CONFIG["LOCK_PATH"])
+    assert other is not None
+    try:
+        scheduler.start_scheduler()
+        assert scheduler._scheduler_instance is None
+    finally:
+        scheduler._release_file_lock(other)
+
+    scheduler.start_scheduler()
+    try:
+        assert scheduler._scheduler_instance is not None
+        assert scheduler._acquire_file_lock(SCHEDULER_CONFIG["LOCK_PATH"]) is None
+    finally:
+        scheduler.stop_scheduler()
+
+    lock_file = scheduler._acquire_file_lock(SCHEDULER_CONFIG["LOCK_PATH"])
+    assert lock_file is not None
+    scheduler._release_file_lock(lock_file)
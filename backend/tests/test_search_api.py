@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+# app.api导入球员接口时需要maimai_py
+pytest.importorskip("maimai_py")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import search
+from wumeng_crawler.storage.search_index import SearchIndex
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    data_dir = tmp_path / "data"
+    (data_dir / "wq").mkdir(parents=True)
+    for i in range(3):
+        (data_dir / "wq" / f"{i}.json").write_text(
+            json.dumps([{"spider_name": "wq", "type": "song", "title": f"舞萌 {i}"}], ensure_ascii=False),
+            encoding="utf-8"
+        )
+
+    index = SearchIndex(str(data_dir), str(tmp_path / "index" / "search_index.db"))
+    monkeypatch.setattr(search, "DATA_STORAGE_PATH", str(data_dir))
+    monkeypatch.setattr(search, "get_search_index", lambda: index)
+
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/search")
+    yield TestClient(app)
+    index.close()
+
+
+def test_cursor_pagination(client):
+    first = client.get("/api/search/", params={"keyword": "舞萌", "limit": 2}).json()
+    # 只校验到当前页之后的一条记录，总数未知
+    assert first["total"] is None
+    assert first["count"] == 2
+
+    second = client.get("/api/search/", params={"keyword": "舞萌", "limit": 2, "cursor": first["next_cursor"]}).json()
+    assert second["count"] == 1
+    assert second["next_cursor"] is None
+    titles = [result["data"]["title"] for result in first["results"] + second["results"]]
+    assert sorted(titles) == ["舞萌 0", "舞萌 1", "舞萌 2"]
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/search/", params={"cursor": "bad"}).status_code == 400
+
+
+def test_ndjson_stream_returns_every_match(client):
+    response = client.get("/api/search/", params={"keyword": "舞萌", "stream": True})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+    assert all("cursor" in line for line in lines)
@@ -0,0 +1,205 @@
+import itertools
+import json
+import os
+
+import pytest
+
+from wumeng_crawler.storage import search_index
+from wumeng_crawler.storage.search_index import SearchIndex, _record_text, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def index(tmp_path, data_dir):
+    index = SearchIndex(str(data_dir), str(tmp_path / "index" / "search_index.db"))
+    yield index
+    index.close()
+
+
+def _write(data_dir, source, name, records, mtime):
+    directory = data_dir / source
+    directory.mkdir(exist_ok=True)
+    path = directory / name
+    path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def _seed(data_dir):
+    _write(data_dir, "wq", "1.json", [
+        {"spider_name": "wq", "type": "song", "title": "舞萌DX"},
+        {"spider_name": "wq", "type": "player", "name": "alice"}
+    ], 1000)
+    _write(data_dir, "ai", "2.json", [
+        {"spider_name": "ai", "type": "song", "title": "舞萌 2026"},
+        {"spider_name": "ai", "type": "song", "title": "other"}
+    ], 2000)
+
+
+def _brute_force(data_dir, keyword):
+    matches = []
+    for root, _, files in os.walk(data_dir):
+        for name in files:
+            with open(os.path.join(root, name), encoding="utf-8") as f:
+                matches.extend(item for item in json.load(f) if keyword in _record_text(item))
+    return matches
+
+
+@pytest.mark.parametrize("keyword", ["舞萌", "舞", "alice", "DX", "song", "missing"])
+def test_keyword_search_matches_substring_scan(index, data_dir, keyword):
+    _seed(data_dir)
+    total, page, has_more = index.search(keyword, limit=100)
+
+    expected = _brute_force(data_dir, keyword)
+    assert total == len(expected)
+    assert not has_more
+    assert sorted(map(_record_text, (result["data"] for result in page))) == sorted(map(_record_text, expected))
+
+
+def test_results_are_newest_first_and_filtered_by_facets(index, data_dir):
+    _seed(data_dir)
+
+    total, page, _ = index.search("舞萌")
+    assert total == 2
+    assert [result["data"]["spider_name"] for result in page] == ["ai", "wq"]
+
+    assert index.search("舞萌", spider_name="wq")[0] == 1
+    assert index.search(data_type="song")[0] == 3
+    assert index.search(spider_name="ai", data_type="player")[0] == 0
+
+
+def test_pagination_with_offset_and_limit(index, data_dir):
+    _seed(data_dir)
+    total, first, has_more = index.search(limit=3)
+    _, second, last_has_more = index.search(offset=3, limit=3)
+    assert total == 4
+    assert has_more and not last_has_more
+    assert len(first) == 3
+    assert len(second) == 1
+    assert second[0]["data"] not in [result["data"] for result in first]
+
+
+
+def test_keyword_search_stops_after_current_page(monkeypatch, index, data_dir):
+    for i in range(10):
+        _write(data_dir, "wq", f"{i}.json", [{"spider_name": "wq", "type": "song", "title": f"舞萌 {i}"}], 1000 + i)
+    index.sync()
+
+    loaded = []
+    load_file = index._load_file
+    monkeypatch.setattr(index, "_load_file", lambda file_path: loaded.append(file_path) or load_file(file_path))
+
+    # 只读取当前页和下一页的第一条记录，总数未知
+    total, page, has_more = index.search("舞萌", limit=2)
+    assert (total, len(page), has_more) == (None, 2, True)
+    assert len(loaded) == 3
+
+    # 读到最后一条记录后缓存总数，之后的查询直接返回
+    total, page, has_more = index.search("舞萌", offset=8, limit=2)
+    assert (total, len(page), has_more) == (10, 2, False)
+    assert index.search("舞萌", limit=2)[0] == 10
+    assert index.search("舞萌", spider_name="ai", limit=2)[0] == 0
+
+    # 索引修改后缓存失效
+    index.add_file(_write(data_dir, "wq", "10.json", [{"spider_name": "wq", "type": "song", "title": "舞萌 10"}], 2000))
+    assert index.search("舞萌", limit=2)[0] is None
+    assert index.search("舞萌", limit=20)[0] == 11
+
+def test_sync_picks_up_added_changed_and_removed_files(index, data_dir):
+    _seed(data_dir)
+    assert index.search("舞萌")[0] == 2
+
+    changed = _write(data_dir, "wq", "1.json", [{"spider_name": "wq", "type": "song", "title": "new"}], 3000)
+    _write(data_dir, "wq", "3.json", [{"spider_name": "wq", "type": "song", "title": "舞萌 new"}], 3000)
+    os.remove(data_dir / "ai" / "2.json")
+
+    assert index.sync() == {"added": 2, "removed": 1}
+    assert [result["file_path"] for result in index.search("new", limit=10)[1]] == sorted([changed, str(data_dir / "wq" / "3.json")])
+    assert index.search("舞萌")[0] == 1
+
+
+def test_add_file_indexes_without_full_sync(index, data_dir):
+    index.sync()
+    path = _write(data_dir, "wq", "4.json", [{"spider_name": "wq", "type": "song", "title": "fresh"}], 4000)
+
+    assert index.add_file(path) == 1
+    assert index.search("fresh")[0] == 1
+
+
+def test_stats_follow_indexed_files(index, data_dir):
+    _seed(data_dir)
+    stats = index.get_stats()
+    assert stats["total_files"] == 2
+    assert stats["total_records"] == 4
+    assert stats["spider_stats"] == {"wq": 2, "ai": 2}
+    assert stats["data_type_stats"] == {"song": 3, "player": 1}
+    assert stats["source_stats"] == {"wq": 2, "ai": 2}
+
+    # 文件替换和删除后统计同步扣减
+    _write(data_dir, "wq", "1.json", [{"spider_name": "wq", "type": "song", "title": "x"}], 3000)
+    os.remove(data_dir / "ai" / "2.json")
+    index.sync()
+    stats = index.get_stats()
+    assert stats["total_files"] == 1
+    assert stats["total_records"] == 1
+    assert stats["spider_stats"] == {"wq": 1}
+    assert stats["data_type_stats"] == {"song": 1}
+
+
+def test_latest_returns_newest_records_first(index, data_dir):
+    _seed(data_dir)
+    _write(data_dir, "wq", "3.json", [{"spider_name": "wq", "type": "song", "title": "newest"}], 3000)
+
+    latest = index.latest(limit=3)
+    assert [result["data"].get("title") for result in latest] == ["newest", "舞萌 2026", "other"]
+    assert [result["timestamp"] for result in latest] == [3000, 2000, 2000]
+
+    assert [result["data"]["spider_name"] for result in index.latest(spider_name="wq", limit=10)] == ["wq", "wq", "wq"]
+    assert index.latest(limit=0) == []
+
+
+def _page_through(index, keyword=None, page_size=1):
+    results = []
+    cursor = None
+    while True:
+        page = list(itertools.islice(index.iter_matches(keyword, cursor=cursor), page_size))
+        results.extend(page)
+        if len(page) < page_size:
+            return results
+        cursor = page[-1]["cursor"]
+
+
+@pytest.mark.parametrize("batch_size", [1, 500])
+def test_cursor_pages_cover_all_results_once(monkeypatch, index, data_dir, batch_size):
+    monkeypatch.setattr(search_index, "MATCH_BATCH_SIZE", batch_size)
+    _seed(data_dir)
+
+    expected = [result["data"] for result in index.search(limit=100)[1]]
+    assert [result["data"] for result in _page_through(index)] == expected
+    assert [result["data"] for result in _page_through(index, "舞萌", page_size=2)] == [
+        result["data"] for result in index.search("舞萌")[1]
+    ]
+
+
+def test_cursor_is_stable_when_newer_files_arrive(index, data_dir):
+    _seed(data_dir)
+    first = next(index.iter_matches())
+
+    # 游标之后只包含更早的记录，新文件不会让已返回的记录重复出现
+    _write(data_dir, "wq", "3.json", [{"spider_name": "wq", "type": "song", "title": "newest"}], 3000)
+    index.sync()
+    rest = list(index.iter_matches(cursor=first["cursor"]))
+    assert len(rest) == 3
+    assert first["data"] not in [result["data"] for result in rest]
+
+
+def test_cursor_round_trip_and_invalid_cursor(index):
+    assert decode_cursor(encode_cursor(1.5, "/data/舞萌.json", 3)) == (1.5, "/data/舞萌.json", 3)
+    with pytest.raises(ValueError):
+        list(index.iter_matches(cursor="not-a-cursor"))
@@ -0,0 +1,139 @@
+import httpx
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from wumeng_crawler.config.config import SPIDER_CONFIG, PROCESSOR_CONFIG
+
+
+class VersionedSite:
+    """
+    返回固定内容并支持ETag条件请求的站点
+    """
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"ETag": self.etag, "Content-Type": "text/html; charset=utf-8"},
+            content=b"<html><head><title>A</title></head></html>"
+        )
+
+
+@pytest.fixture
+def manager(monkeypatch, make_spider):
+    """
+    只包含一个测试爬虫的爬虫管理器，任务函数使用该管理器，数据处理不写文件
+    """
+    from app import tasks
+    from wumeng_crawler.spiders.spider_manager import SpiderManager
+
+    monkeypatch.setitem(SPIDER_CONFIG, "TARGET_SITES", [])
+    monkeypatch.setitem(PROCESSOR_CONFIG, "SAVE_PROCESSED_FILES", False)
+
+    site = VersionedSite()
+    spider_manager = SpiderManager()
+    spider_manager.spiders.append(make_spider(f"commit{id(site)}", site))
+    monkeypatch.setattr(tasks, "get_spider_manager", lambda: spider_manager)
+    return spider_manager, site
+
+
+def _fail_ingest(monkeypatch):
+    from wumeng_crawler.processors.data_processor import DataProcessor
+
+    def save_to_database(self, data):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(DataProcessor, "save_to_database", save_to_database)
+
+
+def _ok_ingest(monkeypatch):
+    from wumeng_crawler.processors.data_processor import DataProcessor
+
+    monkeypatch.setattr(DataProcessor, "save_to_database", lambda self, data: len(data))
+
+
+def test_failed_ingest_refetches_on_next_run(monkeypatch, manager):
+    from app.tasks import crawl_spider
+
+    spider_manager, site = manager
+    spider = spider_manager[0]
+
+    _fail_ingest(monkeypatch)
+    result = crawl_spider(spider.name)
+    assert result["status"] == "error"
+    assert spider.last_run["committed"] is False
+
+    # 记录没有保存，下次运行不能发送条件请求
+    _ok_ingest(monkeypatch)
+    result = crawl_spider(spider.name)
+    assert "If-None-Match" not in site.requests[-1].headers
+    assert result["status"] == "success"
+    assert result["records"] == 1
+    assert spider.last_run["committed"] is True
+
+    # 保存成功后页面未变化
+    result = crawl_spider(spider.name)
+    assert site.requests[-1].headers.get("If-None-Match") == site.etag
+    assert result["records"] == 0
+
+
+def test_uncommitted_run_is_discarded_by_next_run(manager):
+    spider_manager, site = manager
+    spider = spider_manager[0]
+
+    assert len(spider.run()) == 1
+    # 调用方没有提交，下次运行重新抓取
+    assert len(spider.run()) == 1
+    assert "If-None-Match" not in site.requests[-1].headers
+
+    assert spider.commit_run() is True
+    assert spider.commit_run() is False
+    assert spider.run() == []
+
+
+def test_stream_discards_batch_when_consumer_fails(monkeypatch, manager):
+    from app.tasks import crawl_all_spiders
+
+    spider_manager, site = manager
+    spider = spider_manager[0]
+
+    _fail_ingest(monkeypatch)
+    result = crawl_all_spiders()
+    assert result["status"] == "error"
+    assert spider.last_run["committed"] is False
+
+    _ok_ingest(monkeypatch)
+    result = crawl_all_spiders()
+    assert result["records"] == 1
+    assert spider.last_run["committed"] is True
+    assert crawl_all_spiders()["records"] == 0
+
+
+def test_stream_without_commit_leaves_runs_to_caller(manager):
+    spider_manager, site = manager
+    spider = spider_manager[0]
+
+    batches = list(spider_manager.stream_all_records(commit=False))
+    assert [len(batch) for batch in batches] == [1]
+    assert spider.last_run["committed"] is None
+
+    spider_manager.commit_runs([{"spider_name": spider.name}])
+    assert spider.last_run["committed"] is True
+    assert list(spider_manager.stream_all_records(commit=False)) == []
+
+
+def test_run_all_spiders_returns_envelopes(manager):
+    spider_manager, site = manager
+    spider = spider_manager[0]
+
+    results = spider_manager.run_all_spiders()
+    assert [result["spider_name"] for result in results] == [spider.name]
+    assert len(results[0]["data"]) == 1
+    spider_manager.discard_runs(results)
+    assert spider.last_run["committed"] is False
@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import threading
+
+import httpx
+import pytest
+
+from app.core.spider_control import get_stopped_spiders, set_spiders_stopped, sync_stopped_spiders, watch_stop_flags
+from wumeng_crawler.config.config import SPIDER_CONFIG
+
+_names = itertools.count()
+
+
+class FakeRedis:
+    """
+    只实现停止标记用到的命令
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def mset(self, mapping):
+        self.values.update(mapping)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+def _page(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, headers={"Content-Type": "text/html"}, content=b"<title>A</title>")
+
+
+@pytest.fixture
+def manager(monkeypatch, make_spider):
+    from wumeng_crawler.spiders.spider_manager import SpiderManager
+
+    monkeypatch.setitem(SPIDER_CONFIG, "TARGET_SITES", [])
+    spider_manager = SpiderManager()
+    spider_manager.spiders.extend(make_spider(f"control{next(_names)}", _page) for _ in range(2))
+    return spider_manager
+
+
+def test_flags_are_shared_until_cleared(manager):
+    client = FakeRedis()
+    first, second = manager.spiders
+
+    set_spiders_stopped([first.name], True, client)
+    assert get_stopped_spiders([first.name, second.name], client) == {first.name}
+
+    # 另一个进程中的爬虫按标记停止
+    sync_stopped_spiders(manager, client)
+    assert first.state == "stopped"
+    assert second.state == "idle"
+    assert "error" in manager.run_spider(first.name)
+
+    # 清除标记后重新启动
+    set_spiders_stopped([first.name], False, client)
+    sync_stopped_spiders(manager, client, restart=False)
+    assert first.state == "stopped"
+    sync_stopped_spiders(manager, client)
+    assert first.state == "idle"
+
+
+def test_watcher_cancels_running_spider(manager):
+    client = FakeRedis()
+    spider = manager.spiders[0]
+    in_flight = threading.Event()
+
+    async def request(method, url, headers=None, timeout=None, **kwargs):
+        in_flight.set()
+        await asyncio.sleep(30)
+
+    spider.engine = type("FakeEngine", (), {"request": staticmethod(request), "run": spider.engine.run})()
+
+    result = {}
+    with watch_stop_flags(manager, client, interval=0.05):
+        thread = threading.Thread(target=lambda: result.setdefault("data", manager.run_spider(spider.name)))
+        thread.start()
+        assert in_flight.wait(5)
+
+        # API进程写入停止标记后worker中的运行被取消
+        set_spiders_stopped([spider.name], True, client)
+        thread.join(5)
+
+    assert not thread.is_alive()
+    assert "error" in result["data"]
+    assert spider.last_run["cancelled"] is True
+    assert spider.state == "stopped"
+
+
+def test_watcher_ignores_redis_errors(manager):
+    class BrokenRedis(FakeRedis):
+        def mget(self, keys):
+            raise ConnectionError("redis down")
+
+    with watch_stop_flags(manager, BrokenRedis(), interval=0.01):
+        result = manager.run_spider(manager.spiders[0].name)
+    assert "error" not in result
+    manager.discard_runs([result])
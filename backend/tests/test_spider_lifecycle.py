@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import threading
+
+import httpx
+import pytest
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+
+_names = itertools.count()
+
+
+def _page(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, headers={"Content-Type": "text/html"}, content=f"<title>{request.url.path}</title>".encode())
+
+
+def test_state_transitions(make_spider):
+    observed = {}
+
+    def site(request):
+        observed["state"] = spider.state
+
+        # 运行中再次运行会被拒绝
+        result = []
+        thread = threading.Thread(target=lambda: result.append(asyncio.run(spider.run_async())))
+        thread.start()
+        thread.join(5)
+        observed["nested"] = result
+        return _page(request)
+
+    spider = make_spider(f"lifecycle{next(_names)}", site)
+    assert spider.state == "idle"
+
+    assert len(spider.run()) == 1
+    spider.commit_run()
+    assert observed == {"state": "running", "nested": [None]}
+    assert spider.state == "idle"
+    assert spider.last_run["result"] is True
+    assert spider.last_run["records"] == 1
+    assert spider.last_run["duration"] is not None
+
+    spider.stop()
+    assert spider.state == "stopped"
+    assert spider.run() is None
+
+    spider.start()
+    assert spider.state == "idle"
+    assert spider.run() is not None
+
+
+def test_stop_without_cancel_lets_run_finish(make_spider):
+    def site(request):
+        spider.stop(cancel=False)
+        observed.append(spider.state)
+        return _page(request)
+
+    observed = []
+    spider = make_spider(f"lifecycle{next(_names)}", site)
+    assert len(spider.run()) == 1
+    assert observed == ["stopping"]
+    assert spider.state == "stopped"
+    assert spider.last_run["cancelled"] is False
+
+
+def test_close_is_stop(make_spider):
+    with make_spider(f"lifecycle{next(_names)}", _page) as spider:
+        assert spider.state == "idle"
+    assert spider.state == "stopped"
+
+
+@pytest.fixture
+def manager(monkeypatch, make_spider):
+    from wumeng_crawler.spiders.spider_manager import SpiderManager
+
+    monkeypatch.setitem(SPIDER_CONFIG, "TARGET_SITES", [])
+    spider_manager = SpiderManager()
+    spider_manager.spiders.extend(make_spider(f"lifecycle{next(_names)}", _page) for _ in range(2))
+    return spider_manager
+
+
+def test_manager_start_and_stop_single_spider(manager):
+    first, second = manager.spiders
+
+    assert manager.get_spider(first.name) is first
+    assert manager.get_spider("missing") is None
+    assert manager.stop_spider("missing") is False
+    assert manager.start_spider("missing") is False
+
+    assert manager.stop_spider(first.name) is True
+    assert first.state == "stopped"
+    assert second.state == "idle"
+
+    result = manager.run_spider(first.name)
+    assert result["data"] == [] and "error" in result
+
+    # 已停止的爬虫不参加全部运行
+    results = manager.run_all_spiders()
+    assert [result["spider_name"] for result in results] == [second.name]
+    manager.discard_runs(results)
+
+    assert manager.start_spider(first.name) is True
+    result = manager.run_spider(first.name)
+    assert "error" not in result
+    manager.commit_runs([result])
+
+
+def test_manager_status_reports_state_and_last_run(manager):
+    first, second = manager.spiders
+    manager.commit_runs([manager.run_spider(first.name)])
+    manager.stop_spider(second.name)
+
+    status = {item["name"]: item for item in manager.get_spider_status()}
+    assert status[first.name]["state"] == "idle"
+    assert status[first.name]["last_run"]["records"] == 1
+    assert status[second.name]["state"] == "stopped"
+    assert status[second.name]["last_run"] == {}
+
+
+def test_manager_start_all_after_close_all(manager):
+    manager.close_all_spiders()
+    assert [spider.state for spider in manager.spiders] == ["stopped", "stopped"]
+    assert manager.run_all_spiders() == []
+
+    # 停止状态保持到重新启动
+    manager.start_all_spiders()
+    assert [spider.state for spider in manager.spiders] == ["idle", "idle"]
+    results = manager.run_all_spiders()
+    assert len(results) == 2
+    manager.commit_runs(results)
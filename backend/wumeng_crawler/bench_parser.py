@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML解析基准测试脚本，对比BeautifulSoup完整文档树和lxml快速提取的耗时与内存
+
+用法: python bench_parser.py [HTML文件路径] [重复次数]
+不指定文件时使用生成的测试页面
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from loguru import logger
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from wumeng_crawler.parsers.html_parser import extract_fields
+
+def build_page(link_count: int = 2000) -> bytes:
+    """
+    生成测试页面
+    
+    Args:
+        link_count: 链接数量
+        
+    Returns:
+        页面字节
+    """
+    links = "".join(
+        f'<li><a href="/song/{i}"> 歌曲 <b>{i}</b> </a><span>难度 {i % 15}</span></li>'
+        for i in range(link_count)
+    )
+    return f"<html><head><meta charset=\"utf-8\"><title>舞萌 测试页面</title></head><body><ul>{links}</ul></body></html>".encode("utf-8")
+
+def soup_path(content: bytes) -> dict:
+    """
+    原有解析方式：解码为字符串后构建BeautifulSoup文档树
+    """
+    soup = BeautifulSoup(content.decode("utf-8"), "lxml")
+    return {
+        "title": soup.title.string if soup.title else "",
+        "links": [{"text": a.get_text(strip=True), "href": a["href"]} for a in soup.find_all("a", href=True)]
+    }
+
+def fast_path(content: bytes) -> dict:
+    """
+    lxml快速提取：直接解析字节，只记录需要的字段
+    """
+    return extract_fields(content, None, ("title", "links"))
+
+def measure(func, content: bytes, repeat: int) -> tuple:
+    """
+    测量函数的平均耗时和峰值内存
+    
+    Args:
+        func: 解析函数
+        content: 页面字节
+        repeat: 重复次数
+        
+    Returns:
+        (平均耗时毫秒, 峰值内存KB, 解析结果)
+    """
+    result = func(content)
+    
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return elapsed, peak / 1024, result
+
+def main():
+    """
+    主函数
+    """
+    logger.info("启动HTML解析基准测试")
+    
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            content = f.read()
+    else:
+        content = build_page()
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    
+    logger.info(f"页面大小: {len(content) / 1024:.1f} KB，重复次数: {repeat}")
+    
+    soup_ms, soup_kb, soup_result = measure(soup_path, content, repeat)
+    fast_ms, fast_kb, fast_result = measure(fast_path, content, repeat)
+    
+    logger.info(f"BeautifulSoup: 平均 {soup_ms:.2f} ms，峰值内存 {soup_kb:.0f} KB")
+    logger.info(f"lxml快速提取: 平均 {fast_ms:.2f} ms，峰值内存 {fast_kb:.0f} KB")
+    logger.info(f"速度提升 {soup_ms / fast_ms:.1f} 倍，内存降低 {soup_kb / fast_kb:.1f} 倍")
+    
+    if soup_result["links"] != fast_result["links"] or (soup_result["title"] or "") != fast_result["title"]:
+        logger.error("两种解析方式的结果不一致")
+    else:
+        logger.info(f"两种解析方式结果一致，共 {len(fast_result['links'])} 个链接")
+
+if __name__ == "__main__":
+    main()
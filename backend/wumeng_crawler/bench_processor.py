@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据处理基准测试脚本，对比不同批量下原有pandas去重分组、字典去重分组和新的pandas路径的耗时
+
+用法: python bench_processor.py [重复次数]
+"""
+
+import os
+import sys
+import time
+from loguru import logger
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from wumeng_crawler.processors.data_processor import DataProcessor
+
+# 测试的批量大小
+BATCH_SIZES = (4, 32, 256, 2048, 8192, 32768, 131072)
+
+def build_records(count: int) -> list:
+    """
+    生成测试数据，约十分之一为重复数据，部分数据缺少tables字段
+    
+    Args:
+        count: 数据数量
+        
+    Returns:
+        数据列表
+    """
+    records = []
+    for i in range(count):
+        n = i % max(1, count - count // 10)
+        record = {
+            "site": f"site{n % 4}",
+            "domain": f"site{n % 4}.example.com",
+            "url": f"http://site{n % 4}.example.com/song/{n}",
+            "title": f"歌曲 {n}",
+            "links": [{"text": "详情", "href": f"/song/{n}/detail"}],
+            "crawl_time": "2024-01-01 00:00:00"
+        }
+        if i % 3 == 0:
+            record["tables"] = [[["难度", str(n % 15)]]]
+        records.append(record)
+    return records
+
+def legacy_path(processor: DataProcessor, data: list) -> dict:
+    """
+    原有处理方式：去重和分组都构建DataFrame并转换回字典列表
+    """
+    df = pd.DataFrame(data)
+    df.drop_duplicates(subset=["site", "domain", "title"], keep="last", inplace=True)
+    deduped = df.to_dict(orient="records")
+    
+    df = pd.DataFrame(deduped)
+    return {site: group.to_dict(orient="records") for site, group in df.groupby("site")}
+
+def new_path(processor: DataProcessor, data: list) -> dict:
+    """
+    新的处理方式：按processor.pandas_min_rows选择字典或pandas路径
+    """
+    return processor.integrate_data(processor._remove_duplicates(data))
+
+def measure(func, processor: DataProcessor, data: list, repeat: int) -> tuple:
+    """
+    测量函数的平均耗时
+    
+    Args:
+        func: 处理函数
+        processor: 数据处理器
+        data: 数据列表
+        repeat: 重复次数
+        
+    Returns:
+        (平均耗时毫秒, 处理结果)
+    """
+    result = func(processor, data)
+    
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(processor, data)
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    
+    return elapsed, result
+
+def main():
+    """
+    主函数
+    """
+    logger.info("启动数据处理基准测试")
+    
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    
+    processor = DataProcessor()
+    pandas_min_rows = processor.pandas_min_rows
+    # 基准测试期间不输出每次处理的日志
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    
+    rows = []
+    for size in BATCH_SIZES:
+        data = build_records(size)
+        size_repeat = max(1, repeat * 256 // max(size, 256))
+        
+        legacy_ms, legacy_result = measure(legacy_path, processor, data, size_repeat)
+        
+        processor.pandas_min_rows = float("inf")
+        dict_ms, dict_result = measure(new_path, processor, data, size_repeat)
+        
+        processor.pandas_min_rows = 0
+        pandas_ms, pandas_result = measure(new_path, processor, data, size_repeat)
+        
+        processor.pandas_min_rows = pandas_min_rows
+        
+        # 新的两种路径结果必须一致，且与原有方式的数据条数一致
+        consistent = dict_result == pandas_result and {
+            site: len(items) for site, items in dict_result.items()
+        } == {site: len(items) for site, items in legacy_result.items()}
+        rows.append((size, legacy_ms, dict_ms, pandas_ms, consistent))
+    
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    logger.info(f"当前PANDAS_MIN_ROWS: {pandas_min_rows}")
+    logger.info("批量大小 | 原有pandas(ms) | 字典(ms) | 新pandas路径(ms) | 结果一致")
+    for size, legacy_ms, dict_ms, pandas_ms, consistent in rows:
+        logger.info(f"{size:>8} | {legacy_ms:>14.3f} | {dict_ms:>8.3f} | {pandas_ms:>16.3f} | {consistent}")
+    
+    if not all(row[4] for row in rows):
+        logger.error("字典路径和pandas路径的结果不一致")
+
+if __name__ == "__main__":
+    main()
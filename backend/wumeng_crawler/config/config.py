@@ -36,7 +36,14 @@ REDIS_CONFIG = {
 
 # 爬虫配置
 SPIDER_CONFIG = {
-    # 目标网站配置
+    # 目标网站配置，可选rate_limit项单独配置主机限流，如{"rate": 2.0, "burst": 4}；
+    # spider项为爬虫类型，默认为generic通用爬虫，其他类型通过register_spider或
+    # wumeng_crawler.spiders入口点注册；crawl项为通用爬虫的爬取规则，如
+    # {"start_paths": ["/"], "fields": ["title", "links"], "link_pattern": None,
+    #  "pagination": {"pattern": r"/page/\d+", "max_pages": 10}}；
+    # crawl项中设置frontier后改为持久化的增量爬取，如
+    # {"frontier": {"pattern": r"/song/", "max_depth": 3, "budget": 100, "recrawl_interval": 3600}}
+    # save_files项覆盖SAVE_DATA_FILES，控制该网站是否保存原始数据文件
     "TARGET_SITES": [
         {
             "ip": "129.28.248.89",
@@ -70,15 +77,27 @@ SPIDER_CONFIG = {
     # 并发请求数
     "CONCURRENT_REQUESTS": int(os.getenv("CONCURRENT_REQUESTS", "16")),
     
+    # 单个主机的并发请求数
+    "CONCURRENT_REQUESTS_PER_HOST": int(os.getenv("CONCURRENT_REQUESTS_PER_HOST", "2")),
+    
     # 请求超时（秒）
     "REQUEST_TIMEOUT": int(os.getenv("REQUEST_TIMEOUT", "30")),
     
     # 重试次数
     "RETRY_TIMES": int(os.getenv("RETRY_TIMES", "3")),
     
-    # 重试延迟（秒）
+    # 重试延迟（秒），重试时按指数退避增长
     "RETRY_DELAY": int(os.getenv("RETRY_DELAY", "5")),
     
+    # 最大重试延迟（秒）
+    "RETRY_MAX_DELAY": int(os.getenv("RETRY_MAX_DELAY", "60")),
+    
+    # 熔断阈值，主机连续失败达到该次数后熔断
+    "CIRCUIT_FAILURE_THRESHOLD": int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+    
+    # 熔断恢复时间（秒），熔断后经过该时间发送探测请求
+    "CIRCUIT_RECOVERY_TIMEOUT": int(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "60")),
+    
     # 用户代理池
     "USER_AGENT_POOL": [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -95,11 +114,46 @@ SPIDER_CONFIG = {
     # Robots.txt配置
     "ROBOTSTXT_OBEY": os.getenv("ROBOTSTXT_OBEY", "true").lower() == "true",
     
-    # 下载延迟（秒）
+    # 下载延迟（秒），未单独配置限流的主机按每DOWNLOAD_DELAY秒一个请求限速
     "DOWNLOAD_DELAY": float(os.getenv("DOWNLOAD_DELAY", "1.0")),
     
-    # 随机下载延迟
-    "RANDOMIZE_DOWNLOAD_DELAY": os.getenv("RANDOMIZE_DOWNLOAD_DELAY", "true").lower() == "true"
+    # 单个主机允许的突发请求数
+    "RATE_LIMIT_BURST": int(os.getenv("RATE_LIMIT_BURST", "2")),
+    
+    # HTML解析器，lxml为基于事件回调的快速提取，bs4为BeautifulSoup
+    "HTML_PARSER": os.getenv("HTML_PARSER", "lxml"),
+    
+    # 条件请求，页面未变化时跳过解析、处理和保存
+    "CONDITIONAL_GET": os.getenv("CONDITIONAL_GET", "true").lower() == "true",
+    
+    # 爬虫是否把处理后的数据另存为原始数据文件（并更新搜索索引），记录总是直接交给DataProcessor，
+    # 网站配置的save_files项可以单独覆盖
+    "SAVE_DATA_FILES": os.getenv("SAVE_DATA_FILES", "true").lower() == "true",
+    
+    # DNS解析结果缓存时间（秒）
+    "DNS_CACHE_TTL": int(os.getenv("DNS_CACHE_TTL", "300")),
+    
+    # 域名线路不可用时切换到配置的IP地址
+    "IP_FAILOVER": os.getenv("IP_FAILOVER", "true").lower() == "true",
+    
+    # 线路失败后降低优先级的时间（秒）
+    "PATH_FAILURE_COOLDOWN": int(os.getenv("PATH_FAILURE_COOLDOWN", "30")),
+    
+    # 关闭时等待正在运行的爬虫结束的时间（秒），超时后取消未完成的请求
+    "SHUTDOWN_DRAIN_TIMEOUT": float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "10")),
+    
+    # 增量爬取的最大链接深度，起始页面为0
+    "FRONTIER_MAX_DEPTH": int(os.getenv("FRONTIER_MAX_DEPTH", "3")),
+    
+    # 每次运行最多抓取的页面数
+    "FRONTIER_BUDGET": int(os.getenv("FRONTIER_BUDGET", "100")),
+    
+    # 页面的重抓间隔（秒），页面未变化时间隔加倍，直到最大重抓间隔
+    "FRONTIER_RECRAWL_INTERVAL": int(os.getenv("FRONTIER_RECRAWL_INTERVAL", "3600")),
+    "FRONTIER_MAX_RECRAWL_INTERVAL": int(os.getenv("FRONTIER_MAX_RECRAWL_INTERVAL", "86400")),
+    
+    # 取出的URL未完成抓取时重新到期的时间（秒）
+    "FRONTIER_LEASE_TIMEOUT": int(os.getenv("FRONTIER_LEASE_TIMEOUT", "600"))
 }
 
 # 调度配置
@@ -127,10 +181,37 @@ SCHEDULER_CONFIG = {
     # 并发任务数
     "CONCURRENT_TASKS": int(os.getenv("CONCURRENT_TASKS", "4")),
     
+    # 定时任务触发时间随机推迟的最大秒数，避免多个爬虫在整点同时运行
+    "SCHEDULE_JITTER": int(os.getenv("SCHEDULE_JITTER", "30")),
+    
+    # 定时运行的爬虫锁的过期时间（秒），应大于单个爬虫的最长运行时间
+    "RUN_LOCK_TIMEOUT": int(os.getenv("RUN_LOCK_TIMEOUT", "3600")),
+    
+    # 进程内调度器的文件锁，多个API进程中只有取得该锁的进程运行调度器
+    "LOCK_PATH": os.getenv("SCHEDULER_LOCK_PATH", os.path.join(BASE_DIR, "cache", "scheduler.lock")),
+    
     # 任务队列名称
     "TASK_QUEUE_NAME": os.getenv("TASK_QUEUE_NAME", "wumeng_crawler_tasks")
 }
 
+# 存储配置
+STORAGE_CONFIG = {
+    # 爬虫原始数据目录
+    "DATA_DIR": os.path.join(BASE_DIR, "data"),
+    
+    # 搜索索引目录
+    "INDEX_DIR": os.getenv("INDEX_DIR", os.path.join(BASE_DIR, "index")),
+    
+    # 已解析数据文件缓存预算（字节，按文件大小计算）
+    "FILE_CACHE_MAX_BYTES": int(os.getenv("FILE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    
+    # HTTP条件请求校验信息缓存
+    "HTTP_CACHE_PATH": os.getenv("HTTP_CACHE_PATH", os.path.join(BASE_DIR, "cache", "http_cache.db")),
+    
+    # 增量爬取队列
+    "FRONTIER_PATH": os.getenv("FRONTIER_PATH", os.path.join(BASE_DIR, "cache", "frontier.db"))
+}
+
 # API配置
 API_CONFIG = {
     "host": os.getenv("API_HOST", "0.0.0.0"),
@@ -160,7 +241,34 @@ PROCESSOR_CONFIG = {
         "json_format": True,
         "csv_format": True,
         "database_format": True
-    }
+    },
+    
+    # CPU进程池的进程数，默认为CPU核心数，为0时在线程中解析和处理数据
+    "PROCESS_POOL_WORKERS": int(os.getenv("PROCESS_POOL_WORKERS", str(os.cpu_count() or 1))),
+    
+    # 响应超过该字节数时才交给进程池解析，较小的页面直接解析
+    "PROCESS_POOL_MIN_BYTES": int(os.getenv("PROCESS_POOL_MIN_BYTES", str(32 * 1024))),
+    
+    # 爬虫任务是否把处理后的数据另存为处理结果文件，记录总是保存到数据库
+    "SAVE_PROCESSED_FILES": os.getenv("SAVE_PROCESSED_FILES", "true").lower() == "true",
+    
+    # 流式数据处理每批的数据数量
+    "STREAM_CHUNK_SIZE": int(os.getenv("STREAM_CHUNK_SIZE", "1000")),
+    
+    # 流式数据处理去重键集合的容量，超过时淘汰最久未出现的键
+    "STREAM_DEDUPE_MAX_KEYS": int(os.getenv("STREAM_DEDUPE_MAX_KEYS", "100000")),
+    
+    # 数据量达到该数量时才用pandas去重和分组，较小的批次直接用字典处理，参考bench_processor.py的结果调整
+    "PANDAS_MIN_ROWS": int(os.getenv("PANDAS_MIN_ROWS", "5000")),
+    
+    # 爬虫任务处理结果文件的格式，json为按站点分组的JSON，jsonl为JSON Lines，parquet为列式存储（需要安装pyarrow）
+    "PROCESSED_FILE_FORMAT": os.getenv("PROCESSED_FILE_FORMAT", "json"),
+    
+    # Parquet文件每个行组的数据数量，写入时内存中最多缓冲一个行组
+    "PARQUET_ROW_GROUP_SIZE": int(os.getenv("PARQUET_ROW_GROUP_SIZE", "50000")),
+    
+    # Parquet文件的压缩算法
+    "PARQUET_COMPRESSION": os.getenv("PARQUET_COMPRESSION", "zstd")
 }
 
 # 监控配置
@@ -248,6 +356,7 @@ __all__ = [
     "REDIS_CONFIG",
     "SPIDER_CONFIG",
     "SCHEDULER_CONFIG",
+    "STORAGE_CONFIG",
     "API_CONFIG",
     "PROCESSOR_CONFIG",
     "MONITOR_CONFIG",
@@ -32,34 +32,36 @@ def main():
     # 初始化数据处理器
     data_processor = get_data_processor()
     
+    # 有记录的爬虫，处理结果文件保存后提交它们的运行状态
+    spider_results = []
+    
+    def spider_done(spider_name, result, duration):
+        if isinstance(result, list) and result:
+            spider_results.append({"spider_name": spider_name})
+    
     try:
-        # 运行所有爬虫
+        # 运行所有爬虫，每个爬虫结束后立即清洗其数据并追加到处理结果，不在内存中汇总所有数据
         logger.info("开始运行所有爬虫")
-        all_data = spider_manager.run_all_spiders()
+        stats = data_processor.process_batches(
+            spider_manager.stream_all_records(on_spider_done=spider_done, commit=False),
+            save=True,
+            file_format="json"
+        )
         
-        # 处理数据
-        if all_data:
-            logger.info("开始处理爬取到的数据")
-            
-            # 清洗数据
-            cleaned_data = data_processor.clean_data(all_data)
-            
-            # 整合数据
-            integrated_data = data_processor.integrate_data(cleaned_data)
-            
-            # 格式化数据为JSON
-            formatted_data = data_processor.format_data(integrated_data, format_type="json")
-            
-            # 保存数据
-            file_path = data_processor.save_processed_data(formatted_data, format_type="json")
-            logger.info(f"数据保存成功，保存路径: {file_path}")
+        if stats["file_path"]:
+            logger.info(f"数据保存成功，共 {stats['processed']} 条数据，保存路径: {stats['file_path']}")
         else:
             logger.warning("未爬取到任何数据")
+        
+        # 数据保存成功后提交爬虫的运行状态
+        spider_manager.commit_runs(spider_results)
             
     except KeyboardInterrupt:
         logger.info("用户中断程序")
+        spider_manager.discard_runs(spider_results)
     except Exception as e:
         logger.error(f"程序运行异常: {e}")
+        spider_manager.discard_runs(spider_results)
         import traceback
         traceback.print_exc()
     finally:
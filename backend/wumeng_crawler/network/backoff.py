@@ -0,0 +1,19 @@
+import random
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """
+    计算带去相关抖动的指数退避等待时间
+
+    下一次等待时间在base和上一次等待时间的3倍之间随机取值，并限制在cap以内，
+    多个客户端同时失败时重试时间会分散开，不会集中冲击目标主机。
+
+    Args:
+        previous: 上一次的等待时间（秒），首次重试传入base
+        base: 最短等待时间（秒）
+        cap: 最长等待时间（秒）
+
+    Returns:
+        下一次的等待时间（秒）
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from typing import Optional, Any, Set, Coroutine
+
+from loguru import logger
+
+
+class CrawlCancelled(Exception):
+    """
+    爬虫运行已被取消
+    """
+
+
+class CancelToken:
+    """
+    协作式取消令牌
+
+    爬虫每次运行持有一个令牌，请求在发送前检查令牌，并通过run方法登记正在等待的请求，
+    取消时立即中断这些等待（限流、退避和网络请求），其他爬虫的请求不受影响。
+    可以在任意线程中调用cancel。
+    """
+
+    def __init__(self):
+        """
+        初始化取消令牌
+        """
+        self.reason: Optional[str] = None
+        self._cancelled = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        令牌是否已取消
+        """
+        return self._cancelled
+
+    def cancel(self, reason: str = "已取消") -> None:
+        """
+        取消令牌，并中断登记的所有等待中的请求
+
+        Args:
+            reason: 取消原因
+        """
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            self.reason = reason
+            tasks = list(self._tasks)
+
+        for task in tasks:
+            loop = task.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+        logger.info(f"取消令牌: {reason}，中断 {len(tasks)} 个请求")
+
+    def raise_if_cancelled(self) -> None:
+        """
+        令牌已取消时抛出CrawlCancelled
+
+        Raises:
+            CrawlCancelled: 令牌已取消
+        """
+        if self._cancelled:
+            raise CrawlCancelled(self.reason)
+
+    async def run(self, coro: Coroutine) -> Any:
+        """
+        运行协程，令牌取消时中断协程并抛出CrawlCancelled
+
+        Args:
+            coro: 协程
+
+        Returns:
+            协程的返回值
+
+        Raises:
+            CrawlCancelled: 令牌已取消
+        """
+        with self._lock:
+            if self._cancelled:
+                coro.close()
+                raise CrawlCancelled(self.reason)
+            task = asyncio.ensure_future(coro)
+            self._tasks.add(task)
+
+        try:
+            # asyncio.wait不会把外层任务的取消传给task，据此区分外层取消和令牌取消
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                # 外层任务本身被取消时取消task并继续向上传播
+                task.cancel()
+                raise
+            if task.cancelled() and self._cancelled:
+                raise CrawlCancelled(self.reason)
+            return task.result()
+        finally:
+            with self._lock:
+                self._tasks.discard(task)
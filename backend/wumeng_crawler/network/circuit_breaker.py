@@ -0,0 +1,177 @@
+import threading
+import time
+from typing import Dict, Optional, Any
+
+from loguru import logger
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器
+
+    closed: 正常放行请求，连续失败达到阈值后进入open；
+    open: 直接拒绝请求，经过恢复时间后进入half_open；
+    half_open: 只放行一个探测请求，成功后回到closed，失败后重新进入open。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int, recovery_timeout: float):
+        """
+        初始化熔断器
+
+        Args:
+            host: 主机名
+            failure_threshold: 进入open状态的连续失败次数
+            recovery_timeout: open状态持续的秒数
+        """
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        判断当前是否允许发送请求
+
+        Returns:
+            允许返回True，熔断中返回False
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                logger.info(f"主机 {self.host} 熔断器进入半开状态，发送探测请求")
+
+            # 半开状态只放行一个探测请求，探测请求长时间未返回时允许重新探测
+            if self.probe_started_at is not None and now - self.probe_started_at < self.recovery_timeout:
+                return False
+            self.probe_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        """
+        记录请求成功，主机可用
+        """
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"主机 {self.host} 已恢复，熔断器关闭")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        """
+        记录主机不可用导致的请求失败
+        """
+        with self._lock:
+            self.failures += 1
+            self.probe_started_at = None
+
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                logger.warning(f"主机 {self.host} 连续失败 {self.failures} 次，熔断 {self.recovery_timeout} 秒")
+
+    def release_probe(self) -> None:
+        """
+        请求被取消或因主机可用性以外的原因中断，没有探测结果时释放探测名额，
+        下一个请求可以立即重新探测，不用等待探测超时
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_started_at = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取熔断器状态
+
+        Returns:
+            熔断器状态
+        """
+        with self._lock:
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in": round(retry_in, 3)
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    按主机划分的熔断器集合，进程内所有爬虫实例和线程共享
+    """
+
+    def __init__(self):
+        """
+        初始化熔断器集合
+        """
+        self.failure_threshold = SPIDER_CONFIG.get("CIRCUIT_FAILURE_THRESHOLD", 5)
+        self.recovery_timeout = SPIDER_CONFIG.get("CIRCUIT_RECOVERY_TIMEOUT", 60)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """
+        获取主机的熔断器
+
+        Args:
+            host: 主机名
+
+        Returns:
+            主机的熔断器
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, self.failure_threshold, self.recovery_timeout)
+                self._breakers[host] = breaker
+            return breaker
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取所有主机的熔断器状态
+
+        Returns:
+            主机名到熔断器状态的映射
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.get_status() for host, breaker in breakers.items()}
+
+# 单例模式
+_circuit_breakers_instance = None
+_circuit_breakers_lock = threading.Lock()
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """
+    获取熔断器集合实例
+
+    Returns:
+        熔断器集合实例
+    """
+    global _circuit_breakers_instance
+    if _circuit_breakers_instance is None:
+        with _circuit_breakers_lock:
+            if _circuit_breakers_instance is None:
+                _circuit_breakers_instance = CircuitBreakerRegistry()
+    return _circuit_breakers_instance
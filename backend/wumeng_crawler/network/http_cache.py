@@ -0,0 +1,154 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Any, Iterable, Tuple
+
+from loguru import logger
+
+from wumeng_crawler.config.config import STORAGE_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def body_hash(content: bytes) -> str:
+    """
+    计算响应体的哈希值
+
+    Args:
+        content: 响应体
+
+    Returns:
+        响应体的SHA-256十六进制摘要
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class ValidatorCache:
+    """
+    持久化的HTTP缓存校验信息，按URL保存ETag、Last-Modified和响应体哈希
+
+    只保存校验信息，不保存响应体，用于发送条件请求和判断页面内容是否变化。
+    """
+
+    def __init__(self, cache_path: str):
+        """
+        初始化校验信息缓存
+
+        Args:
+            cache_path: 缓存数据库文件路径
+        """
+        self.cache_path = cache_path
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        logger.info(f"初始化HTTP校验信息缓存: {cache_path}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        获取URL的校验信息
+
+        Args:
+            url: URL地址
+
+        Returns:
+            校验信息，包含etag、last_modified和body_hash，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash FROM validators WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "body_hash": row[2]
+        }
+
+    def put_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        批量写入校验信息，在同一个事务中提交
+
+        Args:
+            entries: (URL, 校验信息)的可迭代对象
+        """
+        now = time.time()
+        rows = [
+            (url, validators.get("etag"), validators.get("last_modified"), validators["body_hash"], now)
+            for url, validators in entries
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO validators (url, etag, last_modified, body_hash, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def put(self, url: str, validators: Dict[str, Any]) -> None:
+        """
+        写入单个URL的校验信息
+
+        Args:
+            url: URL地址
+            validators: 校验信息
+        """
+        self.put_many([(url, validators)])
+
+    def delete(self, url: str) -> None:
+        """
+        删除URL的校验信息，下次请求会完整下载页面
+
+        Args:
+            url: URL地址
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM validators WHERE url = ?", (url,))
+
+    def close(self) -> None:
+        """
+        关闭缓存数据库连接
+        """
+        with self._lock:
+            self._conn.close()
+        logger.info(f"关闭HTTP校验信息缓存: {self.cache_path}")
+
+# 单例模式
+_validator_cache_instance = None
+_validator_cache_lock = threading.Lock()
+
+def get_validator_cache() -> ValidatorCache:
+    """
+    获取HTTP校验信息缓存实例
+
+    Returns:
+        HTTP校验信息缓存实例
+    """
+    global _validator_cache_instance
+    if _validator_cache_instance is None:
+        with _validator_cache_lock:
+            if _validator_cache_instance is None:
+                _validator_cache_instance = ValidatorCache(STORAGE_CONFIG["HTTP_CACHE_PATH"])
+    return _validator_cache_instance
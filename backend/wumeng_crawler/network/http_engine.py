@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Any, Coroutine
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+from wumeng_crawler.network.resolver import Resolver, get_resolver
+
+
+class HttpEngine:
+    """
+    基于asyncio和httpx的共享HTTP引擎
+
+    所有爬虫共享一个后台事件循环和一个连接池，按主机限制并发连接数。
+    同步代码通过run方法提交协程并等待结果，异步代码可以直接await request。
+    """
+
+    def __init__(self):
+        """
+        初始化HTTP引擎
+        """
+        self.timeout = SPIDER_CONFIG.get("REQUEST_TIMEOUT", 30)
+        self.max_connections = SPIDER_CONFIG.get("CONCURRENT_REQUESTS", 16)
+        self.per_host_limit = SPIDER_CONFIG.get("CONCURRENT_REQUESTS_PER_HOST", 2)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+        logger.info(f"初始化HTTP引擎，最大连接数: {self.max_connections}，单主机并发数: {self.per_host_limit}")
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        获取引擎事件循环，首次访问时在后台线程中启动
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="wumeng-http-engine", daemon=True)
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def _in_engine_loop(self) -> bool:
+        """
+        判断当前是否运行在引擎事件循环中
+        """
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def run(self, coro: Coroutine) -> Any:
+        """
+        在引擎事件循环中运行协程并阻塞等待结果，供同步代码使用
+
+        Args:
+            coro: 协程
+
+        Returns:
+            协程的返回值
+        """
+        if self._in_engine_loop():
+            coro.close()
+            raise RuntimeError("不能在HTTP引擎事件循环内同步等待协程，请直接await")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        获取共享的httpx客户端，需在引擎事件循环中调用
+        """
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+
+            mounts = None
+            if SPIDER_CONFIG.get("PROXY_ENABLED"):
+                proxy = httpx.Proxy(SPIDER_CONFIG.get("PROXY_URL"))
+                mounts = {
+                    "http://": httpx.AsyncHTTPTransport(proxy=proxy, limits=limits),
+                    "https://": httpx.AsyncHTTPTransport(proxy=proxy, limits=limits)
+                }
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=limits,
+                mounts=mounts,
+                follow_redirects=True
+            )
+        return self._client
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """
+        获取主机的并发信号量，需在引擎事件循环中调用
+        """
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def _request(self, method: str, url: str, host: Optional[str] = None, **kwargs) -> httpx.Response:
+        """
+        在引擎事件循环中发送请求
+        """
+        host = host or urlsplit(url).hostname or ""
+        async with self._host_semaphore(host):
+            request_url = httpx.URL(url, params=kwargs.pop("params", None))
+            resolver = get_resolver()
+            if not resolver.is_registered(request_url.host):
+                return await self._get_client().request(method, request_url, **kwargs)
+            return await self._request_with_failover(resolver, method, request_url, **kwargs)
+    
+    async def _request_with_failover(self, resolver: Resolver, method: str, url: httpx.URL, **kwargs) -> httpx.Response:
+        """
+        按解析层给出的线路顺序发送请求，连接失败或超时时切换到下一条线路
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        last_error: Optional[Exception] = None
+        
+        async for route in resolver.routes(url):
+            extensions = {"sni_hostname": route["sni_hostname"]} if route["sni_hostname"] else None
+            started = time.monotonic()
+            try:
+                response = await self._get_client().request(
+                    method,
+                    route["url"],
+                    headers={**headers, "Host": route["host_header"]},
+                    extensions=extensions,
+                    **kwargs
+                )
+            except httpx.TransportError as e:
+                logger.warning(f"线路 {route['path']} 请求失败: {url}，错误: {e}，尝试下一条线路")
+                resolver.record_failure(url.host, route["path"])
+                last_error = e
+                continue
+            
+            resolver.record_success(url.host, route["path"], time.monotonic() - started)
+            return response
+        
+        if last_error is not None:
+            raise last_error
+        raise httpx.ConnectError(f"没有可用的线路: {url}")
+
+    async def request(self, method: str, url: str, host: Optional[str] = None, **kwargs) -> httpx.Response:
+        """
+        发送一次HTTP请求，不做重试
+
+        在其他事件循环中调用时，请求会转交给引擎事件循环执行。
+
+        Args:
+            method: 请求方法
+            url: URL地址
+            host: 并发限制使用的主机名，默认取URL中的主机
+            **kwargs: 传递给httpx的请求参数
+
+        Returns:
+            请求响应
+        """
+        if self._in_engine_loop():
+            return await self._request(method, url, host=host, **kwargs)
+
+        future = asyncio.run_coroutine_threadsafe(self._request(method, url, host=host, **kwargs), self.loop)
+        return await asyncio.wrap_future(future)
+
+    async def _aclose(self) -> None:
+        """
+        关闭共享的httpx客户端
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_semaphores.clear()
+
+    def close(self) -> None:
+        """
+        关闭连接池并停止引擎事件循环
+        """
+        with self._lock:
+            loop = self._loop
+            thread = self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None or loop.is_closed():
+            return
+
+        asyncio.run_coroutine_threadsafe(self._aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+        logger.info("关闭HTTP引擎")
+
+# 单例模式
+_http_engine_instance = None
+_http_engine_lock = threading.Lock()
+
+def get_http_engine() -> HttpEngine:
+    """
+    获取HTTP引擎实例
+
+    Returns:
+        HTTP引擎实例
+    """
+    global _http_engine_instance
+    if _http_engine_instance is None:
+        with _http_engine_lock:
+            if _http_engine_instance is None:
+                _http_engine_instance = HttpEngine()
+    return _http_engine_instance
@@ -0,0 +1,256 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any
+
+from loguru import logger
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+
+# 被限流后速率的下限比例
+MIN_RATE_RATIO = 0.1
+
+# 被限流时速率的衰减比例
+PENALTY_RATIO = 0.5
+
+# 每次成功请求后速率的恢复比例
+RECOVERY_RATIO = 0.1
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析Retry-After响应头
+
+    Args:
+        value: 响应头的值，可以是秒数或HTTP日期
+
+    Returns:
+        需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    令牌桶，采用预约方式分配令牌
+
+    令牌不足时调用方预约未来的令牌并等待相应时间，多个调用方按到达顺序排队。
+    被限流（429）时暂停发放令牌并降低速率，之后每次成功请求逐步恢复。
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒发放的令牌数
+            burst: 桶容量，即允许的突发请求数
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """
+        按经过的时间补充令牌，需持有锁
+        """
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self) -> float:
+        """
+        预约一个令牌
+
+        Returns:
+            获得令牌前需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            return max(0.0, self.updated - now) + max(0.0, -self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """
+        获取一个令牌，不阻塞事件循环
+
+        等待期间被取消时退还预约的令牌，避免后续请求多等一个令牌的时间
+        """
+        wait = self.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                with self._lock:
+                    self.tokens = min(self.burst, self.tokens + 1)
+                raise
+
+    def penalize(self, retry_after: float) -> None:
+        """
+        被限流时暂停发放令牌并降低速率
+
+        Args:
+            retry_after: 暂停的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.base_rate * MIN_RATE_RATIO, self.rate * PENALTY_RATIO)
+            self.updated = max(self.updated, now + retry_after)
+            self.tokens = min(self.tokens, 0.0)
+
+    def record_success(self) -> None:
+        """
+        请求成功后逐步恢复速率
+        """
+        with self._lock:
+            if self.rate < self.base_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_RATIO)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取令牌桶状态
+
+        Returns:
+            令牌桶状态
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "base_rate": self.base_rate,
+                "burst": self.burst,
+                "tokens": round(self.tokens, 3),
+                "paused_seconds": round(max(0.0, self.updated - now), 3)
+            }
+
+
+class RateLimiter:
+    """
+    按主机划分的限流器，进程内所有爬虫实例和线程共享
+    """
+
+    def __init__(self):
+        """
+        初始化限流器
+        """
+        download_delay = SPIDER_CONFIG.get("DOWNLOAD_DELAY", 1.0)
+        self.default_rate = 1.0 / download_delay if download_delay > 0 else float(SPIDER_CONFIG.get("CONCURRENT_REQUESTS", 16))
+        self.default_burst = SPIDER_CONFIG.get("RATE_LIMIT_BURST", 2)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: Optional[float] = None, burst: Optional[int] = None) -> TokenBucket:
+        """
+        配置主机的限流参数，已有令牌桶时保持原配置
+
+        Args:
+            host: 主机名
+            rate: 每秒请求数，默认取1/DOWNLOAD_DELAY
+            burst: 允许的突发请求数，默认取RATE_LIMIT_BURST
+
+        Returns:
+            主机的令牌桶
+        """
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(rate or self.default_rate, burst or self.default_burst)
+                self._buckets[host] = bucket
+                logger.info(f"配置主机限流: {host}，速率: {bucket.rate}/秒，突发: {bucket.burst}")
+            return bucket
+
+    def bucket(self, host: str) -> TokenBucket:
+        """
+        获取主机的令牌桶，未配置时使用默认参数
+
+        Args:
+            host: 主机名
+
+        Returns:
+            主机的令牌桶
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self.configure(host)
+        return bucket
+
+    async def acquire(self, host: str) -> None:
+        """
+        获取主机的一个请求令牌
+
+        Args:
+            host: 主机名
+        """
+        await self.bucket(host).acquire()
+
+    def penalize(self, host: str, retry_after: float) -> None:
+        """
+        主机返回限流响应时暂停并降低速率
+
+        Args:
+            host: 主机名
+            retry_after: 暂停的秒数
+        """
+        logger.warning(f"主机 {host} 触发限流，暂停 {retry_after} 秒并降低请求速率")
+        self.bucket(host).penalize(retry_after)
+
+    def record_success(self, host: str) -> None:
+        """
+        记录主机请求成功
+
+        Args:
+            host: 主机名
+        """
+        self.bucket(host).record_success()
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取所有主机的限流状态
+
+        Returns:
+            主机名到令牌桶状态的映射
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.get_status() for host, bucket in buckets.items()}
+
+# 单例模式
+_rate_limiter_instance = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    获取限流器实例
+
+    Returns:
+        限流器实例
+    """
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        with _rate_limiter_lock:
+            if _rate_limiter_instance is None:
+                _rate_limiter_instance = RateLimiter()
+    return _rate_limiter_instance
@@ -0,0 +1,287 @@
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator
+
+import httpx
+from loguru import logger
+
+from wumeng_crawler.config.config import SPIDER_CONFIG
+
+# 线路延迟指数加权移动平均的平滑系数
+LATENCY_EWMA_ALPHA = 0.3
+
+# 通过DNS解析结果连接的线路
+PATH_DOMAIN = "domain"
+
+# 通过配置的IP地址连接的线路
+PATH_IP = "ip"
+
+
+def _is_ip_address(host: str) -> bool:
+    """
+    判断主机名是否为IP地址
+    """
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def _host_of(domain: str) -> str:
+    """
+    从可能带端口的域名中取出主机名
+    """
+    try:
+        return httpx.URL(f"http://{domain}").host
+    except httpx.InvalidURL:
+        return ""
+
+
+class PathStats:
+    """
+    单条线路的延迟和失败统计
+    """
+
+    def __init__(self):
+        """
+        初始化线路统计
+        """
+        self.latency: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.failed_at = 0.0
+
+    def record_success(self, latency: float) -> None:
+        """
+        记录请求成功及其延迟
+        """
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * self.latency
+        self.successes += 1
+        self.failed_at = 0.0
+
+    def record_failure(self) -> None:
+        """
+        记录请求失败
+        """
+        self.failures += 1
+        self.failed_at = time.monotonic()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取线路统计
+        """
+        return {
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+            "successes": self.successes,
+            "failures": self.failures
+        }
+
+
+class Resolver:
+    """
+    目标网站的解析层
+
+    缓存DNS解析结果，并把请求固定到具体IP发送，Host请求头和TLS SNI保持原域名。
+    每个注册的网站有两条线路：DNS解析出的IP和配置中的IP，按延迟的指数加权
+    移动平均排序，失败的线路在冷却时间内排到最后，请求失败时自动切换线路。
+    """
+
+    def __init__(self):
+        """
+        初始化解析层
+        """
+        self.dns_ttl = SPIDER_CONFIG.get("DNS_CACHE_TTL", 300)
+        self.failure_cooldown = SPIDER_CONFIG.get("PATH_FAILURE_COOLDOWN", 30)
+        self.failover_enabled = SPIDER_CONFIG.get("IP_FAILOVER", True)
+
+        # 主机名到配置IP的映射
+        self._sites: Dict[str, Optional[str]] = {}
+        # 主机名到(解析出的IP列表, 过期时间)的映射
+        self._dns_cache: Dict[str, Tuple[List[str], float]] = {}
+        # (主机名, 线路)到线路统计的映射
+        self._paths: Dict[Tuple[str, str], PathStats] = {}
+        self._lock = threading.Lock()
+
+    def register_site(self, domain: str, ip: Optional[str] = None) -> None:
+        """
+        注册目标网站，注册后该域名的请求经过解析层发送
+
+        Args:
+            domain: 域名，可以带端口
+            ip: 配置的IP地址
+        """
+        host = _host_of(domain)
+        if not host:
+            return
+        with self._lock:
+            self._sites[host] = ip
+
+    def is_registered(self, host: str) -> bool:
+        """
+        判断主机是否已注册
+
+        Args:
+            host: 主机名
+
+        Returns:
+            已注册返回True
+        """
+        return host in self._sites
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """
+        解析主机名，结果在DNS_CACHE_TTL秒内复用
+
+        Args:
+            host: 主机名
+            port: 端口
+
+        Returns:
+            IP地址列表
+        """
+        if _is_ip_address(host):
+            return [host]
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._dns_cache.get(host)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+
+        with self._lock:
+            self._dns_cache[host] = (addresses, now + self.dns_ttl)
+        logger.debug(f"解析域名: {host} -> {addresses}")
+        return addresses
+
+    def _path_stats(self, host: str, path: str) -> PathStats:
+        """
+        获取线路统计，需持有锁
+        """
+        stats = self._paths.get((host, path))
+        if stats is None:
+            stats = PathStats()
+            self._paths[(host, path)] = stats
+        return stats
+
+    def _ordered_paths(self, host: str) -> List[str]:
+        """
+        按冷却状态和延迟对网站的线路排序
+        """
+        paths = [PATH_DOMAIN]
+        if self.failover_enabled and self._sites.get(host):
+            paths.append(PATH_IP)
+
+        now = time.monotonic()
+        with self._lock:
+            def sort_key(item: Tuple[int, str]) -> Tuple[bool, float, int]:
+                order, path = item
+                stats = self._path_stats(host, path)
+                cooling = stats.failed_at > 0 and now - stats.failed_at < self.failure_cooldown
+                return cooling, stats.latency or 0.0, order
+
+            return [path for _, path in sorted(enumerate(paths), key=sort_key)]
+
+    async def routes(self, url: httpx.URL) -> AsyncIterator[Dict[str, Any]]:
+        """
+        按优先级逐条生成请求可用的线路，只在需要时解析域名
+
+        Args:
+            url: 请求URL
+
+        Returns:
+            线路迭代器，每条线路包含path、url、host_header和sni_hostname
+        """
+        host = url.host
+        port = url.port or (443 if url.scheme == "https" else 80)
+        host_header = url.netloc.decode("ascii")
+        sni_hostname = host if url.scheme == "https" else None
+
+        for path in self._ordered_paths(host):
+            if path == PATH_DOMAIN:
+                try:
+                    addresses = await self.resolve(host, port)
+                except OSError as e:
+                    logger.warning(f"解析域名失败: {host}，错误: {e}")
+                    self.record_failure(host, path)
+                    continue
+                address = addresses[0]
+            else:
+                address = self._sites[host]
+
+            yield {
+                "path": path,
+                "url": url.copy_with(host=address),
+                "host_header": host_header,
+                "sni_hostname": sni_hostname
+            }
+
+    def record_success(self, host: str, path: str, latency: float) -> None:
+        """
+        记录线路请求成功
+
+        Args:
+            host: 主机名
+            path: 线路名称
+            latency: 请求耗时（秒）
+        """
+        with self._lock:
+            self._path_stats(host, path).record_success(latency)
+
+    def record_failure(self, host: str, path: str) -> None:
+        """
+        记录线路请求失败，DNS线路失败时清除解析缓存
+
+        Args:
+            host: 主机名
+            path: 线路名称
+        """
+        with self._lock:
+            self._path_stats(host, path).record_failure()
+            if path == PATH_DOMAIN:
+                self._dns_cache.pop(host, None)
+
+    def get_path_status(self, domain: str) -> Dict[str, Dict[str, Any]]:
+        """
+        获取网站各线路的延迟和失败统计
+
+        Args:
+            domain: 域名，可以带端口
+
+        Returns:
+            线路名称到线路统计的映射
+        """
+        host = _host_of(domain)
+        with self._lock:
+            return {
+                path: stats.get_status()
+                for (path_host, path), stats in self._paths.items()
+                if path_host == host
+            }
+
+# 单例模式
+_resolver_instance = None
+_resolver_lock = threading.Lock()
+
+def get_resolver() -> Resolver:
+    """
+    获取解析层实例
+
+    Returns:
+        解析层实例
+    """
+    global _resolver_instance
+    if _resolver_instance is None:
+        with _resolver_lock:
+            if _resolver_instance is None:
+                _resolver_instance = Resolver()
+    return _resolver_instance
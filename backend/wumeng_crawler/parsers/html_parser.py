@@ -0,0 +1,263 @@
+import re
+import threading
+from typing import Dict, List, Optional, Any, Sequence, Type
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from loguru import logger
+
+# 解析器支持提取的字段
+SUPPORTED_FIELDS = ("title", "links", "tables")
+
+# 查找meta声明编码时读取的字节数
+_SNIFF_BYTES = 2048
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def _join_text(fragments: List[str]) -> str:
+    """
+    按BeautifulSoup get_text(strip=True)的方式合并文本节点
+    """
+    return "".join(fragment.strip() for fragment in fragments if fragment.strip())
+
+
+def _sniff_encoding(content: bytes) -> str:
+    """
+    从文档开头的meta标签中查找声明的编码，未声明时按UTF-8处理
+    """
+    match = _META_CHARSET.search(content[:_SNIFF_BYTES])
+    if match:
+        return match.group(1).decode("ascii")
+    return "utf-8"
+
+
+class HtmlParser:
+    """
+    HTML字段提取器基类
+
+    子类实现extract方法，从响应字节中提取爬虫声明的字段，返回可序列化的字典：
+    title为页面标题，links为{"text", "href"}列表，tables为表格列表，
+    每个表格是行的列表，每行是单元格文本的列表。
+    """
+
+    name = ""
+
+    def extract(self, content: bytes, encoding: Optional[str], fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        从HTML中提取字段
+
+        Args:
+            content: 响应字节
+            encoding: 响应头声明的编码，为空时由解析器检测
+            fields: 需要提取的字段
+
+        Returns:
+            字段名到提取结果的映射
+        """
+        raise NotImplementedError("子类必须实现extract方法")
+
+
+class _FieldTarget:
+    """
+    lxml解析器的事件接收对象，只记录需要的字段，不构建文档树
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self.want_title = "title" in fields
+        self.want_links = "links" in fields
+        self.want_tables = "tables" in fields
+
+        self.title: Optional[str] = None
+        self.links: List[Dict[str, str]] = []
+        self.tables: List[List[List[str]]] = []
+
+        # 当前文本节点的片段，lxml可能把一个文本节点拆成多次回调
+        self._pending: List[str] = []
+        # 页面标题的文本节点
+        self._title_text: Optional[List[str]] = None
+        self._link_stack: List[Dict[str, Any]] = []
+        # 嵌套表格时每层表格各自记录当前行和单元格
+        self._table_stack: List[Dict[str, Any]] = []
+
+    def _flush(self) -> None:
+        """
+        结束当前文本节点，分发给正在收集文本的元素
+        """
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+
+        if self._title_text is not None:
+            self._title_text.append(text)
+        for link in self._link_stack:
+            link["text"].append(text)
+        for table in self._table_stack:
+            if table["cell"] is not None:
+                table["cell"].append(text)
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self._flush()
+        if tag == "title":
+            if self.want_title and self.title is None and self._title_text is None:
+                self._title_text = []
+        elif tag == "a":
+            if self.want_links and "href" in attrib:
+                self._link_stack.append({"href": attrib["href"], "text": []})
+        elif self.want_tables:
+            if tag == "table":
+                # 按表格在文档中出现的顺序输出
+                table = {"rows": [], "row": None, "cell": None}
+                self.tables.append(table["rows"])
+                self._table_stack.append(table)
+            elif tag == "tr" and self._table_stack:
+                table = self._table_stack[-1]
+                table["row"] = []
+                table["rows"].append(table["row"])
+            elif tag in ("td", "th") and self._table_stack and self._table_stack[-1]["row"] is not None:
+                self._table_stack[-1]["cell"] = []
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        if tag == "title":
+            if self._title_text is not None:
+                self.title = "".join(self._title_text)
+                self._title_text = None
+        elif tag == "a":
+            if self._link_stack:
+                link = self._link_stack.pop()
+                self.links.append({"text": _join_text(link["text"]), "href": link["href"]})
+        elif self.want_tables and self._table_stack:
+            table = self._table_stack[-1]
+            if tag in ("td", "th") and table["cell"] is not None:
+                table["row"].append(_join_text(table["cell"]))
+                table["cell"] = None
+            elif tag == "tr":
+                table["row"] = None
+            elif tag == "table":
+                self._table_stack.pop()
+
+    def data(self, data: str) -> None:
+        self._pending.append(data)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+
+    def close(self) -> Dict[str, Any]:
+        self._flush()
+        result: Dict[str, Any] = {}
+        if self.want_title:
+            result["title"] = self.title or ""
+        if self.want_links:
+            result["links"] = self.links
+        if self.want_tables:
+            result["tables"] = self.tables
+        return result
+
+
+class LxmlParser(HtmlParser):
+    """
+    基于lxml事件回调的快速提取器
+
+    直接把响应字节交给lxml解析，不先解码为字符串，也不构建文档树，
+    只在回调中记录爬虫声明的字段。
+    """
+
+    name = "lxml"
+
+    def extract(self, content: bytes, encoding: Optional[str], fields: Sequence[str]) -> Dict[str, Any]:
+        encoding = encoding or _sniff_encoding(content)
+        try:
+            parser = etree.HTMLParser(target=_FieldTarget(fields), encoding=encoding)
+        except LookupError:
+            # 声明了lxml不认识的编码，按UTF-8解析
+            parser = etree.HTMLParser(target=_FieldTarget(fields), encoding="utf-8")
+        parser.feed(content)
+        return parser.close()
+
+
+class SoupParser(HtmlParser):
+    """
+    基于BeautifulSoup的提取器，构建完整文档树，作为兼容和对照实现
+    """
+
+    name = "bs4"
+
+    def extract(self, content: bytes, encoding: Optional[str], fields: Sequence[str]) -> Dict[str, Any]:
+        soup = BeautifulSoup(content, "lxml", from_encoding=encoding)
+        result: Dict[str, Any] = {}
+
+        if "title" in fields:
+            result["title"] = soup.title.get_text() if soup.title else ""
+
+        if "links" in fields:
+            result["links"] = [
+                {"text": a.get_text(strip=True), "href": a["href"]}
+                for a in soup.find_all("a", href=True)
+            ]
+
+        if "tables" in fields:
+            result["tables"] = [
+                [
+                    [cell.get_text(strip=True) for cell in row.find_all(("td", "th"), recursive=False)]
+                    for row in table.find_all("tr")
+                    if row.find_parent("table") is table
+                ]
+                for table in soup.find_all("table")
+            ]
+
+        return result
+
+_parsers: Dict[str, Type[HtmlParser]] = {
+    LxmlParser.name: LxmlParser,
+    SoupParser.name: SoupParser
+}
+_parsers_lock = threading.Lock()
+
+def register_parser(parser_class: Type[HtmlParser]) -> None:
+    """
+    注册HTML提取器，爬虫通过名称选择
+
+    Args:
+        parser_class: 提取器类，需要设置name属性
+    """
+    with _parsers_lock:
+        _parsers[parser_class.name] = parser_class
+    logger.info(f"注册HTML解析器: {parser_class.name}")
+
+def get_parser(name: str) -> HtmlParser:
+    """
+    获取HTML提取器
+
+    Args:
+        name: 提取器名称
+
+    Returns:
+        提取器实例
+
+    Raises:
+        ValueError: 提取器不存在
+    """
+    parser_class = _parsers.get(name)
+    if parser_class is None:
+        raise ValueError(f"未知的HTML解析器: {name}")
+    return parser_class()
+
+def extract_fields(content: bytes, encoding: Optional[str], fields: Sequence[str], parser: str = LxmlParser.name) -> Dict[str, Any]:
+    """
+    从HTML中提取字段，参数和返回值都可以序列化，可以在子进程中调用
+
+    Args:
+        content: 响应字节
+        encoding: 响应头声明的编码
+        fields: 需要提取的字段
+        parser: 提取器名称
+
+    Returns:
+        字段名到提取结果的映射
+    """
+    unknown = set(fields) - set(SUPPORTED_FIELDS)
+    if unknown:
+        raise ValueError(f"不支持的提取字段: {sorted(unknown)}")
+    return get_parser(parser).extract(content, encoding, fields)
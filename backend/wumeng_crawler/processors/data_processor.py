@@ -1,12 +1,18 @@
 import pandas as pd
 import numpy as np
 from loguru import logger
-from typing import Dict, List, Optional, Any
+from typing import IO, Dict, List, Optional, Any, Iterable, Iterator, Hashable, Callable, Set, Tuple
+from collections import OrderedDict
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+import heapq
 import json
 import os
+import tempfile
 
-from wumeng_crawler.config.config import BASE_DIR
+from wumeng_crawler.config.config import BASE_DIR, PROCESSOR_CONFIG
+from wumeng_crawler.storage.parquet_store import ParquetRecordWriter, read_parquet_records
 
 # 添加项目根目录到Python路径
 import sys
@@ -16,6 +22,245 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from app.core.db_utils import DBUtils
 from app.core.database import SessionLocal
 
+# 去重依据的字段
+DUPLICATE_SUBSET = ("site", "domain", "title")
+
+class _BoundedKeySet:
+    """
+    容量有限的去重键集合，每个键记录最后一次出现的位置，超过容量时淘汰最久未出现的键
+    """
+    
+    def __init__(self, max_keys: int):
+        """
+        初始化去重键集合
+        
+        Args:
+            max_keys: 最多保留的键数量
+        """
+        self.max_keys = max(1, max_keys)
+        self._keys: "OrderedDict[Hashable, None]" = OrderedDict()
+    
+    def add(self, key: Hashable, position: Optional[int] = None) -> bool:
+        """
+        加入去重键
+        
+        Args:
+            key: 去重键
+            position: 本次出现的位置
+        
+        Returns:
+            键是新出现的返回True，已存在返回False
+        """
+        is_new = key not in self._keys
+        self._keys[key] = position
+        self._keys.move_to_end(key)
+        if len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        return is_new
+    
+    def last_position(self, key: Hashable) -> Optional[int]:
+        """
+        获取键最后一次出现的位置
+        
+        Args:
+            key: 去重键
+        
+        Returns:
+            位置，键已被淘汰时返回None
+        """
+        return self._keys.get(key)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+class _JsonLinesWriter:
+    """
+    逐批追加数据的JSON Lines文件写入器，每行一条数据
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        初始化写入器
+        
+        Args:
+            file_path: 文件路径
+        """
+        self._file = open(file_path, "w", encoding="utf-8")
+    
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        追加数据
+        
+        Args:
+            records: 数据项列表
+        """
+        for item in records:
+            self._file.write(json.dumps(item, ensure_ascii=False, default=str))
+            self._file.write("\n")
+    
+    def close(self) -> None:
+        """
+        关闭文件
+        """
+        self._file.close()
+
+class _GroupedJsonWriter:
+    """
+    逐批写入按站点分组的JSON文件，与integrate_data和format_data("json")的结构一致
+    
+    数据需要按站点连续到达，没有site字段的数据归入all分组。
+    """
+    
+    # 数据需要按站点顺序写入
+    grouped = True
+    
+    def __init__(self, file_path: str):
+        """
+        初始化写入器
+        
+        Args:
+            file_path: 文件路径
+        """
+        self._file = open(file_path, "w", encoding="utf-8")
+        self._file.write("{")
+        self._group = None
+        self._first_item = True
+    
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        追加数据
+        
+        Args:
+            records: 数据项列表
+        """
+        for item in records:
+            group = item.get("site", "all")
+            if group != self._group:
+                if self._group is not None:
+                    self._file.write("\n  ],")
+                self._file.write(f"\n  {json.dumps(group, ensure_ascii=False, default=str)}: [")
+                self._group = group
+                self._first_item = True
+            self._file.write("\n    " if self._first_item else ",\n    ")
+            self._file.write(json.dumps(item, ensure_ascii=False, default=str))
+            self._first_item = False
+    
+    def close(self) -> None:
+        """
+        结束JSON对象并关闭文件
+        """
+        if self._group is not None:
+            self._file.write("\n  ]\n")
+        self._file.write("}")
+        self._file.close()
+
+class _RecordSpool:
+    """
+    处理结果文件的临时文件，流式处理时逐批追加数据，处理结束后再写入目标格式的文件
+    
+    每个站点的数据写入单独的临时文件，每行带有数据的原始位置。按站点读取时每个文件只读一遍，
+    按原始顺序读取时按位置归并各文件。内存中只保留去重键和站点名称。
+    写入目标文件时，去重键相同的数据只保留最后出现的一条，
+    与批量处理的_remove_duplicates一致；去重键已被淘汰的数据全部保留。
+    """
+    
+    def __init__(self, seen_keys: _BoundedKeySet, duplicate_key: Callable[[Dict[str, Any]], Hashable]):
+        """
+        初始化临时文件
+        
+        Args:
+            seen_keys: 记录每个去重键最后出现位置的集合
+            duplicate_key: 获取去重键的函数
+        """
+        # 站点名称到临时文件的映射，没有site字段的数据使用None
+        self._files: Dict[Any, IO] = {}
+        self._seen_keys = seen_keys
+        self._duplicate_key = duplicate_key
+        self.rows = 0
+    
+    @property
+    def sites(self) -> set:
+        """
+        已写入数据的站点名称
+        """
+        return {site for site in self._files if site is not None}
+    
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        追加数据，数据的位置已经记录在去重键集合中
+        
+        Args:
+            records: 数据项列表
+        """
+        for item in records:
+            site = item.get("site")
+            file = self._files.get(site)
+            if file is None:
+                file = self._files[site] = tempfile.TemporaryFile("w+", encoding="utf-8")
+            file.write(f"{self.rows}\t{json.dumps(item, ensure_ascii=False, default=str)}\n")
+            self.rows += 1
+    
+    @staticmethod
+    def _read(file: IO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        从头读取临时文件
+        
+        Yields:
+            (原始位置, 数据项)
+        """
+        file.seek(0)
+        for line in file:
+            position, _, payload = line.partition("\t")
+            yield int(position), json.loads(payload)
+    
+    def _kept(self, entries: Iterable[Tuple[int, Dict[str, Any]]], dedupe: bool) -> Iterator[Dict[str, Any]]:
+        """
+        过滤掉去重键在之后再次出现的数据
+        
+        Args:
+            entries: (原始位置, 数据项)的迭代器
+            dedupe: 是否去重，为False时保留全部数据
+        """
+        for position, item in entries:
+            if dedupe:
+                last_position = self._seen_keys.last_position(self._duplicate_key(item))
+                if last_position is not None and last_position != position:
+                    continue
+            yield item
+    
+    def iter_kept(self, grouped: bool = False, dedupe: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        读取保留的数据
+        
+        Args:
+            grouped: 是否按站点名称顺序读取，有站点的数据时没有site字段的数据不读取，与integrate_data一致
+            dedupe: 是否去重，为False时保留全部数据
+        
+        Yields:
+            数据项
+        """
+        sites = self.sites
+        if grouped and sites:
+            for site in sorted(sites):
+                yield from self._kept(self._read(self._files[site]), dedupe)
+            return
+        yield from self._kept(heapq.merge(*(self._read(file) for file in self._files.values()), key=itemgetter(0)), dedupe)
+    
+    def close(self) -> None:
+        """
+        删除临时文件
+        """
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+
+# 流式处理支持的文件格式到写入器的映射
+STREAM_FILE_FORMATS = {
+    "json": _GroupedJsonWriter,
+    "jsonl": _JsonLinesWriter,
+    "parquet": ParquetRecordWriter
+}
+
 class DataProcessor:
     """
     数据处理器，用于清洗、整合和格式化爬取到的数据
@@ -32,6 +277,9 @@ class DataProcessor:
         self.processed_data_dir = os.path.join(BASE_DIR, "processed_data")
         os.makedirs(self.processed_data_dir, exist_ok=True)
         
+        # 数据量达到该数量时才用pandas去重和分组，小批量数据直接用字典处理
+        self.pandas_min_rows = PROCESSOR_CONFIG.get("PANDAS_MIN_ROWS", 5000)
+        
     def clean_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         清洗数据
@@ -44,35 +292,7 @@ class DataProcessor:
         """
         self.logger.info(f"开始清洗数据，共 {len(data)} 条")
         
-        cleaned_data = []
-        
-        for item in data:
-            # 移除空值
-            cleaned_item = {k: v for k, v in item.items() if v is not None}
-            
-            # 去除字符串两端的空格
-            for k, v in cleaned_item.items():
-                if isinstance(v, str):
-                    cleaned_item[k] = v.strip()
-                elif isinstance(v, list):
-                    # 清洗列表中的字符串
-                    cleaned_item[k] = [
-                        (item.strip() if isinstance(item, str) else item)
-                        for item in v
-                    ]
-            
-            # 标准化日期时间格式
-            if "crawl_time" in cleaned_item:
-                try:
-                    if isinstance(cleaned_item["crawl_time"], str):
-                        # 尝试解析日期时间字符串
-                        cleaned_item["crawl_time"] = datetime.strptime(
-                            cleaned_item["crawl_time"], "%Y-%m-%d %H:%M:%S"
-                        )
-                except ValueError as e:
-                    self.logger.warning(f"解析日期时间失败: {e}")
-            
-            cleaned_data.append(cleaned_item)
+        cleaned_data = [self._clean_item(item) for item in data]
         
         # 去重
         cleaned_data = self._remove_duplicates(cleaned_data)
@@ -80,9 +300,49 @@ class DataProcessor:
         self.logger.info(f"数据清洗完成，共清洗 {len(cleaned_data)} 条数据")
         return cleaned_data
     
+    def _clean_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        清洗单条数据
+        
+        Args:
+            item: 爬取到的数据项
+            
+        Returns:
+            清洗后的数据项
+        """
+        # 移除空值
+        cleaned_item = {k: v for k, v in item.items() if v is not None}
+        
+        # 去除字符串两端的空格
+        for k, v in cleaned_item.items():
+            if isinstance(v, str):
+                cleaned_item[k] = v.strip()
+            elif isinstance(v, list):
+                # 清洗列表中的字符串
+                cleaned_item[k] = [
+                    (element.strip() if isinstance(element, str) else element)
+                    for element in v
+                ]
+        
+        # 标准化日期时间格式
+        if "crawl_time" in cleaned_item:
+            try:
+                if isinstance(cleaned_item["crawl_time"], str):
+                    # 尝试解析日期时间字符串
+                    cleaned_item["crawl_time"] = datetime.strptime(
+                        cleaned_item["crawl_time"], "%Y-%m-%d %H:%M:%S"
+                    )
+            except ValueError as e:
+                self.logger.warning(f"解析日期时间失败: {e}")
+        
+        return cleaned_item
+    
     def _remove_duplicates(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        移除重复数据
+        移除重复数据，去重字段相同的数据保留最后一条
+        
+        小批量数据用字典直接去重，数据量达到PANDAS_MIN_ROWS时用pandas计算保留的行。
+        两种方式都返回原始数据项，不经过DataFrame转换，嵌套列表和缺失字段保持原样。
         
         Args:
             data: 数据列表
@@ -93,19 +353,26 @@ class DataProcessor:
         if not data:
             return data
         
-        # 使用pandas去重
-        df = pd.DataFrame(data)
+        # 任意数据包含全部去重字段时才去重，缺少的字段按空值比较
+        if len(self._present_subset_columns(data)) < len(DUPLICATE_SUBSET):
+            return data
         
-        # 选择合适的列作为去重依据
-        # 这里可以根据实际情况调整
-        if "site" in df.columns and "domain" in df.columns and "title" in df.columns:
-            df.drop_duplicates(subset=["site", "domain", "title"], keep="last", inplace=True)
+        if len(data) < self.pandas_min_rows:
+            keys = [tuple(item.get(column) for column in DUPLICATE_SUBSET) for item in data]
+            last_index = {key: index for index, key in enumerate(keys)}
+            return [item for index, (item, key) in enumerate(zip(data, keys)) if last_index[key] == index]
         
-        return df.to_dict(orient="records")
+        # 使用pandas去重，只构建去重字段的列
+        df = pd.DataFrame({column: [item.get(column) for item in data] for column in DUPLICATE_SUBSET})
+        kept = ~df.duplicated(keep="last")
+        return [item for item, keep in zip(data, kept.tolist()) if keep]
     
     def integrate_data(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        整合数据
+        整合数据，按站点分组，站点按名称排序
+        
+        小批量数据用字典直接分组，数据量达到PANDAS_MIN_ROWS时用pandas分组。
+        与pandas的groupby一致，有site字段时缺少site的数据不参与分组。
         
         Args:
             data: 清洗后的数据列表
@@ -115,17 +382,23 @@ class DataProcessor:
         """
         self.logger.info("开始整合数据")
         
-        # 将数据转换为DataFrame
-        df = pd.DataFrame(data)
-        
         # 按站点分组
         grouped_data = {}
         
-        if "site" in df.columns:
-            for site, group in df.groupby("site"):
-                grouped_data[site] = group.to_dict(orient="records")
-        else:
+        if not any("site" in item for item in data):
             grouped_data["all"] = data
+        elif len(data) < self.pandas_min_rows:
+            groups: Dict[Any, List[Dict[str, Any]]] = {}
+            for item in data:
+                site = item.get("site")
+                if site is not None:
+                    groups.setdefault(site, []).append(item)
+            for site in sorted(groups):
+                grouped_data[site] = groups[site]
+        else:
+            sites = pd.DataFrame({"site": [item.get("site") for item in data]})
+            for site, group in sites.groupby("site"):
+                grouped_data[site] = [data[index] for index in group.index]
         
         self.logger.info(f"数据整合完成，共整合 {len(grouped_data)} 个站点的数据")
         return grouped_data
@@ -136,7 +409,7 @@ class DataProcessor:
         
         Args:
             data: 整合后的数据字典
-            format_type: 格式化类型，可选值：json、csv、excel
+            format_type: 格式化类型，可选值：json、csv、excel、parquet
             
         Returns:
             格式化后的数据
@@ -149,6 +422,8 @@ class DataProcessor:
             return self._format_to_csv(data)
         elif format_type == "excel":
             return self._format_to_excel(data)
+        elif format_type == "parquet":
+            return self._format_to_parquet(data)
         else:
             self.logger.error(f"不支持的格式化类型: {format_type}")
             return None
@@ -207,6 +482,26 @@ class DataProcessor:
         buffer.seek(0)
         return buffer.getvalue()
     
+    def _format_to_parquet(self, data: Dict[str, Any]) -> bytes:
+        """
+        格式化为Parquet文件，所有站点的数据写入同一个文件，按site列区分
+        
+        Args:
+            data: 整合后的数据字典
+            
+        Returns:
+            Parquet文件的字节流
+        """
+        import io
+        
+        buffer = io.BytesIO()
+        
+        with ParquetRecordWriter(buffer) as writer:
+            for items in data.values():
+                writer.write(items)
+        
+        return buffer.getvalue()
+    
     def save_processed_data(self, data: Any, format_type: str = "json", filename: Optional[str] = None) -> str:
         """
         保存处理后的数据
@@ -240,6 +535,10 @@ class DataProcessor:
             file_path = os.path.join(self.processed_data_dir, f"{filename}.xlsx")
             with open(file_path, "wb") as f:
                 f.write(data)
+        elif format_type == "parquet":
+            file_path = os.path.join(self.processed_data_dir, f"{filename}.parquet")
+            with open(file_path, "wb") as f:
+                f.write(data)
         else:
             self.logger.error(f"不支持的格式化类型: {format_type}")
             return ""
@@ -247,17 +546,18 @@ class DataProcessor:
         self.logger.info(f"处理后的数据保存成功，保存路径: {file_path}")
         return file_path
     
-    def load_data(self, file_path: str) -> Any:
+    def load_data(self, file_path: str, columns: Optional[List[str]] = None) -> Any:
         """
         加载数据
         
         Args:
             file_path: 文件路径
+            columns: 只加载这些字段，Parquet文件只读取对应的列；JSON文件为按站点分组的整合数据，忽略该参数
             
         Returns:
             加载的数据
         """
-        self.logger.info(f"开始加载数据，文件路径: {file_path}")
+        self.logger.info(f"开始加载数据，文件路径: {file_path}，字段: {columns or '全部'}")
         
         # 根据文件扩展名选择加载方式
         _, ext = os.path.splitext(file_path)
@@ -265,10 +565,17 @@ class DataProcessor:
         if ext.lower() == ".json":
             with open(file_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
+        elif ext.lower() == ".jsonl":
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = [json.loads(line) for line in f if line.strip()]
+            if columns is not None:
+                data = [{k: v for k, v in item.items() if k in columns} for item in data]
+        elif ext.lower() == ".parquet":
+            data = read_parquet_records(file_path, columns)
         elif ext.lower() == ".csv":
-            data = pd.read_csv(file_path).to_dict(orient="records")
+            data = pd.read_csv(file_path, usecols=columns).to_dict(orient="records")
         elif ext.lower() in [".xlsx", ".xls"]:
-            data = pd.read_excel(file_path).to_dict(orient="records")
+            data = pd.read_excel(file_path, usecols=columns).to_dict(orient="records")
         else:
             self.logger.error(f"不支持的文件类型: {ext}")
             return None
@@ -276,6 +583,19 @@ class DataProcessor:
         self.logger.info(f"数据加载成功，共 {len(data)} 条")
         return data
     
+    def _to_json_content(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        转换为可以保存到JSON列的数据，去掉缺失值，日期时间转为字符串
+        
+        Args:
+            item: 清洗后的数据项
+            
+        Returns:
+            只包含JSON类型的数据项
+        """
+        item = {k: v for k, v in item.items() if not (v is pd.NaT or (isinstance(v, float) and np.isnan(v)))}
+        return json.loads(json.dumps(item, ensure_ascii=False, default=str))
+    
     def save_to_database(self, data: List[Dict[str, Any]]) -> int:
         """
         将爬取数据保存到数据库
@@ -322,7 +642,7 @@ class DataProcessor:
                     "spider_name": spider_name,
                     "data_type": data_type,
                     "data_id": data_id,
-                    "data_content": item,
+                    "data_content": self._to_json_content(item),
                     "source": source
                 }
                 
@@ -348,7 +668,7 @@ class DataProcessor:
         
         Args:
             data: 爬取到的数据列表
-            format_type: 格式化类型
+            format_type: 格式化类型，可选值：json、csv、excel、parquet
             save: 是否保存处理后的数据到文件
             save_to_db: 是否保存处理后的数据到数据库
             
@@ -377,6 +697,187 @@ class DataProcessor:
         self.logger.info("数据处理流程完成")
         return formatted_data
 
+    def process_stream(self, data: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None, save: bool = False, save_to_db: bool = False, max_dedupe_keys: Optional[int] = None, file_format: Optional[str] = None) -> Dict[str, Any]:
+        """
+        流式数据处理流程，按固定大小的批次清洗、去重并写入数据库和文件
+        
+        内存中只保留当前批次和有限数量的去重键。与批量处理一致，去重字段相同的数据保留最后一条：
+        每批写入数据库前先在批内去重，后面批次的重复数据作为新版本写入数据库，成为该数据的最新记录。
+        处理结果先追加到临时文件，处理结束后去掉被后出现的数据覆盖的重复数据，写入目标格式的文件；
+        json格式与process的输出一样按站点分组，jsonl格式每行一条数据，parquet格式按行组写入。
+        
+        Args:
+            data: 爬取到的数据，可以是列表或迭代器
+            chunk_size: 每批的数据数量，默认取配置STREAM_CHUNK_SIZE
+            save: 是否保存处理后的数据到文件
+            save_to_db: 是否保存处理后的数据到数据库
+            max_dedupe_keys: 去重键集合的容量，默认取配置STREAM_DEDUPE_MAX_KEYS
+            file_format: 文件格式，可选json、jsonl、parquet，默认取配置PROCESSED_FILE_FORMAT
+            
+        Returns:
+            处理统计，包含输入数、去重后的数据数、重复数、写入数据库的数量和文件路径
+        """
+        chunk_size = max(1, chunk_size or PROCESSOR_CONFIG.get("STREAM_CHUNK_SIZE", 1000))
+        return self.process_batches(
+            self._iter_chunks(data, chunk_size),
+            chunk_size=chunk_size,
+            save=save,
+            save_to_db=save_to_db,
+            max_dedupe_keys=max_dedupe_keys,
+            file_format=file_format
+        )
+    
+    def process_batches(self, batches: Iterable[List[Dict[str, Any]]], chunk_size: Optional[int] = None, save: bool = False, save_to_db: bool = False, max_dedupe_keys: Optional[int] = None, file_format: Optional[str] = None) -> Dict[str, Any]:
+        """
+        流式处理逐批到达的数据，每批到达后立即处理，超过chunk_size的批次再切分
+        
+        数据源可以是每个爬虫结束时产出一批记录的生成器，爬虫尚未全部结束时数据库就开始写入。
+        
+        Args:
+            batches: 数据批次的迭代器
+            chunk_size: 每批最多处理的数据数量，默认取配置STREAM_CHUNK_SIZE
+            save: 是否保存处理后的数据到文件
+            save_to_db: 是否保存处理后的数据到数据库
+            max_dedupe_keys: 去重键集合的容量，默认取配置STREAM_DEDUPE_MAX_KEYS
+            file_format: 文件格式，可选json、jsonl、parquet，默认取配置PROCESSED_FILE_FORMAT
+            
+        Returns:
+            处理统计，同process_stream
+        """
+        chunk_size = max(1, chunk_size or PROCESSOR_CONFIG.get("STREAM_CHUNK_SIZE", 1000))
+        file_format = file_format or PROCESSOR_CONFIG.get("PROCESSED_FILE_FORMAT", "json")
+        if save and file_format not in STREAM_FILE_FORMATS:
+            raise ValueError(f"不支持的流式处理文件格式: {file_format}")
+        seen_keys = _BoundedKeySet(max_dedupe_keys or PROCESSOR_CONFIG.get("STREAM_DEDUPE_MAX_KEYS", 100000))
+        
+        self.logger.info(f"开始流式数据处理，每批最多 {chunk_size} 条数据")
+        
+        stats = {
+            "records": 0,
+            "processed": 0,
+            "duplicates": 0,
+            "saved": 0,
+            "file_path": None
+        }
+        spool = _RecordSpool(seen_keys, self._duplicate_key) if save else None
+        position = 0
+        # 与批量处理一致，整个数据流中每个去重字段都出现过时才去重，跨批次的重复数在结束时才计入
+        present_columns = set()
+        cross_chunk_duplicates = 0
+        
+        try:
+            for batch in batches:
+                for chunk in self._iter_chunks(batch, chunk_size):
+                    stats["records"] += len(chunk)
+                    
+                    # 清洗并在批内去重，重复数据保留最后一条
+                    cleaned_chunk = self._remove_duplicates([self._clean_item(item) for item in chunk])
+                    stats["duplicates"] += len(chunk) - len(cleaned_chunk)
+                    
+                    # 记录去重键最后出现的位置，之前批次中的同一数据被本批覆盖
+                    present_columns |= self._present_subset_columns(cleaned_chunk)
+                    for item in cleaned_chunk:
+                        if not seen_keys.add(self._duplicate_key(item), position):
+                            cross_chunk_duplicates += 1
+                        position += 1
+                    
+                    if not cleaned_chunk:
+                        continue
+                    
+                    # 保存到数据库
+                    if save_to_db:
+                        stats["saved"] += self.save_to_database(cleaned_chunk)
+                    
+                    # 追加到临时文件
+                    if spool is not None:
+                        spool.write(cleaned_chunk)
+            
+            dedupe = len(present_columns) == len(DUPLICATE_SUBSET)
+            if dedupe:
+                stats["duplicates"] += cross_chunk_duplicates
+            stats["processed"] = stats["records"] - stats["duplicates"]
+            
+            # 写入处理结果文件
+            if spool is not None and spool.rows:
+                stats["file_path"] = self._write_spool(spool, file_format, chunk_size, dedupe)
+        finally:
+            if spool is not None:
+                spool.close()
+        
+        self.logger.info(
+            f"流式数据处理完成，共 {stats['records']} 条数据，去重后 {stats['processed']} 条，"
+            f"写入数据库 {stats['saved']} 条，保存路径: {stats['file_path']}"
+        )
+        return stats
+    
+    def _write_spool(self, spool: _RecordSpool, file_format: str, chunk_size: int, dedupe: bool = True) -> str:
+        """
+        把临时文件中保留的数据写入处理结果文件
+        
+        Args:
+            spool: 临时文件
+            file_format: 文件格式
+            chunk_size: 每次写入的数据数量
+            dedupe: 是否去掉被后出现的数据覆盖的重复数据
+        
+        Returns:
+            文件路径
+        """
+        writer_class = STREAM_FILE_FORMATS[file_format]
+        file_path = os.path.join(
+            self.processed_data_dir,
+            f"processed_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_format}"
+        )
+        writer = writer_class(file_path)
+        try:
+            for chunk in self._iter_chunks(spool.iter_kept(grouped=getattr(writer_class, "grouped", False), dedupe=dedupe), chunk_size):
+                writer.write(chunk)
+        finally:
+            writer.close()
+        return file_path
+    
+    def _iter_chunks(self, data: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        把数据切分为固定大小的批次
+        
+        Args:
+            data: 数据列表或迭代器
+            chunk_size: 每批的数据数量
+            
+        Yields:
+            数据批次
+        """
+        iterator = iter(data)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def _duplicate_key(self, item: Dict[str, Any]) -> Hashable:
+        """
+        获取数据的去重键，与批量处理的去重依据一致，缺少的字段按空值比较
+        
+        Args:
+            item: 清洗后的数据项
+            
+        Returns:
+            去重键
+        """
+        return tuple(item.get(column) for column in DUPLICATE_SUBSET)
+    
+    def _present_subset_columns(self, data: List[Dict[str, Any]]) -> Set[str]:
+        """
+        获取数据中出现过的去重字段
+        
+        Args:
+            data: 数据列表
+            
+        Returns:
+            至少有一条数据包含的去重字段
+        """
+        return {column for column in DUPLICATE_SUBSET if any(column in item for item in data)}
+
 # 单例模式
 _data_processor_instance = None
 
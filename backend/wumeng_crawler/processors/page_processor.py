@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Dict, List, Any
+
+
+def normalize_url(url: str, domain: str) -> str:
+    """
+    标准化URL，相对地址补全为网站的绝对地址
+
+    Args:
+        url: 原始URL
+        domain: 网站域名
+
+    Returns:
+        标准化后的URL
+    """
+    if not url:
+        return ""
+
+    # 处理相对URL
+    if not url.startswith("http"):
+        return f"http://{domain}/{url.lstrip('/')}"
+
+    return url
+
+
+def process_page_records(data: List[Dict[str, Any]], site: str, domain: str) -> List[Dict[str, Any]]:
+    """
+    清洗和整合页面记录：去除标题和链接文本的空白，丢弃空链接，补全相对地址，
+    页面地址和表格原样保留
+
+    只依赖参数，可以在CPU进程池的子进程中执行
+
+    Args:
+        data: 爬取到的页面记录列表
+        site: 网站名称
+        domain: 网站域名
+
+    Returns:
+        处理后的页面记录列表
+    """
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    processed_data = []
+
+    for item in data:
+        record = {
+            "site": item.get("site", site),
+            "domain": item.get("domain", domain)
+        }
+        if "url" in item:
+            record["url"] = item["url"]
+        record["title"] = item.get("title", "").strip()
+        record["links"] = [
+            {
+                "text": link.get("text", "").strip(),
+                "href": normalize_url(link.get("href", ""), domain)
+            }
+            for link in item.get("links", [])
+            if link.get("href", "").strip()
+        ]
+        if "tables" in item:
+            record["tables"] = item["tables"]
+        record["crawl_time"] = item.get("crawl_time", current_time)
+        processed_data.append(record)
+
+    return processed_data
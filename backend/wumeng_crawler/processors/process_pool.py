@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional, Any, Callable
+
+from loguru import logger
+
+from wumeng_crawler.config.config import PROCESSOR_CONFIG
+
+
+class CpuExecutor:
+    """
+    CPU密集型任务的进程池
+
+    网络请求留在HTTP引擎的事件循环中，HTML解析和数据处理交给子进程执行，
+    多个爬虫的解析可以分布到多个CPU核心上。提交的函数和参数必须可以序列化，
+    应传入响应字节等原始数据，返回精简的记录。进程数为0时改为在线程中执行。
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        初始化进程池
+
+        Args:
+            max_workers: 子进程数，为0时不使用进程池
+        """
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        获取进程池，首次使用时创建
+        """
+        # 守护进程（如Celery的prefork工作进程）不能创建子进程
+        if self.max_workers <= 0 or multiprocessing.current_process().daemon:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # 父进程中有事件循环线程，使用spawn避免fork继承锁状态
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"启动CPU进程池，进程数: {self.max_workers}")
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor) -> None:
+        """
+        丢弃已损坏的进程池，下次使用时重新创建
+        """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        在子进程中执行函数，不阻塞事件循环
+
+        Args:
+            func: 模块级函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            函数的返回值
+        """
+        call = partial(func, *args, **kwargs)
+        pool = self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(call)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, call)
+        except BrokenProcessPool as e:
+            logger.error(f"CPU进程池异常退出: {e}，本次任务改为在线程中执行")
+            self._reset_pool(pool)
+            return await asyncio.to_thread(call)
+
+    def shutdown(self) -> None:
+        """
+        关闭进程池
+        """
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=True)
+            logger.info("关闭CPU进程池")
+
+# 单例模式
+_cpu_executor_instance = None
+_cpu_executor_lock = threading.Lock()
+
+def get_cpu_executor() -> CpuExecutor:
+    """
+    获取CPU进程池实例
+
+    Returns:
+        CPU进程池实例
+    """
+    global _cpu_executor_instance
+    if _cpu_executor_instance is None:
+        with _cpu_executor_lock:
+            if _cpu_executor_instance is None:
+                _cpu_executor_instance = CpuExecutor(PROCESSOR_CONFIG.get("PROCESS_POOL_WORKERS", os.cpu_count() or 1))
+    return _cpu_executor_instance
@@ -1,18 +1,37 @@
-import requests
+import asyncio
+import threading
+import time
+import httpx
+from datetime import datetime
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 from loguru import logger
-from typing import Dict, List, Optional, Any
-import time
-import random
+from typing import Dict, List, Optional, Any, Sequence, Callable
 
-from wumeng_crawler.config.config import SPIDER_CONFIG
+from wumeng_crawler.config.config import SPIDER_CONFIG, PROCESSOR_CONFIG
+from wumeng_crawler.network.http_engine import get_http_engine
+from wumeng_crawler.network.rate_limiter import get_rate_limiter, parse_retry_after
+from wumeng_crawler.network.http_cache import get_validator_cache, body_hash
+from wumeng_crawler.network.circuit_breaker import get_circuit_breakers
+from wumeng_crawler.network.backoff import decorrelated_jitter
+from wumeng_crawler.network.resolver import get_resolver
+from wumeng_crawler.network.cancellation import CancelToken, CrawlCancelled
+from wumeng_crawler.parsers.html_parser import extract_fields
+from wumeng_crawler.processors.process_pool import get_cpu_executor
+from wumeng_crawler.storage.search_index import get_search_index
 
 class BaseSpider:
     """
     爬虫基类，包含通用的爬取逻辑和配置
     """
     
+    # 从HTML页面中提取的字段，可选title、links、tables
+    parse_fields = ("title", "links")
+    
+    # 可在CPU进程池中运行的数据处理函数，签名为(data, site, domain)，
+    # 必须是模块级函数；为空时在线程中运行process_data
+    record_processor: Optional[Callable[[List[Dict[str, Any]], str, str], List[Dict[str, Any]]]] = None
+    
     def __init__(self, site_config: Dict[str, Any]):
         """
         初始化爬虫
@@ -26,27 +45,29 @@ class BaseSpider:
         self.name = site_config.get("name")
         self.enabled = site_config.get("enabled", True)
         
-        # 初始化请求会话
-        self.session = requests.Session()
+        # 使用共享的异步HTTP引擎，所有爬虫共用一个事件循环和连接池
+        self.engine = get_http_engine()
+        
+        # 注册到解析层，请求时缓存DNS结果，并在域名和配置的IP之间自动切换
+        get_resolver().register_site(self.domain, self.ip)
         
         # 配置请求头
         self.user_agent = UserAgent()
-        self.session.headers.update({
+        self.headers = {
             "User-Agent": self.user_agent.random,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "zh-CN,zh;q=0.8,en-US;q=0.5,en;q=0.3",
             "Accept-Encoding": "gzip, deflate",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1"
-        })
+        }
+        
+        # HTML解析器，默认使用lxml快速提取
+        self.html_parser = site_config.get("html_parser") or SPIDER_CONFIG.get("HTML_PARSER", "lxml")
         
-        # 配置代理
-        if SPIDER_CONFIG.get("PROXY_ENABLED"):
-            proxy_url = SPIDER_CONFIG.get("PROXY_URL")
-            self.session.proxies = {
-                "http": proxy_url,
-                "https": proxy_url
-            }
+        # HTML解析和数据处理交给CPU进程池，小页面直接在当前线程解析
+        self.cpu_executor = get_cpu_executor()
+        self.process_pool_min_bytes = PROCESSOR_CONFIG.get("PROCESS_POOL_MIN_BYTES", 32 * 1024)
         
         # 配置超时
         self.timeout = SPIDER_CONFIG.get("REQUEST_TIMEOUT", 30)
@@ -54,14 +75,37 @@ class BaseSpider:
         # 配置重试次数
         self.retry_times = SPIDER_CONFIG.get("RETRY_TIMES", 3)
         
-        # 配置重试延迟
+        # 配置重试延迟，按指数退避增长到最大重试延迟
         self.retry_delay = SPIDER_CONFIG.get("RETRY_DELAY", 5)
+        self.retry_max_delay = SPIDER_CONFIG.get("RETRY_MAX_DELAY", 60)
+        
+        # 按主机熔断，主机不可用时快速失败
+        self.circuit_breakers = get_circuit_breakers()
+        
+        # 按主机限流，同一主机的所有爬虫实例共享令牌桶
+        self.rate_limiter = get_rate_limiter()
+        rate_limit = site_config.get("rate_limit") or {}
+        self.rate_limiter.configure(self.domain, rate=rate_limit.get("rate"), burst=rate_limit.get("burst"))
         
-        # 配置下载延迟
-        self.download_delay = SPIDER_CONFIG.get("DOWNLOAD_DELAY", 1.0)
+        # 条件请求，页面未变化时跳过解析、处理和保存
+        self.conditional_get = SPIDER_CONFIG.get("CONDITIONAL_GET", True)
+        self.validator_cache = get_validator_cache() if self.conditional_get else None
+        self._reset_fetch_state()
         
-        # 配置随机下载延迟
-        self.randomize_download_delay = SPIDER_CONFIG.get("RANDOMIZE_DOWNLOAD_DELAY", True)
+        # 处理后的记录由run返回给DataProcessor，原始数据文件只是可选的输出
+        save_files = site_config.get("save_files")
+        self.save_files = SPIDER_CONFIG.get("SAVE_DATA_FILES", True) if save_files is None else bool(save_files)
+        
+        # 生命周期状态，爬虫创建后即可运行，停止后不再开始新的运行，直到重新启动
+        self.stopped = False
+        self.running = False
+        self.last_run: Dict[str, Any] = {}
+        self._run_started = 0.0
+        # 返回了记录、等待调用方保存后提交的运行状态
+        self._uncommitted_state: Optional[Dict[str, Any]] = None
+        # 本次运行的取消令牌，停止爬虫时中断该爬虫等待中的请求
+        self.cancel_token = CancelToken()
+        self._state_lock = threading.Lock()
         
         logger.info(f"初始化爬虫: {self.name}，目标域名: {self.domain}，IP地址: {self.ip}")
     
@@ -96,49 +140,350 @@ class BaseSpider:
         Args:
             headers: 请求头字典
         """
-        self.session.headers.update(headers)
+        self.headers.update(headers)
+    
+    @property
+    def state(self) -> str:
+        """
+        爬虫的生命周期状态
+
+        Returns:
+            idle为空闲，running为运行中，stopping为已请求停止但本次运行尚未结束，stopped为已停止
+        """
+        if self.running:
+            return "stopping" if self.stopped else "running"
+        return "stopped" if self.stopped else "idle"
+    
+    def start(self) -> None:
+        """
+        启动爬虫，之后可以开始新的运行
+        """
+        with self._state_lock:
+            self.stopped = False
+            if self.cancel_token.cancelled and not self.running:
+                self.cancel_token = CancelToken()
+        logger.info(f"启动爬虫: {self.name}")
+    
+    def stop(self, cancel: bool = True) -> None:
+        """
+        停止爬虫，不再开始新的运行，正在进行的运行结束后进入停止状态
+        
+        连接池由爬虫管理器通过共享HTTP引擎持有，停止爬虫不关闭连接，重新启动后继续复用
+        
+        Args:
+            cancel: 是否取消正在进行的运行，取消后等待中的请求立即返回，爬取到的数据不再处理和保存
+        """
+        with self._state_lock:
+            self.stopped = True
+            token = self.cancel_token
+        if cancel:
+            token.cancel(f"爬虫 {self.name} 已停止")
+        logger.info(f"停止爬虫: {self.name}")
+    
+    def _begin_run(self) -> bool:
+        """
+        开始一次运行，爬虫已停止或上一次运行未结束时返回False
+        """
+        with self._state_lock:
+            if self.stopped or self.running:
+                return False
+            self.running = True
+            self.cancel_token = CancelToken()
+            uncommitted_state = self._uncommitted_state
+            self._uncommitted_state = None
+        
+        # 上一次运行的记录没有保存成功，丢弃其状态，本次运行重新抓取这些页面
+        if uncommitted_state is not None:
+            logger.warning(f"爬虫 {self.name} 上一次运行的记录未保存，丢弃其运行状态")
+            self._discard_run_state(uncommitted_state)
+        
+        self._reset_fetch_state()
+        self.last_run = {
+            "start_time": datetime.now().isoformat(),
+            "end_time": None,
+            "duration": None,
+            "result": None,
+            "records": 0,
+            "cancelled": False,
+            "committed": None
+        }
+        self._run_started = time.monotonic()
+        return True
+    
+    def _end_run(self, records: Optional[List[Dict[str, Any]]]) -> None:
+        """
+        结束本次运行，记录运行结果、记录数和耗时
+        
+        运行失败时丢弃本次运行的状态；页面内容未变化时没有需要保存的记录，直接提交；
+        返回了记录时暂不提交，由调用方保存记录后调用commit_run或discard_run。
+        """
+        state = self._take_run_state()
+        committed = None
+        if records is None:
+            self._discard_run_state(state)
+            committed = False
+        elif not records:
+            self._commit_run_state(state)
+            committed = True
+        
+        self.last_run.update(
+            end_time=datetime.now().isoformat(),
+            duration=round(time.monotonic() - self._run_started, 3),
+            result=records is not None,
+            records=len(records) if records else 0,
+            cancelled=self.cancel_token.cancelled,
+            committed=committed
+        )
+        with self._state_lock:
+            if committed is None:
+                self._uncommitted_state = state
+            self.running = False
+    
+    def commit_run(self) -> bool:
+        """
+        调用方保存本次运行返回的记录成功后，提交运行状态（HTTP校验信息等），
+        之后内容未变化的页面才会在下次运行时跳过
+        
+        Returns:
+            有待提交的运行状态返回True，否则返回False
+        """
+        with self._state_lock:
+            state = self._uncommitted_state
+            self._uncommitted_state = None
+        if state is None:
+            return False
+        
+        self._commit_run_state(state)
+        self.last_run["committed"] = True
+        logger.info(f"爬虫 {self.name} 的记录已保存，提交运行状态")
+        return True
+    
+    def discard_run(self) -> bool:
+        """
+        调用方保存本次运行返回的记录失败时，丢弃运行状态，下次运行重新抓取这些页面
+        
+        Returns:
+            有待提交的运行状态返回True，否则返回False
+        """
+        with self._state_lock:
+            state = self._uncommitted_state
+            self._uncommitted_state = None
+        if state is None:
+            return False
+        
+        self._discard_run_state(state)
+        self.last_run["committed"] = False
+        logger.warning(f"爬虫 {self.name} 的记录保存失败，丢弃运行状态")
+        return True
+    
+    def _reset_fetch_state(self) -> None:
+        """
+        重置本次运行的条件请求状态
+        """
+        # 内容有变化的页面，保存成功后才写入校验信息缓存
+        self._pending_validators: Dict[str, Dict[str, Any]] = {}
+        # 内容未变化的页面
+        self._unchanged_urls = set()
+        # 最终失败的请求数
+        self._failed_requests = 0
+    
+    def _is_modified(self, cache_key: str, response: httpx.Response, validators: Optional[Dict[str, Any]]) -> bool:
+        """
+        根据304状态码或响应体哈希判断页面是否变化，变化时暂存新的校验信息
+        
+        Args:
+            cache_key: 校验信息缓存的键
+            response: 请求响应
+            validators: 缓存中的校验信息
+            
+        Returns:
+            页面有变化返回True，否则返回False
+        """
+        if response.status_code == 304:
+            logger.info(f"页面未变化: {cache_key}，状态码: 304")
+            self._unchanged_urls.add(cache_key)
+            return False
+        
+        new_validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_hash": body_hash(response.content)
+        }
+        
+        if validators and validators["body_hash"] == new_validators["body_hash"]:
+            # 服务器不支持条件请求但内容相同，刷新校验信息
+            logger.info(f"页面未变化: {cache_key}，响应体哈希相同")
+            self.validator_cache.put(cache_key, new_validators)
+            self._unchanged_urls.add(cache_key)
+            return False
+        
+        self._pending_validators[cache_key] = new_validators
+        return True
+    
+    def _is_unchanged_run(self) -> bool:
+        """
+        本次运行没有爬取到数据时，判断是否因为所有页面都未变化
+        """
+        return bool(self._unchanged_urls) and not self._pending_validators and not self._failed_requests
+    
+    def _take_run_state(self) -> Dict[str, Any]:
+        """
+        取出本次运行暂存的状态，子类可以扩展
+        
+        Returns:
+            运行状态，validators为内容有变化的页面的新校验信息
+        """
+        state = {"validators": self._pending_validators}
+        self._pending_validators = {}
+        return state
+    
+    def _commit_run_state(self, state: Dict[str, Any]) -> None:
+        """
+        记录保存成功后提交运行状态，子类可以扩展
+        
+        Args:
+            state: _take_run_state取出的运行状态
+        """
+        if self.validator_cache is not None and state["validators"]:
+            try:
+                self.validator_cache.put_many(state["validators"].items())
+            except Exception as e:
+                logger.error(f"写入HTTP校验信息缓存失败: {e}")
     
-    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+    def _discard_run_state(self, state: Dict[str, Any]) -> None:
         """
-        发送GET请求
+        运行失败或记录保存失败时丢弃运行状态，子类可以扩展
+        
+        校验信息不写入缓存，下次运行重新下载这些页面
         
         Args:
+            state: _take_run_state取出的运行状态
+        """
+    
+    async def async_request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, conditional: bool = True, **kwargs) -> Optional[httpx.Response]:
+        """
+        通过共享HTTP引擎发送请求，按主机限流，等待都不阻塞线程
+        
+        启用条件请求时，GET请求携带缓存的ETag和Last-Modified，页面未变化时返回None。
+        爬虫停止时，等待中的请求（限流、重试退避和网络请求）立即中断并返回None。
+        
+        Args:
+            method: 请求方法
             url: URL地址
-            params: 请求参数
-            headers: 请求头
+            headers: 请求头，会覆盖爬虫的默认请求头
+            conditional: 为False时忽略缓存的校验信息，总是返回完整的页面，新的校验信息照常暂存
+            **kwargs: 传递给httpx的请求参数
             
         Returns:
-            请求响应，失败返回None
+            请求响应，失败、页面未变化或爬虫已停止返回None
+        """
+        try:
+            return await self.cancel_token.run(self._request_with_retries(method, url, headers, conditional, **kwargs))
+        except CrawlCancelled:
+            logger.info(f"爬虫 {self.name} 已停止，取消{method}请求: {url}")
+            return None
+    
+    async def _request_with_retries(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, conditional: bool = True, **kwargs) -> Optional[httpx.Response]:
         """
+        发送请求，失败时按退避策略重试
+        """
+        request_headers = {**self.headers, **(headers or {})}
+        
+        # 附加条件请求头
+        cache_key = None
+        validators = None
+        if method == "GET" and self.validator_cache is not None:
+            cache_key = str(httpx.URL(url, params=kwargs.get("params")))
+            validators = self.validator_cache.get(cache_key) if conditional else None
+            if validators:
+                if validators["etag"]:
+                    request_headers.setdefault("If-None-Match", validators["etag"])
+                if validators["last_modified"]:
+                    request_headers.setdefault("If-Modified-Since", validators["last_modified"])
+        
+        breaker = self.circuit_breakers.breaker(self.domain)
+        delay = self.retry_delay
+        
         for retry in range(self.retry_times):
+            # 主机熔断中直接失败，不占用重试时间
+            if not breaker.allow_request():
+                logger.warning(f"主机 {self.domain} 熔断中，跳过{method}请求: {url}")
+                self._failed_requests += 1
+                return None
+            
             try:
-                # 随机下载延迟
-                if self.randomize_download_delay:
-                    delay = random.uniform(0.5 * self.download_delay, 1.5 * self.download_delay)
-                else:
-                    delay = self.download_delay
+                # 获取主机的请求令牌，令牌充足时不等待
+                await self.rate_limiter.acquire(self.domain)
                 
-                time.sleep(delay)
+                logger.info(f"发送{method}请求: {url}，重试次数: {retry + 1}")
+                response = await self.engine.request(method, url, headers=request_headers, timeout=self.timeout, **kwargs)
+                if response.status_code != 304 or cache_key is None:
+                    response.raise_for_status()
                 
-                logger.info(f"发送GET请求: {url}，重试次数: {retry + 1}")
-                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
-                response.raise_for_status()
+                breaker.record_success()
+                self.rate_limiter.record_success(self.domain)
+                logger.info(f"{method}请求成功: {url}，状态码: {response.status_code}")
                 
-                logger.info(f"GET请求成功: {url}，状态码: {response.status_code}")
+                if cache_key is not None and not self._is_modified(cache_key, response, validators):
+                    return None
                 return response
-            except requests.exceptions.RequestException as e:
-                logger.error(f"GET请求失败: {url}，错误: {e}，重试次数: {retry + 1}")
+            except httpx.HTTPError as e:
+                logger.error(f"{method}请求失败: {url}，错误: {e}，重试次数: {retry + 1}")
+                
+                status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                
+                # 连接失败、超时和5xx视为主机不可用，其他状态码说明主机可以正常响应
+                if status_code is None or status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                
+                # 被限流时暂停该主机的令牌发放，重试由限流器等待
+                throttled = status_code == 429
+                if throttled:
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    self.rate_limiter.penalize(self.domain, retry_after if retry_after is not None else self.retry_delay)
+                
+                # 其他4xx错误重试也不会成功
+                if status_code is not None and 400 <= status_code < 500 and status_code not in (408, 429):
+                    logger.error(f"{method}请求失败: {url}，状态码 {status_code} 不重试")
+                    self._failed_requests += 1
+                    return None
                 
                 if retry < self.retry_times - 1:
-                    logger.info(f"等待 {self.retry_delay} 秒后重试...")
-                    time.sleep(self.retry_delay)
+                    if throttled:
+                        continue
+                    # 指数退避，加入去相关抖动
+                    delay = decorrelated_jitter(delay, self.retry_delay, self.retry_max_delay)
+                    logger.info(f"等待 {delay:.2f} 秒后重试...")
+                    await asyncio.sleep(delay)
                 else:
-                    logger.error(f"GET请求最终失败: {url}，已达到最大重试次数")
+                    logger.error(f"{method}请求最终失败: {url}，已达到最大重试次数")
+                    self._failed_requests += 1
                     return None
+            except BaseException:
+                # 请求被取消或出现其他异常时没有探测结果，释放半开状态的探测名额
+                breaker.release_probe()
+                raise
     
-    def post(self, url: str, data: Optional[Dict[str, Any]] = None, json: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+    async def async_get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, conditional: bool = True) -> Optional[httpx.Response]:
         """
-        发送POST请求
+        异步发送GET请求
+        
+        Args:
+            url: URL地址
+            params: 请求参数
+            headers: 请求头
+            conditional: 是否按缓存的校验信息发送条件请求
+            
+        Returns:
+            请求响应，失败返回None
+        """
+        return await self.async_request("GET", url, params=params, headers=headers, conditional=conditional)
+    
+    async def async_post(self, url: str, data: Optional[Dict[str, Any]] = None, json: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        异步发送POST请求
         
         Args:
             url: URL地址
@@ -149,35 +494,42 @@ class BaseSpider:
         Returns:
             请求响应，失败返回None
         """
-        for retry in range(self.retry_times):
-            try:
-                # 随机下载延迟
-                if self.randomize_download_delay:
-                    delay = random.uniform(0.5 * self.download_delay, 1.5 * self.download_delay)
-                else:
-                    delay = self.download_delay
-                
-                time.sleep(delay)
-                
-                logger.info(f"发送POST请求: {url}，重试次数: {retry + 1}")
-                response = self.session.post(url, data=data, json=json, headers=headers, timeout=self.timeout)
-                response.raise_for_status()
-                
-                logger.info(f"POST请求成功: {url}，状态码: {response.status_code}")
-                return response
-            except requests.exceptions.RequestException as e:
-                logger.error(f"POST请求失败: {url}，错误: {e}，重试次数: {retry + 1}")
-                
-                if retry < self.retry_times - 1:
-                    logger.info(f"等待 {self.retry_delay} 秒后重试...")
-                    time.sleep(self.retry_delay)
-                else:
-                    logger.error(f"POST请求最终失败: {url}，已达到最大重试次数")
-                    return None
+        return await self.async_request("POST", url, data=data, json=json, headers=headers)
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        发送GET请求，同步兼容接口，请求在共享HTTP引擎中执行
+        
+        Args:
+            url: URL地址
+            params: 请求参数
+            headers: 请求头
+            
+        Returns:
+            请求响应，失败返回None
+        """
+        return self.engine.run(self.async_get(url, params=params, headers=headers))
+    
+    def post(self, url: str, data: Optional[Dict[str, Any]] = None, json: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        发送POST请求，同步兼容接口，请求在共享HTTP引擎中执行
+        
+        Args:
+            url: URL地址
+            data: 表单数据
+            json: JSON数据
+            headers: 请求头
+            
+        Returns:
+            请求响应，失败返回None
+        """
+        return self.engine.run(self.async_post(url, data=data, json=json, headers=headers))
     
-    def parse_html(self, response: requests.Response) -> BeautifulSoup:
+    def parse_html(self, response: httpx.Response) -> BeautifulSoup:
         """
-        解析HTML响应
+        解析HTML响应，构建完整的BeautifulSoup文档树
+        
+        只提取标题、链接和表格时使用extract，速度更快、占用内存更少
         
         Args:
             response: 请求响应
@@ -187,7 +539,42 @@ class BaseSpider:
         """
         return BeautifulSoup(response.text, "lxml")
     
-    def parse_json(self, response: requests.Response) -> Optional[Dict[str, Any]]:
+    def extract(self, response: httpx.Response, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        从HTML响应中提取字段，直接解析响应字节，不构建完整文档树
+        
+        Args:
+            response: 请求响应
+            fields: 需要提取的字段，默认为爬虫的parse_fields
+            
+        Returns:
+            字段名到提取结果的映射
+        """
+        return extract_fields(response.content, response.charset_encoding, fields or self.parse_fields, self.html_parser)
+    
+    async def async_extract(self, response: httpx.Response, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        从HTML响应中提取字段，较大的页面在CPU进程池中解析，不阻塞事件循环
+        
+        Args:
+            response: 请求响应
+            fields: 需要提取的字段，默认为爬虫的parse_fields
+            
+        Returns:
+            字段名到提取结果的映射
+        """
+        if len(response.content) < self.process_pool_min_bytes:
+            return self.extract(response, fields)
+        
+        return await self.cpu_executor.run(
+            extract_fields,
+            response.content,
+            response.charset_encoding,
+            tuple(fields or self.parse_fields),
+            self.html_parser
+        )
+    
+    def parse_json(self, response: httpx.Response) -> Optional[Dict[str, Any]]:
         """
         解析JSON响应
         
@@ -205,19 +592,35 @@ class BaseSpider:
     
     def crawl(self) -> List[Dict[str, Any]]:
         """
-        爬取数据的主方法，需要在子类中实现
+        爬取数据的主方法，子类需要实现crawl或crawl_async之一
+        
+        子类只实现crawl_async时，在共享HTTP引擎中运行crawl_async
         
         Returns:
             爬取到的数据列表
         """
-        raise NotImplementedError("子类必须实现crawl方法")
+        if type(self).crawl_async is BaseSpider.crawl_async:
+            raise NotImplementedError("子类必须实现crawl或crawl_async方法")
+        return self.engine.run(self.crawl_async())
+    
+    async def crawl_async(self) -> List[Dict[str, Any]]:
+        """
+        异步爬取数据的主方法
+        
+        默认在线程中运行同步的crawl方法，兼容只实现了crawl的子类
+        
+        Returns:
+            爬取到的数据列表
+        """
+        if type(self).crawl is BaseSpider.crawl:
+            raise NotImplementedError("子类必须实现crawl或crawl_async方法")
+        return await asyncio.to_thread(self.crawl)
     
     def close(self) -> None:
         """
-        关闭爬虫会话
+        关闭爬虫，等同于stop，连接池由共享HTTP引擎管理，不在此关闭
         """
-        self.session.close()
-        logger.info(f"关闭爬虫: {self.name}")
+        self.stop()
     
     def __enter__(self):
         """
@@ -227,7 +630,7 @@ class BaseSpider:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        退出上下文管理器，关闭爬虫会话
+        退出上下文管理器，停止爬虫
         """
         self.close()
     
@@ -243,6 +646,19 @@ class BaseSpider:
         """
         raise NotImplementedError("子类必须实现save_data方法")
     
+    def index_saved_file(self, file_path: str, data: List[Dict[str, Any]]) -> None:
+        """
+        将新保存的数据文件增量加入搜索索引，索引失败不影响保存结果
+        
+        Args:
+            file_path: 数据文件路径
+            data: 已保存的数据列表
+        """
+        try:
+            get_search_index().add_file(file_path, data)
+        except Exception as e:
+            logger.error(f"更新搜索索引失败: {file_path}，错误: {e}")
+    
     def process_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         处理数据的方法，需要在子类中实现
@@ -255,50 +671,110 @@ class BaseSpider:
         """
         raise NotImplementedError("子类必须实现process_data方法")
     
-    def run(self) -> bool:
+    async def process_data_async(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        异步处理数据，设置了record_processor时在CPU进程池中运行，否则在线程中运行process_data
+        
+        Args:
+            data: 爬取到的数据列表
+            
+        Returns:
+            处理后的数据列表
+        """
+        if self.record_processor is None:
+            return await asyncio.to_thread(self.process_data, data)
+        
+        logger.info(f"开始处理 {self.domain} 的数据")
+        processed_data = await self.cpu_executor.run(self.record_processor, data, self.name, self.domain)
+        logger.info(f"处理 {self.domain} 数据完成，共处理 {len(processed_data)} 条数据")
+        return processed_data
+    
+    def run(self) -> Optional[List[Dict[str, Any]]]:
         """
         运行爬虫的完整流程
         
+        返回记录时，调用方保存记录成功后需要调用commit_run，失败时调用discard_run；
+        未提交的运行状态在下次运行开始时丢弃
+        
+        Returns:
+            处理后的记录列表，页面内容未变化时为空列表，运行失败返回None
+        """
+        return self.engine.run(self.run_async())
+    
+    async def run_async(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        异步运行爬虫的完整流程，数据处理在CPU进程池中执行，保存在线程中执行，不阻塞事件循环
+        
         Returns:
-            运行结果，成功返回True，失败返回False
+            处理后的记录列表，页面内容未变化时为空列表，运行失败返回None
         """
         if not self.enabled:
             logger.info(f"爬虫 {self.name} 已禁用，跳过运行")
-            return False
+            return None
         
-        try:
-            logger.info(f"开始运行爬虫: {self.name}")
-            
-            # 爬取数据
-            raw_data = self.crawl()
-            
-            if not raw_data:
-                logger.warning(f"爬虫 {self.name} 未爬取到数据")
-                return False
-            
-            logger.info(f"爬虫 {self.name} 爬取到 {len(raw_data)} 条数据")
-            
-            # 处理数据
-            processed_data = self.process_data(raw_data)
-            
-            if not processed_data:
-                logger.warning(f"爬虫 {self.name} 处理数据后为空")
-                return False
-            
-            logger.info(f"爬虫 {self.name} 处理后的数据数量: {len(processed_data)}")
-            
-            # 保存数据
-            save_result = self.save_data(processed_data)
-            
-            if save_result:
-                logger.info(f"爬虫 {self.name} 数据保存成功")
-                return True
-            else:
-                logger.error(f"爬虫 {self.name} 数据保存失败")
-                return False
+        if not self._begin_run():
+            logger.warning(f"爬虫 {self.name} 已停止或正在运行，跳过本次运行")
+            return None
         
+        records = None
+        try:
+            records = await self._run_once()
+            return records
         except Exception as e:
             logger.error(f"爬虫 {self.name} 运行失败: {e}")
-            return False
+            return None
         finally:
-            self.close()
+            self._end_run(records)
+    
+    async def _run_once(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        执行一次爬取和处理，开启了原始数据文件时同时保存到文件
+        
+        运行状态在_end_run中按结果提交或丢弃，返回的记录由调用方保存后再提交
+        
+        Returns:
+            处理后的记录列表，页面内容未变化时为空列表，运行失败返回None
+        """
+        logger.info(f"开始运行爬虫: {self.name}")
+        
+        # 爬取数据
+        raw_data = await self.crawl_async()
+        
+        # 爬虫已停止，爬取到的部分数据不再处理和保存
+        if self.cancel_token.cancelled:
+            logger.warning(f"爬虫 {self.name} 已停止，丢弃本次爬取的数据")
+            return None
+        
+        if not raw_data:
+            # 所有页面都未变化，无需处理和保存
+            if self._is_unchanged_run():
+                logger.info(f"爬虫 {self.name} 页面内容未变化，跳过处理和保存")
+                return []
+            
+            logger.warning(f"爬虫 {self.name} 未爬取到数据")
+            return None
+        
+        logger.info(f"爬虫 {self.name} 爬取到 {len(raw_data)} 条数据")
+        
+        # 处理数据
+        processed_data = await self.process_data_async(raw_data)
+        
+        if not processed_data:
+            logger.warning(f"爬虫 {self.name} 处理数据后为空")
+            return None
+        
+        logger.info(f"爬虫 {self.name} 处理后的数据数量: {len(processed_data)}")
+        
+        if self.cancel_token.cancelled:
+            logger.warning(f"爬虫 {self.name} 已停止，丢弃处理后的数据")
+            return None
+        
+        # 保存原始数据文件
+        if self.save_files:
+            save_result = await asyncio.to_thread(self.save_data, processed_data)
+            if not save_result:
+                logger.error(f"爬虫 {self.name} 数据保存失败")
+                return None
+            logger.info(f"爬虫 {self.name} 数据保存成功")
+        
+        return processed_data
@@ -0,0 +1,386 @@
+from wumeng_crawler.spiders.base_spider import BaseSpider
+from wumeng_crawler.processors.page_processor import normalize_url, process_page_records
+from wumeng_crawler.storage.frontier import get_frontier
+from wumeng_crawler.config.config import SPIDER_CONFIG
+from loguru import logger
+from typing import Dict, List, Optional, Any
+from urllib.parse import urljoin, urlsplit
+import asyncio
+import httpx
+import re
+
+class GenericSpider(BaseSpider):
+    """
+    按网站配置爬取数据的通用爬虫
+
+    网站配置的crawl项描述爬取规则，所有字段都可省略：
+        start_paths: 起始页面路径列表，默认为["/"]
+        fields: 从页面提取的字段，可选title、links、tables，默认为["title", "links"]
+        link_pattern: 只保留href匹配该正则表达式的链接
+        pagination: 翻页规则，pattern为需要继续爬取的链接的正则表达式（匹配补全后的绝对地址），
+            max_pages为每次运行最多爬取的页面数，默认只爬取起始页面
+        frontier: 设置后改为持久化的增量爬取，代替pagination。pattern为需要跟随的链接的正则表达式
+            （默认跟随所有同站链接），max_depth为最大链接深度，budget为每次运行最多抓取的页面数，
+            recrawl_interval为页面的重抓间隔（秒），未设置的项取SPIDER_CONFIG中FRONTIER_开头的配置
+
+    同一层的页面并发请求，并发数由HTTP引擎的单主机并发数和限流器控制。
+    增量爬取时每次运行只抓取到期的页面，整站在多次运行中逐步覆盖。队列中从未抓取过的页面
+    不发送条件请求，清空队列或其他爬虫缓存过同一页面时也能重新提取链接。
+    """
+
+    # 在CPU进程池中运行的数据处理函数
+    record_processor = staticmethod(process_page_records)
+
+    def __init__(self, site_config: Dict[str, Any]):
+        """
+        初始化通用爬虫
+
+        Args:
+            site_config: 网站配置，包含ip、domain、name和crawl等信息
+        """
+        super().__init__(site_config)
+
+        crawl_config = site_config.get("crawl") or {}
+        self.start_paths: List[str] = list(crawl_config.get("start_paths") or ["/"])
+        self.parse_fields = tuple(crawl_config.get("fields") or self.parse_fields)
+
+        link_pattern = crawl_config.get("link_pattern")
+        self.link_pattern = re.compile(link_pattern) if link_pattern else None
+
+        pagination = crawl_config.get("pagination") or {}
+        self.pagination_pattern = re.compile(pagination["pattern"]) if pagination.get("pattern") else None
+        self.max_pages = max(len(self.start_paths), int(pagination.get("max_pages") or 0))
+
+        # 增量爬取
+        frontier_config = crawl_config.get("frontier")
+        self.frontier = None
+        if frontier_config:
+            if not isinstance(frontier_config, dict):
+                frontier_config = {}
+            self.frontier = get_frontier()
+            follow_pattern = frontier_config.get("pattern")
+            self.follow_pattern = re.compile(follow_pattern) if follow_pattern else None
+            self.max_depth = int(frontier_config.get("max_depth", SPIDER_CONFIG.get("FRONTIER_MAX_DEPTH", 3)))
+            self.crawl_budget = int(frontier_config.get("budget", SPIDER_CONFIG.get("FRONTIER_BUDGET", 100)))
+            self.recrawl_interval = float(frontier_config.get("recrawl_interval", SPIDER_CONFIG.get("FRONTIER_RECRAWL_INTERVAL", 3600)))
+            self.max_recrawl_interval = max(
+                self.recrawl_interval,
+                float(frontier_config.get("max_recrawl_interval", SPIDER_CONFIG.get("FRONTIER_MAX_RECRAWL_INTERVAL", 86400)))
+            )
+            # 每批并发抓取的页面数
+            self.frontier_batch_size = max(1, SPIDER_CONFIG.get("CONCURRENT_REQUESTS_PER_HOST", 2) * 2)
+
+        # 翻页和增量爬取需要页面中的链接
+        self.extract_fields = self.parse_fields
+        if (self.pagination_pattern is not None or self.frontier is not None) and "links" not in self.extract_fields:
+            self.extract_fields = self.extract_fields + ("links",)
+
+        logger.info(f"初始化通用爬虫: {self.name}，起始页面: {self.start_paths}，最多爬取 {self.max_pages} 个页面")
+
+    async def crawl_async(self) -> List[Dict[str, Any]]:
+        """
+        从起始页面开始逐层爬取，按翻页规则跟随链接
+
+        Returns:
+            爬取到的数据列表，每个页面一条记录
+        """
+        if self.frontier is not None:
+            return await self._crawl_frontier()
+
+        logger.info(f"开始爬取 {self.domain} 的数据")
+
+        data = []
+        pending = list(dict.fromkeys(self.get_url(path) for path in self.start_paths))
+        seen = set(pending)
+
+        while pending:
+            pages = await asyncio.gather(*(self._crawl_page(url) for url in pending))
+
+            next_pending = []
+            for url, page in zip(pending, pages):
+                if page is None:
+                    continue
+
+                data.append(self._build_record(url, page))
+
+                for next_url in self._next_pages(url, page):
+                    if next_url not in seen and len(seen) < self.max_pages:
+                        seen.add(next_url)
+                        next_pending.append(next_url)
+            pending = next_pending
+
+        logger.info(f"爬取 {self.domain} 完成，共获取 {len(data)} 条数据")
+        return data
+
+    async def _crawl_frontier(self) -> List[Dict[str, Any]]:
+        """
+        从持久化队列中取出到期的页面逐批抓取，新发现的链接加入队列
+
+        Returns:
+            内容有变化的页面记录列表
+        """
+        # 起始页面只在首次运行时入队，之后和其他页面一样按重抓间隔到期
+        self.frontier.add(self.name, [self.get_url(path) for path in self.start_paths], depth=0)
+        logger.info(f"开始增量爬取 {self.domain} 的数据，本次最多抓取 {self.crawl_budget} 个页面")
+
+        data = []
+        fetched = 0
+        while fetched < self.crawl_budget and not self.cancel_token.cancelled:
+            batch = self.frontier.next_batch(
+                self.name,
+                min(self.frontier_batch_size, self.crawl_budget - fetched),
+                per_host=self.frontier_batch_size
+            )
+            if not batch:
+                break
+            fetched += len(batch)
+            self._frontier_leased.extend(entry["url"] for entry in batch)
+
+            # 队列中从未抓取过的页面需要完整下载以提取链接，不能按缓存的校验信息跳过
+            pages = await asyncio.gather(*(
+                self._crawl_page(entry["url"], conditional=entry["fetch_count"] > 0)
+                for entry in batch
+            ))
+
+            for entry, page in zip(batch, pages):
+                url = entry["url"]
+                if page is not None:
+                    status = "changed"
+                    data.append(self._build_record(url, page))
+                    if entry["depth"] < self.max_depth:
+                        added = self.frontier.add(self.name, self._follow_links(url, page), depth=entry["depth"] + 1)
+                        if added:
+                            logger.debug(f"{url} 发现 {added} 个新页面")
+                elif str(httpx.URL(url)) in self._unchanged_urls:
+                    status = "unchanged"
+                else:
+                    status = "failed"
+                self._frontier_results.append({
+                    "url": url,
+                    "status": status,
+                    "recrawl_interval": entry["recrawl_interval"]
+                })
+
+        logger.info(f"增量爬取 {self.domain} 完成，抓取 {fetched} 个页面，其中 {len(data)} 个有变化，队列状态: {self.frontier.get_status(self.name)}")
+        return data
+
+    def _follow_links(self, url: str, page: Dict[str, Any]) -> List[str]:
+        """
+        找出需要加入增量爬取队列的同站链接
+
+        Args:
+            url: 当前页面地址
+            page: 提取结果
+
+        Returns:
+            页面地址列表
+        """
+        netloc = urlsplit(url).netloc
+        next_urls = []
+        for link in page.get("links", []):
+            next_url = urljoin(url, link["href"])
+            parts = urlsplit(next_url)
+            if parts.scheme not in ("http", "https") or parts.netloc != netloc:
+                continue
+            if self.follow_pattern is None or self.follow_pattern.search(next_url):
+                next_urls.append(next_url)
+        return next_urls
+
+    def _reset_fetch_state(self) -> None:
+        """
+        重置本次运行的条件请求状态和增量爬取结果
+        """
+        super()._reset_fetch_state()
+        # 本次运行的抓取结果，运行成功后写入队列
+        self._frontier_results: List[Dict[str, Any]] = []
+        # 本次运行从队列中取出的页面，运行失败时释放租约
+        self._frontier_leased: List[str] = []
+
+    def _is_unchanged_run(self) -> bool:
+        """
+        增量爬取时没有到期页面也视为内容未变化
+        """
+        if self.frontier is not None and not any(result["status"] == "failed" for result in self._frontier_results):
+            return not self._pending_validators and not self._failed_requests
+        return super()._is_unchanged_run()
+
+    def _take_run_state(self) -> Dict[str, Any]:
+        """
+        取出本次运行暂存的状态，包括增量爬取结果
+        """
+        state = super()._take_run_state()
+        state["frontier_results"] = self._frontier_results
+        state["frontier_leased"] = self._frontier_leased
+        self._frontier_results = []
+        self._frontier_leased = []
+        return state
+
+    def _commit_run_state(self, state: Dict[str, Any]) -> None:
+        """
+        记录保存成功后写入校验信息和增量爬取结果，运行失败时取出的页面在租约到期后重新抓取
+        """
+        super()._commit_run_state(state)
+        if self.frontier is not None and state["frontier_results"]:
+            try:
+                self.frontier.complete(self.name, state["frontier_results"], self.recrawl_interval, self.max_recrawl_interval)
+            except Exception as e:
+                logger.error(f"写入爬取队列失败: {e}")
+
+    def _discard_run_state(self, state: Dict[str, Any]) -> None:
+        """
+        运行失败、被取消或记录保存失败时释放取出的页面的租约，下次运行立即重新抓取
+        """
+        super()._discard_run_state(state)
+        if self.frontier is not None and state["frontier_leased"]:
+            try:
+                self.frontier.reschedule(self.name, state["frontier_leased"])
+            except Exception as e:
+                logger.error(f"释放爬取队列租约失败: {e}")
+
+    async def _crawl_page(self, url: str, conditional: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        请求单个页面并提取字段
+
+        Args:
+            url: 页面地址
+            conditional: 是否按缓存的校验信息发送条件请求
+
+        Returns:
+            提取结果，请求失败、页面未变化或解析失败时返回None
+        """
+        try:
+            response = await self.async_get(url, conditional=conditional)
+            if not response:
+                return None
+            return await self.async_extract(response, self.extract_fields)
+        except Exception as e:
+            logger.error(f"爬取 {url} 失败: {e}")
+            return None
+
+    def _build_record(self, url: str, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        按提取规则构建页面记录
+
+        Args:
+            url: 页面地址
+            page: 提取结果
+
+        Returns:
+            页面记录
+        """
+        record = {
+            "site": self.name,
+            "domain": self.domain,
+            "url": url
+        }
+
+        if "title" in self.parse_fields:
+            record["title"] = page.get("title", "")
+        if "links" in self.parse_fields:
+            links = page.get("links", [])
+            if self.link_pattern is not None:
+                links = [link for link in links if self.link_pattern.search(link["href"])]
+            record["links"] = links
+        if "tables" in self.parse_fields:
+            record["tables"] = page.get("tables", [])
+
+        record["crawl_time"] = self._get_current_time()
+        return record
+
+    def _next_pages(self, url: str, page: Dict[str, Any]) -> List[str]:
+        """
+        按翻页规则找出需要继续爬取的同站页面
+
+        Args:
+            url: 当前页面地址
+            page: 提取结果
+
+        Returns:
+            页面地址列表
+        """
+        if self.pagination_pattern is None:
+            return []
+
+        netloc = urlsplit(url).netloc
+        next_urls = []
+        for link in page.get("links", []):
+            next_url = urljoin(url, link["href"]).split("#", 1)[0]
+            if urlsplit(next_url).netloc == netloc and self.pagination_pattern.search(next_url):
+                next_urls.append(next_url)
+        return next_urls
+
+    def process_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        处理爬取到的数据
+
+        Args:
+            data: 爬取到的数据列表
+
+        Returns:
+            处理后的数据列表
+        """
+        logger.info(f"开始处理 {self.domain} 的数据")
+
+        # 数据清洗和整合
+        processed_data = process_page_records(data, self.name, self.domain)
+
+        logger.info(f"处理 {self.domain} 数据完成，共处理 {len(processed_data)} 条数据")
+        return processed_data
+
+    def save_data(self, data: List[Dict[str, Any]]) -> bool:
+        """
+        保存处理后的数据
+
+        Args:
+            data: 处理后的数据列表
+
+        Returns:
+            保存结果，成功返回True，失败返回False
+        """
+        logger.info(f"开始保存 {self.domain} 的数据")
+
+        try:
+            # 示例：保存到文件
+            import json
+            import os
+            from wumeng_crawler.config.config import BASE_DIR
+
+            # 创建数据目录
+            data_dir = os.path.join(BASE_DIR, "data", self.name)
+            os.makedirs(data_dir, exist_ok=True)
+
+            # 保存数据到JSON文件
+            file_path = os.path.join(data_dir, f"{self._get_current_time().replace(':', '-')}.json")
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+            # 增量更新搜索索引
+            self.index_saved_file(file_path, data)
+
+            logger.info(f"保存 {self.domain} 数据成功，保存路径: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"保存 {self.domain} 数据失败: {e}")
+            return False
+
+    def _normalize_url(self, url: str) -> str:
+        """
+        标准化URL
+
+        Args:
+            url: 原始URL
+
+        Returns:
+            标准化后的URL
+        """
+        return normalize_url(url, self.domain)
+
+    def _get_current_time(self) -> str:
+        """
+        获取当前时间
+
+        Returns:
+            当前时间字符串，格式为YYYY-MM-DD HH:MM:SS
+        """
+        from datetime import datetime
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
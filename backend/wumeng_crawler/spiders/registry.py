@@ -0,0 +1,166 @@
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Dict, Optional, Any, Type, Union
+
+from loguru import logger
+
+from wumeng_crawler.spiders.base_spider import BaseSpider
+
+# 第三方包通过该入口点组注册爬虫类型，如 mysite = "mypkg.spiders:MySiteSpider"
+SPIDER_ENTRY_POINT_GROUP = "wumeng_crawler.spiders"
+
+# 网站配置未指定spider时使用的爬虫类型
+DEFAULT_SPIDER_TYPE = "generic"
+
+# 内置爬虫类型，值为"模块:类名"，首次使用时才导入模块
+_BUILTIN_SPIDERS: Dict[str, str] = {
+    DEFAULT_SPIDER_TYPE: "wumeng_crawler.spiders.generic_spider:GenericSpider"
+}
+
+
+class SpiderRegistry:
+    """
+    爬虫类型注册表
+
+    爬虫类型名称映射到爬虫类，或映射到"模块:类名"形式的导入路径。
+    导入路径和入口点只在创建该类型的爬虫时才加载，未启用的爬虫不会导入其模块。
+    查找顺序：显式注册、内置类型、入口点。
+    """
+
+    def __init__(self):
+        """
+        初始化注册表
+        """
+        self._spiders: Dict[str, Union[str, Type[BaseSpider]]] = dict(_BUILTIN_SPIDERS)
+        self._entry_points: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def register(self, spider_type: str, spider_class: Union[str, Type[BaseSpider]]) -> None:
+        """
+        注册爬虫类型
+
+        Args:
+            spider_type: 爬虫类型名称，网站配置的spider项引用该名称
+            spider_class: 爬虫类，或"模块:类名"形式的导入路径
+        """
+        with self._lock:
+            self._spiders[spider_type] = spider_class
+        logger.info(f"注册爬虫类型: {spider_type}")
+
+    def _discover_entry_points(self) -> Dict[str, Any]:
+        """
+        查找已安装的包通过入口点注册的爬虫类型，只读取元数据，不导入模块
+        """
+        if self._entry_points is None:
+            try:
+                discovered = {ep.name: ep for ep in entry_points(group=SPIDER_ENTRY_POINT_GROUP)}
+            except Exception as e:
+                logger.error(f"查找爬虫入口点失败: {e}")
+                discovered = {}
+            if discovered:
+                logger.info(f"发现爬虫入口点: {sorted(discovered)}")
+            self._entry_points = discovered
+        return self._entry_points
+
+    def get(self, spider_type: str) -> Type[BaseSpider]:
+        """
+        获取爬虫类，首次获取时导入其模块
+
+        Args:
+            spider_type: 爬虫类型名称
+
+        Returns:
+            爬虫类
+
+        Raises:
+            ValueError: 爬虫类型不存在或不是BaseSpider的子类
+        """
+        with self._lock:
+            target = self._spiders.get(spider_type)
+
+        if target is None:
+            entry_point = self._discover_entry_points().get(spider_type)
+            if entry_point is None:
+                raise ValueError(f"未知的爬虫类型: {spider_type}")
+            spider_class = entry_point.load()
+        elif isinstance(target, str):
+            module_name, _, class_name = target.partition(":")
+            spider_class = getattr(importlib.import_module(module_name), class_name)
+        else:
+            spider_class = target
+
+        if not (isinstance(spider_class, type) and issubclass(spider_class, BaseSpider)):
+            raise ValueError(f"爬虫类型 {spider_type} 不是BaseSpider的子类: {spider_class}")
+
+        with self._lock:
+            self._spiders[spider_type] = spider_class
+        return spider_class
+
+    def available(self) -> Dict[str, str]:
+        """
+        列出所有可用的爬虫类型，不导入模块
+
+        Returns:
+            爬虫类型名称到来源的映射
+        """
+        with self._lock:
+            types = {
+                name: target if isinstance(target, str) else f"{target.__module__}:{target.__qualname__}"
+                for name, target in self._spiders.items()
+            }
+        for name, entry_point in self._discover_entry_points().items():
+            types.setdefault(name, entry_point.value)
+        return types
+
+    def create(self, site_config: Dict[str, Any]) -> BaseSpider:
+        """
+        按网站配置创建爬虫
+
+        Args:
+            site_config: 网站配置，spider项为爬虫类型，默认为generic
+
+        Returns:
+            爬虫实例
+        """
+        spider_class = self.get(site_config.get("spider") or DEFAULT_SPIDER_TYPE)
+        return spider_class(site_config)
+
+# 单例模式
+_spider_registry_instance = None
+_spider_registry_lock = threading.Lock()
+
+def get_spider_registry() -> SpiderRegistry:
+    """
+    获取爬虫类型注册表实例
+
+    Returns:
+        爬虫类型注册表实例
+    """
+    global _spider_registry_instance
+    if _spider_registry_instance is None:
+        with _spider_registry_lock:
+            if _spider_registry_instance is None:
+                _spider_registry_instance = SpiderRegistry()
+    return _spider_registry_instance
+
+def register_spider(spider_type: str, spider_class: Union[str, Type[BaseSpider], None] = None):
+    """
+    注册爬虫类型，也可以作为类装饰器使用
+
+    Args:
+        spider_type: 爬虫类型名称
+        spider_class: 爬虫类或导入路径，作为装饰器使用时省略
+
+    Returns:
+        作为装饰器使用时返回装饰器
+    """
+    if spider_class is not None:
+        get_spider_registry().register(spider_type, spider_class)
+        return spider_class
+
+    def decorator(cls: Type[BaseSpider]) -> Type[BaseSpider]:
+        get_spider_registry().register(spider_type, cls)
+        return cls
+
+    return decorator
@@ -1,12 +1,31 @@
-from wumeng_crawler.spiders.wq_spider import WQSpider
-from wumeng_crawler.spiders.ai_spider import AISpider
-from wumeng_crawler.spiders.wi_spider import WISpider
-from wumeng_crawler.spiders.at_spider import ATSpider
+from wumeng_crawler.spiders.registry import get_spider_registry
 from wumeng_crawler.config.config import SPIDER_CONFIG
+from wumeng_crawler.network.http_engine import get_http_engine
+from wumeng_crawler.network.circuit_breaker import get_circuit_breakers
+from wumeng_crawler.network.rate_limiter import get_rate_limiter
+from wumeng_crawler.network.resolver import get_resolver
 from loguru import logger
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
 from datetime import datetime
-import concurrent.futures
+import asyncio
+import queue
+import threading
+import time
+
+def iter_records(spider_results: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    依次产出爬虫结果中的记录
+    
+    Args:
+        spider_results: run_spider或run_all_spiders返回的爬虫结果
+    
+    Yields:
+        记录
+    """
+    for spider_result in spider_results:
+        data = spider_result.get("data")
+        if isinstance(data, list):
+            yield from data
 
 class SpiderManager:
     """
@@ -30,69 +49,175 @@ class SpiderManager:
         # 获取目标网站配置
         target_sites = SPIDER_CONFIG.get("TARGET_SITES", [])
         
+        registry = get_spider_registry()
+        
         for site_config in target_sites:
             if site_config.get("enabled", True):
-                # 根据网站名称创建对应的爬虫实例
+                # 按网站配置的爬虫类型创建爬虫，只导入启用的爬虫类型的模块
                 spider_name = site_config.get("name", "")
+                spider_type = site_config.get("spider") or "generic"
                 
-                if spider_name == "wq":
-                    spider = WQSpider(site_config)
-                elif spider_name == "ai":
-                    spider = AISpider(site_config)
-                elif spider_name == "wi":
-                    spider = WISpider(site_config)
-                elif spider_name == "at":
-                    spider = ATSpider(site_config)
-                else:
-                    logger.warning(f"未知的爬虫名称: {spider_name}，跳过初始化")
+                try:
+                    spider = registry.create(site_config)
+                except Exception as e:
+                    logger.warning(f"创建爬虫 {spider_name} 失败，爬虫类型: {spider_type}，错误: {e}，跳过初始化")
                     continue
                 
                 self.spiders.append(spider)
-                logger.info(f"初始化爬虫成功: {spider_name}")
+                logger.info(f"初始化爬虫成功: {spider_name}，爬虫类型: {spider_type}")
             else:
                 logger.info(f"爬虫 {site_config.get('name')} 已禁用，跳过初始化")
         
         logger.info(f"初始化爬虫完成，共初始化 {len(self.spiders)} 个爬虫")
     
-    def run_all_spiders(self) -> List[Dict[str, Any]]:
+    def run_all_spiders(self, on_spider_done: Optional[Callable[[str, Any, float], None]] = None) -> List[Dict[str, Any]]:
         """
         运行所有爬虫
         
+        Args:
+            on_spider_done: 每个爬虫运行结束时的回调，参数为爬虫名称、运行结果（异常时为异常对象）和耗时（秒），
+                在HTTP引擎的事件循环线程中调用
+        
         Returns:
-            所有爬虫爬取到的数据列表
+            运行成功的爬虫结果列表，每项的data为该爬虫处理后的记录列表，
+            调用方保存记录后需要调用commit_runs或discard_runs；
+            所有记录同时保留在内存中，数据量大时使用stream_all_records
         """
-        logger.info("开始运行所有爬虫")
-        
         all_data = []
         
-        # 使用线程池并行运行爬虫
-        with concurrent.futures.ThreadPoolExecutor(max_workers=SPIDER_CONFIG.get("CONCURRENT_REQUESTS", 4)) as executor:
-            # 提交所有爬虫任务
-            future_to_spider = {
-                executor.submit(spider.run): spider
-                for spider in self.spiders
-            }
-            
-            # 获取任务结果
-            for future in concurrent.futures.as_completed(future_to_spider):
-                spider = future_to_spider[future]
-                try:
-                    result = future.result()
-                    if result:
-                        logger.info(f"爬虫 {spider.name} 运行成功")
-                        all_data.append({
-                            "spider_name": spider.name,
-                            "data": result,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    else:
-                        logger.warning(f"爬虫 {spider.name} 运行失败或未爬取到任何数据")
-                except Exception as e:
-                    logger.error(f"爬虫 {spider.name} 运行异常: {e}")
+        def spider_done(spider_name: str, result: Any, duration: float) -> None:
+            if isinstance(result, list):
+                all_data.append({
+                    "spider_name": spider_name,
+                    "data": result,
+                    "timestamp": datetime.now().isoformat()
+                })
+            if on_spider_done is not None:
+                on_spider_done(spider_name, result, duration)
+        
+        self._run_spiders(spider_done)
         
         logger.info(f"所有爬虫运行完成，共获取到 {len(all_data)} 个爬虫的数据")
         return all_data
     
+    def _run_spiders(self, on_spider_done: Callable[[str, Any, float], None]) -> None:
+        """
+        在共享HTTP引擎的事件循环中并发运行所有未停止的爬虫，每个爬虫的结果只交给回调，不在此处保留
+        
+        Args:
+            on_spider_done: 每个爬虫运行结束时的回调，参数同run_all_spiders
+        """
+        logger.info("开始运行所有爬虫")
+        
+        # 已停止的爬虫不参与运行
+        spiders = [spider for spider in self.spiders if not spider.stopped]
+        
+        get_http_engine().run(self._run_all_async(spiders, on_spider_done))
+    
+    def stream_all_records(self, on_spider_done: Optional[Callable[[str, Any, float], None]] = None, commit: bool = True) -> Iterator[List[Dict[str, Any]]]:
+        """
+        在后台线程中运行所有爬虫，每个爬虫运行结束后立即产出其记录列表，不等待其他爬虫
+        
+        消费者取下一批记录时视为上一批已保存成功，提交对应爬虫的运行状态；
+        消费者处理某一批时出错并关闭生成器，则丢弃对应爬虫的运行状态，下次运行重新抓取。
+        记录只在交给消费者之前保留在队列中，消费者处理完的批次即可释放。
+        
+        Args:
+            on_spider_done: 每个爬虫运行结束时的回调，参数同run_all_spiders
+            commit: 是否逐批提交运行状态，为False时由调用方在所有记录保存后调用commit_runs或discard_runs
+        
+        Yields:
+            单个爬虫处理后的记录列表
+        """
+        finished: "queue.Queue[Optional[Tuple[Any, List[Dict[str, Any]]]]]" = queue.Queue()
+        errors: List[BaseException] = []
+        
+        def spider_done(spider_name: str, result: Any, duration: float) -> None:
+            if isinstance(result, list) and result:
+                finished.put((self.get_spider(spider_name), result))
+            if on_spider_done is not None:
+                on_spider_done(spider_name, result, duration)
+        
+        def run() -> None:
+            try:
+                self._run_spiders(spider_done)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                finished.put(None)
+        
+        thread = threading.Thread(target=run, name="spider-stream", daemon=True)
+        thread.start()
+        
+        while True:
+            item = finished.get()
+            if item is None:
+                break
+            spider, records = item
+            if not commit:
+                yield records
+                continue
+            try:
+                yield records
+            except BaseException:
+                spider.discard_run()
+                raise
+            spider.commit_run()
+        
+        thread.join()
+        if errors:
+            raise errors[0]
+    
+    async def _run_all_async(self, spiders: List[Any], on_spider_done: Optional[Callable[[str, Any, float], None]] = None) -> List[Any]:
+        """
+        并发运行多个爬虫
+        
+        Args:
+            spiders: 需要运行的爬虫列表
+            on_spider_done: 每个爬虫运行结束时的回调
+        
+        Returns:
+            与爬虫列表一一对应的记录数，运行失败时为None，运行异常时为异常对象
+        """
+        return await asyncio.gather(
+            *(self._run_one_async(spider, on_spider_done) for spider in spiders),
+            return_exceptions=True
+        )
+    
+    async def _run_one_async(self, spider, on_spider_done: Optional[Callable[[str, Any, float], None]] = None) -> Any:
+        """
+        运行单个爬虫，结束时调用回调
+        
+        Args:
+            spider: 爬虫实例
+            on_spider_done: 运行结束时的回调
+        
+        Returns:
+            记录数，运行失败时为None；记录只交给回调，不作为返回值保留
+        """
+        started = time.monotonic()
+        try:
+            result = await spider.run_async()
+        except Exception as e:
+            result = e
+        
+        if isinstance(result, Exception):
+            logger.error(f"爬虫 {spider.name} 运行异常: {result}")
+        elif result is not None:
+            logger.info(f"爬虫 {spider.name} 运行成功，共 {len(result)} 条记录")
+        else:
+            logger.warning(f"爬虫 {spider.name} 运行失败或未爬取到任何数据")
+        
+        if on_spider_done is not None:
+            try:
+                on_spider_done(spider.name, result, time.monotonic() - started)
+            except Exception as e:
+                logger.error(f"爬虫 {spider.name} 运行结束回调异常: {e}")
+        
+        if isinstance(result, Exception):
+            raise result
+        return len(result) if result is not None else None
+    
     def run_spider(self, spider_name: str) -> Dict[str, Any]:
         """
         运行指定名称的爬虫
@@ -101,17 +226,26 @@ class SpiderManager:
             spider_name: 爬虫名称
             
         Returns:
-            爬虫爬取到的数据，如果运行失败则返回空字典
+            爬虫结果，data为处理后的记录列表，运行失败时data为空列表并包含error；
+            调用方保存记录后需要调用commit_runs或discard_runs
         """
         logger.info(f"开始运行爬虫: {spider_name}")
         
         # 查找指定名称的爬虫
         for spider in self.spiders:
             if spider.name == spider_name:
+                if spider.stopped:
+                    logger.warning(f"爬虫 {spider_name} 已停止，跳过运行")
+                    return {
+                        "spider_name": spider_name,
+                        "data": [],
+                        "timestamp": datetime.now().isoformat(),
+                        "error": f"爬虫 {spider_name} 已停止"
+                    }
                 try:
                     result = spider.run()
-                    if result:
-                        logger.info(f"爬虫 {spider_name} 运行成功")
+                    if result is not None:
+                        logger.info(f"爬虫 {spider_name} 运行成功，共 {len(result)} 条记录")
                         return {
                             "spider_name": spider_name,
                             "data": result,
@@ -122,7 +256,8 @@ class SpiderManager:
                         return {
                             "spider_name": spider_name,
                             "data": [],
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": datetime.now().isoformat(),
+                            "error": f"爬虫 {spider_name} 运行失败或未爬取到任何数据"
                         }
                 except Exception as e:
                     logger.error(f"爬虫 {spider_name} 运行异常: {e}")
@@ -141,6 +276,30 @@ class SpiderManager:
             "error": f"未找到名称为 {spider_name} 的爬虫"
         }
     
+    def commit_runs(self, spider_results: List[Dict[str, Any]]) -> None:
+        """
+        爬虫结果中的记录保存成功后，提交这些爬虫本次运行的状态
+        
+        Args:
+            spider_results: run_spider或run_all_spiders返回的爬虫结果
+        """
+        for spider_result in spider_results:
+            spider = self.get_spider(spider_result.get("spider_name"))
+            if spider is not None and "error" not in spider_result:
+                spider.commit_run()
+    
+    def discard_runs(self, spider_results: List[Dict[str, Any]]) -> None:
+        """
+        爬虫结果中的记录保存失败时，丢弃这些爬虫本次运行的状态，下次运行重新抓取
+        
+        Args:
+            spider_results: run_spider或run_all_spiders返回的爬虫结果
+        """
+        for spider_result in spider_results:
+            spider = self.get_spider(spider_result.get("spider_name"))
+            if spider is not None:
+                spider.discard_run()
+    
     def get_spider_status(self) -> List[Dict[str, Any]]:
         """
         获取所有爬虫的状态
@@ -151,32 +310,149 @@ class SpiderManager:
         logger.info("获取所有爬虫状态")
         
         status_list = []
+        circuit_breakers = get_circuit_breakers()
+        rate_limiter = get_rate_limiter()
+        resolver = get_resolver()
         
         for spider in self.spiders:
             status = {
                 "name": spider.name,
                 "domain": spider.domain,
                 "ip": spider.ip,
-                "enabled": spider.enabled
+                "enabled": spider.enabled,
+                "state": spider.state,
+                "last_run": dict(spider.last_run),
+                "circuit_breaker": circuit_breakers.breaker(spider.domain).get_status(),
+                "rate_limit": rate_limiter.bucket(spider.domain).get_status(),
+                "paths": resolver.get_path_status(spider.domain)
             }
+            if getattr(spider, "frontier", None) is not None:
+                status["frontier"] = spider.frontier.get_status(spider.name)
             status_list.append(status)
         
         logger.info(f"获取爬虫状态完成，共 {len(status_list)} 个爬虫")
         return status_list
     
-    def close_all_spiders(self) -> None:
+    def get_spider(self, spider_name: str):
+        """
+        获取指定名称的爬虫
+        
+        Args:
+            spider_name: 爬虫名称
+            
+        Returns:
+            爬虫实例，不存在时返回None
+        """
+        for spider in self.spiders:
+            if spider.name == spider_name:
+                return spider
+        return None
+    
+    def start_spider(self, spider_name: str) -> bool:
+        """
+        启动指定名称的爬虫
+        
+        Args:
+            spider_name: 爬虫名称
+            
+        Returns:
+            爬虫存在返回True，否则返回False
+        """
+        spider = self.get_spider(spider_name)
+        if spider is None:
+            logger.error(f"未找到名称为 {spider_name} 的爬虫")
+            return False
+        spider.start()
+        return True
+    
+    def stop_spider(self, spider_name: str) -> bool:
+        """
+        停止指定名称的爬虫并取消它等待中的请求，不影响其他爬虫
+        
+        Args:
+            spider_name: 爬虫名称
+            
+        Returns:
+            爬虫存在返回True，否则返回False
+        """
+        spider = self.get_spider(spider_name)
+        if spider is None:
+            logger.error(f"未找到名称为 {spider_name} 的爬虫")
+            return False
+        spider.stop()
+        return True
+    
+    def start_all_spiders(self) -> None:
+        """
+        启动所有爬虫，撤销close_all_spiders的停止状态
+        """
+        logger.info("开始启动所有爬虫")
+        
+        for spider in self.spiders:
+            try:
+                spider.start()
+            except Exception as e:
+                logger.error(f"启动爬虫 {spider.name} 失败: {e}")
+        
+        logger.info("启动所有爬虫完成")
+    
+    def close_all_spiders(self, cancel: bool = True) -> None:
         """
-        关闭所有爬虫
+        停止所有爬虫，连接池保留，爬虫重新启动后继续复用
+        
+        爬虫保持停止状态，之后的手动和定时运行都被拒绝，直到调用start_all_spiders或start_spider
+        
+        Args:
+            cancel: 是否取消正在进行的运行
         """
-        logger.info("开始关闭所有爬虫")
+        logger.info("开始停止所有爬虫")
         
         for spider in self.spiders:
             try:
-                spider.close()
+                spider.stop(cancel=cancel)
             except Exception as e:
-                logger.error(f"关闭爬虫 {spider.name} 失败: {e}")
+                logger.error(f"停止爬虫 {spider.name} 失败: {e}")
+        
+        logger.info("停止所有爬虫完成")
+    
+    def _wait_idle(self, timeout: float) -> bool:
+        """
+        等待所有爬虫的运行结束
+        
+        Args:
+            timeout: 最长等待时间（秒）
+            
+        Returns:
+            所有爬虫都已结束运行返回True，超时返回False
+        """
+        deadline = time.monotonic() + timeout
+        while any(spider.running for spider in self.spiders):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+        return True
+    
+    def shutdown(self, drain_timeout: Optional[float] = None) -> None:
+        """
+        平滑关闭：停止所有爬虫，等待正在进行的运行结束，超时后取消未完成的请求，
+        最后关闭共享HTTP引擎的连接池，应用退出时调用
+        
+        Args:
+            drain_timeout: 等待运行结束的时间（秒），默认取SHUTDOWN_DRAIN_TIMEOUT
+        """
+        if drain_timeout is None:
+            drain_timeout = SPIDER_CONFIG.get("SHUTDOWN_DRAIN_TIMEOUT", 10)
+        
+        # 不再开始新的运行，正在进行的运行继续完成
+        self.close_all_spiders(cancel=False)
+        
+        if not self._wait_idle(drain_timeout):
+            running = [spider.name for spider in self.spiders if spider.running]
+            logger.warning(f"等待爬虫结束超时，取消正在运行的爬虫: {running}")
+            self.close_all_spiders(cancel=True)
+            self._wait_idle(drain_timeout)
         
-        logger.info("关闭所有爬虫完成")
+        get_http_engine().close()
     
     def __enter__(self):
         """
@@ -186,9 +462,9 @@ class SpiderManager:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        退出上下文管理器，关闭所有爬虫
+        退出上下文管理器，停止所有爬虫并关闭连接池
         """
-        self.close_all_spiders()
+        self.shutdown()
     
     def __len__(self):
         """
@@ -0,0 +1,199 @@
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from typing import Dict, Optional, Any, Callable
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from loguru import logger
+
+from wumeng_crawler.config.config import SCHEDULER_CONFIG
+
+# 调度配置中爬虫名称的后缀，如wq_spider对应爬虫wq
+SCHEDULE_KEY_SUFFIX = "_spider"
+
+
+def schedule_key_to_spider_name(key: str) -> str:
+    """
+    将调度配置的键转换为爬虫名称
+
+    Args:
+        key: 调度配置的键，如wq_spider
+
+    Returns:
+        爬虫名称，如wq
+    """
+    if key.endswith(SCHEDULE_KEY_SUFFIX):
+        return key[:-len(SCHEDULE_KEY_SUFFIX)]
+    return key
+
+
+class SpiderScheduler:
+    """
+    进程内的爬虫定时调度器
+
+    按cron表达式定时运行爬虫，同时运行的任务数不超过max_concurrent，
+    同一个爬虫上一次运行未结束时跳过本次运行，每次触发时间随机推迟0到jitter秒，
+    避免多个爬虫在整点同时发起请求。
+    """
+
+    def __init__(
+        self,
+        schedule: Dict[str, Dict[str, Any]],
+        run_func: Callable[[str], Any],
+        max_concurrent: int = 4,
+        jitter: int = 30,
+        timezone: str = "Asia/Shanghai"
+    ):
+        """
+        初始化调度器
+
+        Args:
+            schedule: 调度配置，键为爬虫名称或“名称_spider”，值包含cron和enabled
+            run_func: 运行单个爬虫的函数，参数为爬虫名称
+            max_concurrent: 同时运行的任务数
+            jitter: 触发时间随机推迟的最大秒数
+            timezone: cron表达式使用的时区
+        """
+        self.schedule = schedule
+        self.run_func = run_func
+        self.max_concurrent = max(1, max_concurrent)
+        self.jitter = jitter
+        self.timezone = timezone
+
+        self._scheduler: Optional[BackgroundScheduler] = None
+        # 爬虫名称到cron表达式的映射
+        self._entries: Dict[str, str] = {}
+        # 爬虫名称到最近一次运行信息的映射
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        启动调度器，注册所有启用的调度项
+        """
+        if self._scheduler is not None:
+            return
+
+        scheduler = BackgroundScheduler(
+            executors={"default": ThreadPoolExecutor(self.max_concurrent)},
+            job_defaults={
+                # 同一个爬虫不重叠运行，错过的多次触发只补跑一次
+                "max_instances": 1,
+                "coalesce": True,
+                "misfire_grace_time": 60
+            },
+            timezone=self.timezone
+        )
+
+        for key, entry in self.schedule.items():
+            spider_name = schedule_key_to_spider_name(key)
+            if not entry.get("enabled", True):
+                logger.info(f"爬虫 {spider_name} 的定时调度已禁用")
+                continue
+
+            cron = entry.get("cron")
+            try:
+                trigger = CronTrigger.from_crontab(cron, timezone=self.timezone)
+            except (TypeError, ValueError) as e:
+                logger.error(f"爬虫 {spider_name} 的cron表达式无效: {cron}，错误: {e}")
+                continue
+            trigger.jitter = self.jitter or None
+
+            scheduler.add_job(
+                self._run,
+                trigger,
+                args=[spider_name],
+                id=spider_name,
+                name=f"定时运行爬虫 {spider_name}",
+                replace_existing=True
+            )
+            self._entries[spider_name] = cron
+            logger.info(f"注册爬虫定时调度: {spider_name}，cron: {cron}")
+
+        scheduler.start()
+        self._scheduler = scheduler
+        logger.info(f"启动爬虫定时调度器，共 {len(self._entries)} 个调度项，并发任务数: {self.max_concurrent}")
+
+    def _run(self, spider_name: str) -> None:
+        """
+        运行爬虫并记录运行时间和结果
+        """
+        started_at = datetime.now(ZoneInfo(self.timezone))
+        started = time.monotonic()
+        with self._lock:
+            run = self._runs.setdefault(spider_name, {})
+            run.update(running=True, last_start_time=started_at.isoformat())
+
+        logger.info(f"定时运行爬虫: {spider_name}")
+        status = "success"
+        try:
+            self.run_func(spider_name)
+        except Exception as e:
+            status = "error"
+            logger.error(f"定时运行爬虫 {spider_name} 异常: {e}")
+        finally:
+            duration = time.monotonic() - started
+            with self._lock:
+                run.update(running=False, last_duration=round(duration, 3), last_status=status)
+            logger.info(f"定时运行爬虫 {spider_name} 结束，耗时 {duration:.2f} 秒")
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取所有调度项的状态
+
+        Returns:
+            爬虫名称到调度状态的映射，包含cron、下次运行时间和最近一次运行耗时
+        """
+        status = {}
+        for spider_name, cron in self._entries.items():
+            job = self._scheduler.get_job(spider_name) if self._scheduler is not None else None
+            next_run_time = job.next_run_time if job is not None else None
+            with self._lock:
+                run = dict(self._runs.get(spider_name, {}))
+
+            status[spider_name] = {
+                "cron": cron,
+                "enabled": True,
+                "next_run_time": next_run_time.isoformat() if next_run_time else None,
+                "running": run.get("running", False),
+                "last_start_time": run.get("last_start_time"),
+                "last_duration": run.get("last_duration"),
+                "last_status": run.get("last_status")
+            }
+        return status
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        停止调度器
+
+        Args:
+            wait: 是否等待正在运行的任务结束
+        """
+        if self._scheduler is None:
+            return
+        self._scheduler.shutdown(wait=wait)
+        self._scheduler = None
+        self._entries.clear()
+        logger.info("停止爬虫定时调度器")
+
+
+def create_spider_scheduler(run_func: Callable[[str], Any], schedule: Optional[Dict[str, Dict[str, Any]]] = None) -> SpiderScheduler:
+    """
+    按SCHEDULER_CONFIG创建调度器
+
+    Args:
+        run_func: 运行单个爬虫的函数
+        schedule: 调度配置，默认取SCHEDULER_CONFIG["TASK_SCHEDULE"]
+
+    Returns:
+        调度器实例
+    """
+    return SpiderScheduler(
+        schedule if schedule is not None else SCHEDULER_CONFIG.get("TASK_SCHEDULE", {}),
+        run_func,
+        max_concurrent=SCHEDULER_CONFIG.get("CONCURRENT_TASKS", 4),
+        jitter=SCHEDULER_CONFIG.get("SCHEDULE_JITTER", 30)
+    )
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+from loguru import logger
+
+from wumeng_crawler.config.config import STORAGE_CONFIG
+
+
+class ParsedFileCache:
+    """
+    进程内共享的已解析数据文件缓存
+
+    缓存以(路径, 修改时间, 文件大小)为键，文件变化后自动失效；
+    按文件字节数计算内存预算，超出预算时淘汰最久未使用的文件。
+    缓存的数据对象在多个调用方之间共享，调用方不能修改。
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        初始化文件缓存
+
+        Args:
+            max_bytes: 缓存预算，按文件字节数计算
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, file_path: str) -> Tuple[Any, float]:
+        """
+        读取并解析JSON数据文件，文件未变化时直接返回缓存
+
+        Args:
+            file_path: 数据文件路径
+
+        Returns:
+            (解析后的数据, 文件修改时间)
+        """
+        stat = os.stat(file_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry[1], stat.st_mtime
+            self.misses += 1
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        with self._lock:
+            self._put(file_path, key, data, stat.st_size)
+
+        return data, stat.st_mtime
+
+    def _put(self, file_path: str, key: Tuple[int, int], data: Any, size: int) -> None:
+        """
+        写入缓存并按预算淘汰，需持有锁
+        """
+        old = self._entries.pop(file_path, None)
+        if old is not None:
+            self._bytes -= old[2]
+
+        # 单个文件超出预算时不缓存
+        if size > self.max_bytes:
+            return
+
+        self._entries[file_path] = (key, data, size)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self, file_path: str) -> None:
+        """
+        移除指定文件的缓存
+
+        Args:
+            file_path: 数据文件路径
+        """
+        with self._lock:
+            old = self._entries.pop(file_path, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        logger.info("已清空数据文件缓存")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            缓存统计信息，包含命中、未命中和淘汰次数
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
+
+# 单例模式
+_file_cache_instance = None
+_file_cache_lock = threading.Lock()
+
+def get_file_cache() -> ParsedFileCache:
+    """
+    获取数据文件缓存实例
+
+    Returns:
+        数据文件缓存实例
+    """
+    global _file_cache_instance
+    if _file_cache_instance is None:
+        with _file_cache_lock:
+            if _file_cache_instance is None:
+                _file_cache_instance = ParsedFileCache(STORAGE_CONFIG["FILE_CACHE_MAX_BYTES"])
+    return _file_cache_instance
@@ -0,0 +1,295 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Any, Iterable
+from urllib.parse import urlsplit, urlunsplit
+
+from loguru import logger
+
+from wumeng_crawler.config.config import STORAGE_CONFIG, SPIDER_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    spider TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    priority REAL NOT NULL,
+    next_fetch REAL NOT NULL,
+    last_fetch REAL,
+    recrawl_interval REAL,
+    fetch_count INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (spider, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_frontier_due ON frontier (spider, next_fetch, priority);
+"""
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化URL，去掉片段，协议和主机名转为小写，空路径补为/
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    计算URL的64位指纹，作为已见URL集合的键
+
+    Args:
+        url: 规范化后的URL
+
+    Returns:
+        有符号64位整数，可以直接作为SQLite的整数键
+    """
+    return int.from_bytes(hashlib.sha1(url.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+class CrawlFrontier:
+    """
+    持久化的增量爬取队列
+
+    按爬虫保存已发现的URL，URL以64位指纹去重，同一个URL只入队一次。
+    每个URL记录深度、优先级和下次抓取时间，取出时按优先级排序并限制每个主机的数量，
+    取出的URL在租约时间内不会再次取出，运行中断时租约到期后自动重新抓取。
+    抓取完成后按重抓间隔安排下次抓取：页面未变化时间隔加倍，页面变化时恢复为初始间隔。
+    """
+
+    def __init__(self, frontier_path: str, lease_timeout: float = 600):
+        """
+        初始化爬取队列
+
+        Args:
+            frontier_path: 队列数据库文件路径
+            lease_timeout: 取出URL的租约时间（秒）
+        """
+        self.frontier_path = frontier_path
+        self.lease_timeout = lease_timeout
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(frontier_path), exist_ok=True)
+        self._conn = sqlite3.connect(frontier_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        logger.info(f"初始化爬取队列: {frontier_path}")
+
+    def add(self, spider: str, urls: Iterable[str], depth: int, priority: Optional[float] = None) -> int:
+        """
+        把新发现的URL加入队列，已见过的URL忽略
+
+        Args:
+            spider: 爬虫名称
+            urls: URL列表
+            depth: URL的深度，起始页面为0
+            priority: 优先级，数值越小越先抓取，默认为深度
+
+        Returns:
+            新加入的URL数量
+        """
+        now = time.time()
+        rows = []
+        for url in urls:
+            url = canonicalize_url(url)
+            rows.append((
+                spider,
+                url_fingerprint(url),
+                url,
+                urlsplit(url).netloc,
+                depth,
+                depth if priority is None else priority,
+                now
+            ))
+        if not rows:
+            return 0
+
+        with self._lock:
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO frontier (spider, fingerprint, url, host, depth, priority, next_fetch) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                return self._conn.total_changes - before
+
+    def next_batch(self, spider: str, limit: int, per_host: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        取出到期的URL，按优先级和到期时间排序，并为取出的URL设置租约
+
+        Args:
+            spider: 爬虫名称
+            limit: 最多取出的数量
+            per_host: 每个主机最多取出的数量，为空时不限制
+
+        Returns:
+            URL信息列表，包含url、depth、recrawl_interval和fetch_count
+        """
+        if limit <= 0:
+            return []
+
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint, url, host, depth, recrawl_interval, fetch_count FROM frontier "
+                "WHERE spider = ? AND next_fetch <= ? ORDER BY priority, next_fetch LIMIT ?",
+                (spider, now, limit * 4 if per_host else limit)
+            ).fetchall()
+
+            batch = []
+            host_counts: Dict[str, int] = {}
+            for fingerprint, url, host, depth, recrawl_interval, fetch_count in rows:
+                if per_host and host_counts.get(host, 0) >= per_host:
+                    continue
+                host_counts[host] = host_counts.get(host, 0) + 1
+                batch.append({
+                    "fingerprint": fingerprint,
+                    "url": url,
+                    "depth": depth,
+                    "recrawl_interval": recrawl_interval,
+                    "fetch_count": fetch_count
+                })
+                if len(batch) >= limit:
+                    break
+
+            if batch:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE frontier SET next_fetch = ? WHERE spider = ? AND fingerprint = ?",
+                        [(now + self.lease_timeout, spider, entry["fingerprint"]) for entry in batch]
+                    )
+        return batch
+
+    def complete(self, spider: str, results: Iterable[Dict[str, Any]], recrawl_interval: float, max_recrawl_interval: float) -> None:
+        """
+        记录抓取结果并安排下次抓取
+
+        Args:
+            spider: 爬虫名称
+            results: 抓取结果列表，每项包含url和status，status为changed、unchanged或failed
+            recrawl_interval: 页面变化时的重抓间隔（秒）
+            max_recrawl_interval: 页面持续未变化时重抓间隔的上限（秒）
+        """
+        now = time.time()
+        rows = []
+        for result in results:
+            url = canonicalize_url(result["url"])
+            status = result["status"]
+            current_interval = result.get("recrawl_interval") or recrawl_interval
+            if status == "failed":
+                # 失败的URL按当前间隔重试，不改变间隔
+                rows.append((now + current_interval, now, result.get("recrawl_interval"), 0, 1, spider, url_fingerprint(url)))
+                continue
+
+            if status == "unchanged":
+                interval = min(max_recrawl_interval, current_interval * 2)
+            else:
+                interval = recrawl_interval
+            rows.append((now + interval, now, interval, 1, 0, spider, url_fingerprint(url)))
+        if not rows:
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE frontier SET next_fetch = ?, last_fetch = ?, recrawl_interval = ?, "
+                    "fetch_count = fetch_count + ?, failures = failures + ? "
+                    "WHERE spider = ? AND fingerprint = ?",
+                    rows
+                )
+
+    def reschedule(self, spider: str, urls: Iterable[str]) -> None:
+        """
+        释放租约，URL立即重新到期，用于取出后未完成抓取的URL（运行失败、被取消或记录未保存）
+
+        Args:
+            spider: 爬虫名称
+            urls: URL列表
+        """
+        now = time.time()
+        rows = [(now, spider, url_fingerprint(canonicalize_url(url))) for url in urls]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE frontier SET next_fetch = ? WHERE spider = ? AND fingerprint = ?",
+                    rows
+                )
+
+    def get_status(self, spider: str) -> Dict[str, Any]:
+        """
+        获取爬虫的队列统计
+
+        Args:
+            spider: 爬虫名称
+
+        Returns:
+            队列统计，包含URL总数、到期数量、已抓取数量和最大深度
+        """
+        with self._lock:
+            total, due, fetched, max_depth = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(next_fetch <= ?), 0), COALESCE(SUM(fetch_count > 0), 0), MAX(depth) "
+                "FROM frontier WHERE spider = ?",
+                (time.time(), spider)
+            ).fetchone()
+        return {
+            "urls": total,
+            "due": due,
+            "fetched": fetched,
+            "max_depth": max_depth
+        }
+
+    def clear(self, spider: str) -> None:
+        """
+        清空爬虫的队列，下次运行从起始页面重新发现
+
+        重新入队的URL抓取次数为0，爬虫抓取时不发送条件请求，即使HTTP校验信息缓存中有记录也会重新提取链接
+
+        Args:
+            spider: 爬虫名称
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM frontier WHERE spider = ?", (spider,))
+
+    def close(self) -> None:
+        """
+        关闭队列数据库连接
+        """
+        with self._lock:
+            self._conn.close()
+        logger.info(f"关闭爬取队列: {self.frontier_path}")
+
+# 单例模式
+_frontier_instance = None
+_frontier_lock = threading.Lock()
+
+def get_frontier() -> CrawlFrontier:
+    """
+    获取爬取队列实例
+
+    Returns:
+        爬取队列实例
+    """
+    global _frontier_instance
+    if _frontier_instance is None:
+        with _frontier_lock:
+            if _frontier_instance is None:
+                _frontier_instance = CrawlFrontier(
+                    STORAGE_CONFIG["FRONTIER_PATH"],
+                    lease_timeout=SPIDER_CONFIG.get("FRONTIER_LEASE_TIMEOUT", 600)
+                )
+    return _frontier_instance
@@ -0,0 +1,262 @@
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterable, Sequence
+
+from loguru import logger
+
+from wumeng_crawler.config.config import PROCESSOR_CONFIG
+
+# 单独成列的字段，其他字段以JSON字符串保存在extra列中
+PARQUET_COLUMNS = ("site", "domain", "url", "title", "crawl_time", "links", "tables")
+
+# 使用字典编码的低基数字段
+PARQUET_DICTIONARY_COLUMNS = ("site", "domain")
+
+# 保存其他字段的列
+PARQUET_EXTRA_COLUMN = "extra"
+
+# 单独成列的字段的值不符合列类型时（如链接带有其他键、表格单元格为数字），以JSON字符串原样保存在该列中
+PARQUET_OVERFLOW_COLUMN = "overflow"
+
+# 爬取时间的字符串格式
+CRAWL_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 链接的键
+LINK_KEYS = {"text", "href"}
+
+
+def _import_pyarrow():
+    """
+    导入pyarrow，pyarrow是可选依赖，只有读写Parquet文件时才需要
+
+    Returns:
+        (pyarrow, pyarrow.parquet)
+
+    Raises:
+        ImportError: 未安装pyarrow
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("读写Parquet文件需要安装pyarrow: pip install pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+
+def parquet_schema():
+    """
+    获取爬取数据的Parquet表结构
+
+    Returns:
+        pyarrow表结构
+    """
+    pa, _ = _import_pyarrow()
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        pa.field("site", dictionary_string),
+        pa.field("domain", dictionary_string),
+        pa.field("url", pa.string()),
+        pa.field("title", pa.string()),
+        pa.field("crawl_time", pa.timestamp("s")),
+        pa.field("links", pa.list_(pa.struct([pa.field("text", pa.string()), pa.field("href", pa.string())]))),
+        pa.field("tables", pa.list_(pa.list_(pa.list_(pa.string())))),
+        pa.field(PARQUET_EXTRA_COLUMN, pa.string()),
+        pa.field(PARQUET_OVERFLOW_COLUMN, pa.string())
+    ])
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    """
+    把爬取时间转换为datetime，无法解析时返回None
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, CRAWL_TIME_FORMAT)
+        except ValueError:
+            return None
+    return None
+
+
+def _is_text(value: Any) -> bool:
+    return value is None or isinstance(value, str)
+
+
+def _conforms(name: str, value: Any) -> bool:
+    """
+    检查字段的值是否可以原样保存在对应的列中
+    """
+    if value is None:
+        return True
+    if name == "links":
+        return isinstance(value, list) and all(
+            isinstance(link, dict) and link.keys() == LINK_KEYS and all(_is_text(item) for item in link.values())
+            for link in value
+        )
+    if name == "tables":
+        return isinstance(value, list) and all(
+            isinstance(table, list) and all(
+                isinstance(row, list) and all(_is_text(cell) for cell in row)
+                for row in table
+            )
+            for table in value
+        )
+    if name == "crawl_time":
+        # 只有能解析且能按原格式还原的时间保存在时间列中
+        return isinstance(value, str) and _to_timestamp(value) is not None \
+            and _to_timestamp(value).strftime(CRAWL_TIME_FORMAT) == value
+    return isinstance(value, str)
+
+
+def _dump_json(value: Dict[str, Any]) -> Optional[str]:
+    return json.dumps(value, ensure_ascii=False, default=str) if value else None
+
+
+def records_to_columns(records: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    把数据项转换为按列排列的数据
+
+    单独成列的字段的值不符合列类型时，该列为空，值保存在overflow列中，读取时原样还原，
+    一条数据的格式不影响同一行组中的其他数据写入。
+
+    Args:
+        records: 数据项列表
+
+    Returns:
+        列名到列数据的映射
+    """
+    columns: Dict[str, List[Any]] = {
+        name: [] for name in PARQUET_COLUMNS + (PARQUET_EXTRA_COLUMN, PARQUET_OVERFLOW_COLUMN)
+    }
+    for record in records:
+        overflow = {}
+        for name in PARQUET_COLUMNS:
+            value = record.get(name)
+            if not _conforms(name, value):
+                overflow[name] = value
+                value = None
+            columns[name].append(_to_timestamp(value) if name == "crawl_time" else value)
+
+        extra = {key: value for key, value in record.items() if key not in PARQUET_COLUMNS}
+        columns[PARQUET_EXTRA_COLUMN].append(_dump_json(extra))
+        columns[PARQUET_OVERFLOW_COLUMN].append(_dump_json(overflow))
+    return columns
+
+
+class ParquetRecordWriter:
+    """
+    按行组流式写入爬取数据的Parquet文件
+
+    数据先缓冲在内存中，凑满一个行组后写入文件，内存中最多保留一个行组的数据。
+    site和domain使用字典编码，整个文件使用zstd压缩。
+    """
+
+    def __init__(self, where: Any, row_group_size: Optional[int] = None, compression: Optional[str] = None):
+        """
+        初始化写入器
+
+        Args:
+            where: 文件路径或可写的文件对象
+            row_group_size: 每个行组的数据数量，默认取配置PARQUET_ROW_GROUP_SIZE
+            compression: 压缩算法，默认取配置PARQUET_COMPRESSION
+        """
+        pa, pq = _import_pyarrow()
+        self._pa = pa
+        self.schema = parquet_schema()
+        self.row_group_size = max(1, row_group_size or PROCESSOR_CONFIG.get("PARQUET_ROW_GROUP_SIZE", 50000))
+        self.compression = compression or PROCESSOR_CONFIG.get("PARQUET_COMPRESSION", "zstd")
+        self.rows = 0
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer = pq.ParquetWriter(
+            where,
+            self.schema,
+            compression=self.compression,
+            use_dictionary=list(PARQUET_DICTIONARY_COLUMNS)
+        )
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        写入数据，缓冲的数据凑满行组后写入文件
+
+        Args:
+            records: 数据项列表
+        """
+        self._buffer.extend(records)
+        while len(self._buffer) >= self.row_group_size:
+            self._flush(self._buffer[:self.row_group_size])
+            del self._buffer[:self.row_group_size]
+
+    def _flush(self, records: List[Dict[str, Any]]) -> None:
+        """
+        把一批数据作为一个行组写入文件
+        """
+        table = self._pa.Table.from_pydict(records_to_columns(records), schema=self.schema)
+        self._writer.write_table(table, row_group_size=len(records))
+        self.rows += len(records)
+
+    def close(self) -> None:
+        """
+        写入剩余的数据并关闭文件
+        """
+        if self._buffer:
+            self._flush(self._buffer)
+            self._buffer = []
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_parquet_records(file_path: str, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    读取Parquet文件中的数据，只读取选择的列
+
+    Args:
+        file_path: 文件路径
+        columns: 需要读取的字段，为空时读取所有字段；不是单独成列的字段从extra列中读取
+
+    Returns:
+        数据项列表
+    """
+    _, pq = _import_pyarrow()
+
+    read_columns = None
+    extra_fields = None
+    overflow_fields = None
+    if columns is not None:
+        read_columns = [column for column in columns if column in PARQUET_COLUMNS]
+        extra_fields = [column for column in columns if column not in PARQUET_COLUMNS]
+        overflow_fields = list(read_columns)
+        if extra_fields:
+            read_columns.append(PARQUET_EXTRA_COLUMN)
+        # 旧文件没有overflow列
+        if overflow_fields and PARQUET_OVERFLOW_COLUMN in pq.read_schema(file_path).names:
+            read_columns.append(PARQUET_OVERFLOW_COLUMN)
+
+    table = pq.read_table(file_path, columns=read_columns)
+    logger.debug(f"读取Parquet文件: {file_path}，列: {table.column_names}，共 {table.num_rows} 行")
+
+    records = []
+    for row in table.to_pylist():
+        extra = row.pop(PARQUET_EXTRA_COLUMN, None)
+        overflow = row.pop(PARQUET_OVERFLOW_COLUMN, None)
+        record = {key: value for key, value in row.items() if value is not None}
+        if isinstance(record.get("crawl_time"), datetime):
+            record["crawl_time"] = record["crawl_time"].strftime(CRAWL_TIME_FORMAT)
+        if extra:
+            extra = json.loads(extra)
+            if extra_fields is not None:
+                extra = {key: value for key, value in extra.items() if key in extra_fields}
+            record.update(extra)
+        if overflow:
+            overflow = json.loads(overflow)
+            if overflow_fields is not None:
+                overflow = {key: value for key, value in overflow.items() if key in overflow_fields}
+            record.update(overflow)
+        records.append(record)
+    return records
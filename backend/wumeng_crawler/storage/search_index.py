@@ -0,0 +1,660 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from loguru import logger
+
+from wumeng_crawler.config.config import STORAGE_CONFIG
+from wumeng_crawler.storage.file_cache import get_file_cache
+
+# n-gram长度，2-gram对中文关键词足够有效
+NGRAM_SIZE = 2
+
+# 文本末尾的填充字符，保证每个字符都是某个n-gram的首字符
+NGRAM_PADDING = "\x00"
+
+# 单字符关键词前缀查询的上界
+NGRAM_UPPER_BOUND = "\U0010ffff"
+
+# 索引结构版本，结构变化时重建索引
+INDEX_SCHEMA_VERSION = 2
+
+# 缺失分面字段时统计使用的名称
+UNKNOWN_FACET = "unknown"
+
+# 逐批读取候选记录的数量
+MATCH_BATCH_SIZE = 500
+
+# 缓存关键词查询匹配总数的查询条件数量
+TOTAL_CACHE_SIZE = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    spider_name TEXT NOT NULL,
+    data_type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_records_order ON records (mtime DESC, path, position);
+CREATE INDEX IF NOT EXISTS ix_records_path ON records (path);
+CREATE INDEX IF NOT EXISTS ix_records_facets ON records (spider_name, data_type, mtime DESC);
+CREATE INDEX IF NOT EXISTS ix_records_spider_order ON records (spider_name, mtime DESC, path, position);
+CREATE TABLE IF NOT EXISTS postings (
+    gram TEXT NOT NULL,
+    record_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, record_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_postings_record ON postings (record_id);
+CREATE TABLE IF NOT EXISTS record_stats (
+    source TEXT NOT NULL,
+    spider_name TEXT NOT NULL,
+    data_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    records INTEGER NOT NULL,
+    PRIMARY KEY (source, spider_name, data_type, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS file_stats (
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    PRIMARY KEY (source, day)
+) WITHOUT ROWID;
+"""
+
+_TABLES = ("files", "records", "postings", "record_stats", "file_stats")
+
+
+def _record_text(item: Any) -> str:
+    """
+    获取记录用于关键词匹配的文本，与原先逐条json.dumps的匹配方式保持一致
+    """
+    return json.dumps(item, ensure_ascii=False)
+
+
+def _ngrams(text: str) -> set:
+    """
+    将文本切分为n-gram集合
+
+    Args:
+        text: 文本
+
+    Returns:
+        n-gram集合
+    """
+    padded = text + NGRAM_PADDING * (NGRAM_SIZE - 1)
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(text))}
+
+
+def encode_cursor(mtime: float, file_path: str, position: int) -> str:
+    """
+    将记录的排序键编码为不透明的分页游标
+
+    Args:
+        mtime: 文件修改时间
+        file_path: 数据文件路径
+        position: 记录在文件中的位置
+
+    Returns:
+        分页游标
+    """
+    raw = json.dumps([mtime, file_path, position], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, int]:
+    """
+    解码分页游标
+
+    Args:
+        cursor: 分页游标
+
+    Returns:
+        (文件修改时间, 数据文件路径, 记录位置)
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        mtime, file_path, position = json.loads(raw.decode("utf-8"))
+        return float(mtime), str(file_path), int(position)
+    except Exception as e:
+        raise ValueError(f"无效的分页游标: {cursor}") from e
+
+
+def _split_records(data: Any) -> List[Any]:
+    """
+    将数据文件内容拆分为记录列表，字典视为单条记录
+    """
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list):
+        return data
+    return []
+
+
+def _facet(item: Any, key: str) -> str:
+    """
+    获取记录的分面字段值
+    """
+    if isinstance(item, dict):
+        value = item.get(key, "")
+        return value if isinstance(value, str) else str(value)
+    return ""
+
+
+class SearchIndex:
+    """
+    爬虫数据的磁盘倒排索引
+
+    索引保存n-gram到记录位置的倒排表以及spider_name/type分面，
+    查询时只读取命中记录所在的数据文件，而不是遍历整个数据目录。
+    """
+
+    def __init__(self, data_dir: str, index_path: str):
+        """
+        初始化搜索索引
+
+        Args:
+            data_dir: 爬虫数据目录
+            index_path: 索引数据库文件路径
+        """
+        self.data_dir = data_dir
+        self.index_path = index_path
+        self._lock = threading.RLock()
+        self._synced = False
+        # 本连接提交的修改次数，与PRAGMA data_version一起标识索引版本
+        self._generation = 0
+        # 查询条件到(索引版本, 匹配总数)的映射
+        self._totals: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[int, int], int]]" = OrderedDict()
+
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        self._conn = sqlite3.connect(index_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_SCHEMA_VERSION:
+            self._reset_schema()
+
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        logger.info(f"初始化搜索索引: {index_path}")
+
+    def _reset_schema(self) -> None:
+        """
+        删除旧版本的索引表，索引会在下次同步时重建
+        """
+        logger.info(f"搜索索引结构版本变化，重建索引: {self.index_path}")
+        for table in _TABLES:
+            self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self._conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def _source_of(self, file_path: str) -> str:
+        """
+        获取数据文件的来源，即数据目录下的一级子目录名称
+        """
+        rel_path = os.path.relpath(file_path, self.data_dir)
+        parts = rel_path.split(os.sep)
+        if len(parts) < 2 or parts[0] == os.pardir:
+            return UNKNOWN_FACET
+        return parts[0]
+
+    def _bump_stats(self, source: str, day: str, groups: Dict[Tuple[str, str], int], sign: int) -> None:
+        """
+        增减统计表中的计数，不提交事务
+
+        Args:
+            source: 数据来源
+            day: 日期，格式为YYYY-MM-DD
+            groups: (爬虫名称, 数据类型)到记录数量的映射
+            sign: 1为增加，-1为减少
+        """
+        for (spider_name, data_type), count in groups.items():
+            self._conn.execute(
+                "INSERT INTO record_stats (source, spider_name, data_type, day, records) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, spider_name, data_type, day) DO UPDATE SET records = records + excluded.records",
+                (source, spider_name, data_type, day, sign * count)
+            )
+        self._conn.execute(
+            "INSERT INTO file_stats (source, day, files) VALUES (?, ?, ?) "
+            "ON CONFLICT (source, day) DO UPDATE SET files = files + excluded.files",
+            (source, day, sign)
+        )
+
+        if sign < 0:
+            self._conn.execute("DELETE FROM record_stats WHERE records <= 0")
+            self._conn.execute("DELETE FROM file_stats WHERE files <= 0")
+
+    def add_file(self, file_path: str, data: Optional[Any] = None) -> int:
+        """
+        将数据文件加入索引，已索引的同名文件会被替换
+
+        Args:
+            file_path: 数据文件路径
+            data: 文件内容，为None时从磁盘读取
+
+        Returns:
+            索引的记录数量
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        if data is None:
+            data, _ = get_file_cache().load(file_path)
+
+        records = _split_records(data)
+        source = self._source_of(file_path)
+        day = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
+        groups: Dict[Tuple[str, str], int] = {}
+
+        with self._lock:
+            try:
+                self._remove_file(file_path)
+
+                for position, item in enumerate(records):
+                    spider_name = _facet(item, "spider_name")
+                    data_type = _facet(item, "type")
+                    group = (spider_name or UNKNOWN_FACET, data_type or UNKNOWN_FACET)
+                    groups[group] = groups.get(group, 0) + 1
+
+                    cursor = self._conn.execute(
+                        "INSERT INTO records (path, position, mtime, spider_name, data_type) VALUES (?, ?, ?, ?, ?)",
+                        (file_path, position, stat.st_mtime, spider_name, data_type)
+                    )
+                    record_id = cursor.lastrowid
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO postings (gram, record_id) VALUES (?, ?)",
+                        ((gram, record_id) for gram in _ngrams(_record_text(item)))
+                    )
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, mtime, size, source, day) VALUES (?, ?, ?, ?, ?)",
+                    (file_path, stat.st_mtime, stat.st_size, source, day)
+                )
+                self._bump_stats(source, day, groups, 1)
+                self._conn.commit()
+                self._generation += 1
+            except Exception:
+                self._conn.rollback()
+                raise
+
+        logger.debug(f"索引数据文件: {file_path}，共 {len(records)} 条记录")
+        return len(records)
+
+    def remove_file(self, file_path: str) -> None:
+        """
+        从索引中移除数据文件
+
+        Args:
+            file_path: 数据文件路径
+        """
+        with self._lock:
+            self._remove_file(os.path.abspath(file_path))
+            self._conn.commit()
+            self._generation += 1
+
+    def _remove_file(self, file_path: str) -> None:
+        """
+        移除数据文件的所有索引项并扣减统计，不提交事务
+        """
+        row = self._conn.execute("SELECT source, day FROM files WHERE path = ?", (file_path,)).fetchone()
+        if row is not None:
+            source, day = row
+            groups = {
+                (spider_name or UNKNOWN_FACET, data_type or UNKNOWN_FACET): count
+                for spider_name, data_type, count in self._conn.execute(
+                    "SELECT spider_name, data_type, COUNT(*) FROM records WHERE path = ? GROUP BY spider_name, data_type",
+                    (file_path,)
+                )
+            }
+            self._bump_stats(source, day, groups, -1)
+
+        self._conn.execute(
+            "DELETE FROM postings WHERE record_id IN (SELECT id FROM records WHERE path = ?)",
+            (file_path,)
+        )
+        self._conn.execute("DELETE FROM records WHERE path = ?", (file_path,))
+        self._conn.execute("DELETE FROM files WHERE path = ?", (file_path,))
+
+    def sync(self) -> Dict[str, int]:
+        """
+        将索引与数据目录同步，索引新增或修改的文件并移除已删除的文件
+
+        Returns:
+            同步统计，包含added、removed数量
+        """
+        logger.info(f"开始同步搜索索引: {self.data_dir}")
+
+        added = 0
+        removed = 0
+
+        with self._lock:
+            indexed = {
+                path: (mtime, size)
+                for path, mtime, size in self._conn.execute("SELECT path, mtime, size FROM files")
+            }
+
+        on_disk = set()
+        if os.path.exists(self.data_dir):
+            for root, dirs, files in os.walk(self.data_dir):
+                for file in files:
+                    if not file.endswith(".json"):
+                        continue
+
+                    file_path = os.path.abspath(os.path.join(root, file))
+                    on_disk.add(file_path)
+
+                    try:
+                        stat = os.stat(file_path)
+                        if indexed.get(file_path) == (stat.st_mtime, stat.st_size):
+                            continue
+                        self.add_file(file_path)
+                        added += 1
+                    except Exception as e:
+                        logger.error(f"索引文件 {file_path} 失败: {e}")
+
+        for file_path in indexed.keys() - on_disk:
+            self.remove_file(file_path)
+            removed += 1
+
+        self._synced = True
+        logger.info(f"搜索索引同步完成，新增 {added} 个文件，移除 {removed} 个文件")
+        return {"added": added, "removed": removed}
+
+    def ensure_synced(self) -> None:
+        """
+        进程内首次查询前同步一次索引，之后依赖爬虫保存数据时的增量更新
+        """
+        if not self._synced:
+            with self._lock:
+                if not self._synced:
+                    self.sync()
+
+    def _candidate_query(self, keyword: Optional[str], spider_name: Optional[str], data_type: Optional[str], after: Optional[Tuple[float, str, int]] = None) -> Tuple[str, List[Any]]:
+        """
+        构建候选记录查询，结果按文件修改时间倒序排列
+
+        after为排序键时只查询排在该记录之后的记录。
+        """
+        conditions = []
+        params: List[Any] = []
+
+        if keyword:
+            if len(keyword) >= NGRAM_SIZE:
+                grams = sorted({keyword[i:i + NGRAM_SIZE] for i in range(len(keyword) - NGRAM_SIZE + 1)})
+                placeholders = ", ".join("?" for _ in grams)
+                conditions.append(
+                    f"id IN (SELECT record_id FROM postings WHERE gram IN ({placeholders}) "
+                    f"GROUP BY record_id HAVING COUNT(*) = ?)"
+                )
+                params.extend(grams)
+                params.append(len(grams))
+            else:
+                conditions.append("id IN (SELECT record_id FROM postings WHERE gram >= ? AND gram < ?)")
+                params.extend([keyword, keyword + NGRAM_UPPER_BOUND])
+
+        if spider_name:
+            conditions.append("spider_name = ?")
+            params.append(spider_name)
+
+        if data_type:
+            conditions.append("data_type = ?")
+            params.append(data_type)
+
+        if after is not None:
+            mtime, file_path, position = after
+            conditions.append("(mtime < ? OR (mtime = ? AND (path > ? OR (path = ? AND position > ?))))")
+            params.extend([mtime, mtime, file_path, file_path, position])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"FROM records {where}", params
+
+    def _load_file(self, file_path: str) -> List[Any]:
+        """
+        读取数据文件并拆分为记录列表
+        """
+        data, _ = get_file_cache().load(file_path)
+        return _split_records(data)
+
+    def _materialize(self, rows: List[Tuple[str, int, float]], keyword: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """
+        读取候选记录内容，有关键词时逐条校验是否真正包含关键词
+
+        候选记录按文件聚集排列，同一文件只读取一次。
+        """
+        current_path = None
+        current_records: List[Any] = []
+
+        for file_path, position, mtime in rows:
+            if file_path != current_path:
+                current_path = file_path
+                try:
+                    current_records = self._load_file(file_path)
+                except Exception as e:
+                    logger.error(f"读取文件 {file_path} 失败: {e}")
+                    current_records = []
+
+            if position >= len(current_records):
+                continue
+
+            item = current_records[position]
+            if keyword and keyword not in _record_text(item):
+                continue
+
+            yield {
+                "file_path": file_path,
+                "file_name": os.path.basename(file_path),
+                "data": item,
+                "timestamp": mtime,
+                "cursor": encode_cursor(mtime, file_path, position)
+            }
+
+    def iter_matches(self, keyword: Optional[str] = None, spider_name: Optional[str] = None, data_type: Optional[str] = None, cursor: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        按时间倒序产出匹配的记录
+
+        候选记录按批次读取，内存占用与结果总数无关。
+
+        Args:
+            keyword: 查询关键词
+            spider_name: 爬虫名称
+            data_type: 数据类型
+            cursor: 分页游标，从该游标对应的记录之后继续
+
+        Returns:
+            匹配记录的迭代器
+
+        Raises:
+            ValueError: 游标格式无效
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        self.ensure_synced()
+
+        while True:
+            query, params = self._candidate_query(keyword, spider_name, data_type, after)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT path, position, mtime {query} ORDER BY mtime DESC, path, position LIMIT ?",
+                    params + [MATCH_BATCH_SIZE]
+                ).fetchall()
+
+            yield from self._materialize(rows, keyword)
+
+            if len(rows) < MATCH_BATCH_SIZE:
+                return
+
+            file_path, position, mtime = rows[-1]
+            after = (mtime, file_path, position)
+
+    def _index_version(self) -> Tuple[int, int]:
+        """
+        获取索引版本，本进程或其他进程修改索引后版本改变，需持有锁
+        """
+        return self._generation, self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def search(self, keyword: Optional[str] = None, spider_name: Optional[str] = None, data_type: Optional[str] = None, offset: int = 0, limit: int = 10) -> Tuple[Optional[int], List[Dict[str, Any]], bool]:
+        """
+        搜索爬虫数据
+
+        有关键词时只校验到当前页之后的一条记录，不为计算总数读取全部候选记录。
+        某次查询读到了最后一条记录时按查询条件和索引版本缓存匹配总数，索引修改后失效。
+
+        Args:
+            keyword: 查询关键词
+            spider_name: 爬虫名称
+            data_type: 数据类型
+            offset: 偏移量
+            limit: 返回结果数量
+
+        Returns:
+            (匹配总数, 当前页结果, 是否还有下一页)，匹配总数未知时为None
+        """
+        self.ensure_synced()
+
+        # 无关键词时不需要校验，直接由索引分页
+        if not keyword:
+            query, params = self._candidate_query(None, spider_name, data_type)
+            with self._lock:
+                total = self._conn.execute(f"SELECT COUNT(*) {query}", params).fetchone()[0]
+                rows = self._conn.execute(
+                    f"SELECT path, position, mtime {query} ORDER BY mtime DESC, path, position LIMIT ? OFFSET ?",
+                    params + [limit, offset]
+                ).fetchall()
+            return total, list(self._materialize(rows, None)), offset + len(rows) < total
+
+        key = (keyword, spider_name, data_type)
+        with self._lock:
+            version = self._index_version()
+            cached = self._totals.get(key)
+        total = cached[1] if cached is not None and cached[0] == version else None
+
+        count = 0
+        page = []
+        has_more = False
+        for result in self.iter_matches(keyword, spider_name, data_type):
+            if count >= offset + limit:
+                has_more = True
+                break
+            if count >= offset:
+                page.append(result)
+            count += 1
+        else:
+            # 已读到最后一条记录，得到准确的匹配总数
+            total = count
+            with self._lock:
+                if self._index_version() == version:
+                    self._totals[key] = (version, total)
+                    self._totals.move_to_end(key)
+                    while len(self._totals) > TOTAL_CACHE_SIZE:
+                        self._totals.popitem(last=False)
+
+        return total, page, has_more
+
+    def latest(self, spider_name: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        获取最新的记录
+
+        记录按文件修改时间建有索引，只读取索引头部的limit条记录，
+        不需要扫描和排序整个数据目录。
+
+        Args:
+            spider_name: 爬虫名称
+            limit: 返回结果数量
+
+        Returns:
+            最新记录列表
+        """
+        self.ensure_synced()
+
+        query, params = self._candidate_query(None, spider_name, None)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path, position, mtime {query} ORDER BY mtime DESC, path, position LIMIT ?",
+                params + [limit]
+            ).fetchall()
+
+        return list(self._materialize(rows, None))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取数据统计信息，直接读取增量维护的统计表
+
+        Returns:
+            数据统计信息，包含总量以及按爬虫、数据类型、日期和来源的分布
+        """
+        self.ensure_synced()
+
+        spider_stats: Dict[str, int] = {}
+        data_type_stats: Dict[str, int] = {}
+        daily_stats: Dict[str, int] = {}
+        source_stats: Dict[str, int] = {}
+        total_records = 0
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, spider_name, data_type, day, records FROM record_stats"
+            ).fetchall()
+            total_files = self._conn.execute("SELECT COALESCE(SUM(files), 0) FROM file_stats").fetchone()[0]
+
+        for source, spider_name, data_type, day, records in rows:
+            total_records += records
+            spider_stats[spider_name] = spider_stats.get(spider_name, 0) + records
+            data_type_stats[data_type] = data_type_stats.get(data_type, 0) + records
+            daily_stats[day] = daily_stats.get(day, 0) + records
+            source_stats[source] = source_stats.get(source, 0) + records
+
+        return {
+            "total_files": total_files,
+            "total_records": total_records,
+            "spider_stats": spider_stats,
+            "data_type_stats": data_type_stats,
+            "daily_stats": dict(sorted(daily_stats.items())),
+            "source_stats": source_stats
+        }
+
+    def close(self) -> None:
+        """
+        关闭索引数据库连接
+        """
+        with self._lock:
+            self._conn.close()
+        logger.info(f"关闭搜索索引: {self.index_path}")
+
+# 单例模式
+_search_index_instance = None
+_search_index_lock = threading.Lock()
+
+def get_search_index() -> SearchIndex:
+    """
+    获取搜索索引实例
+
+    Returns:
+        搜索索引实例
+    """
+    global _search_index_instance
+    if _search_index_instance is None:
+        with _search_index_lock:
+            if _search_index_instance is None:
+                _search_index_instance = SearchIndex(
+                    STORAGE_CONFIG["DATA_DIR"],
+                    os.path.join(STORAGE_CONFIG["INDEX_DIR"], "search_index.db")
+                )
+    return _search_index_instance